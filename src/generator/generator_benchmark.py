@@ -0,0 +1,146 @@
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field, asdict
+from datetime import date, datetime, timezone
+from itertools import product
+from pathlib import Path
+from typing import Dict, List
+from PIL import Image
+from generator_lib.config import Config, KeyType, OutputMode, PayloadFormat
+from generator_lib.generator import SignedTicket, TicketWorker, get_ticket_file_path
+from generator_lib.metrics import STAGES
+from generator_lib.signing import read_key, write_keys
+
+# output modes with one file per ticket, which the workers write on their own
+OUTPUT_MODES = [OutputMode.SINGLE_FILES, OutputMode.PNG_FILES, OutputMode.WEBP_FILES]
+
+
+@dataclass
+class BenchmarkCase:
+    """Parameters of a single benchmark run"""
+    num_tickets: int
+    flyer_size: tuple[int, int] | None
+    key_type: KeyType
+    payload_format: PayloadFormat
+    output_mode: OutputMode = OutputMode.SINGLE_FILES
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings and memory usage of a single benchmark run"""
+    num_tickets: int
+    flyer_size: List[int] | None
+    key_type: str
+    payload_format: str
+    output_mode: str
+    prepare_s: float
+    stage_total_s: Dict[str, float] = field(default_factory=dict)
+    stage_per_ticket_ms: Dict[str, float] = field(default_factory=dict)
+    tickets_per_second: float = 0
+    peak_memory_bytes: int = 0
+
+
+def parse_size(value: str) -> tuple[int, int] | None:
+    if value == "none":
+        return None
+    width, height = value.lower().split("x")
+    return (int(width), int(height))
+
+
+def create_flyer(size: tuple[int, int], work_dir: Path) -> Path:
+    # noise does not compress, like a photo on a flyer
+    flyer_path = work_dir / f"flyer_{size[0]}x{size[1]}.png"
+    if not os.path.exists(flyer_path):
+        Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3)).save(flyer_path)
+    return flyer_path
+
+
+def create_key(key_type: KeyType, work_dir: Path) -> Path:
+    key_path = work_dir / "keys" / key_type.name.lower() / "private.pem"
+    if not os.path.exists(key_path):
+        write_keys(key_path, key_type)
+    return key_path
+
+
+def run_case(case: BenchmarkCase, work_dir: Path) -> BenchmarkResult:
+    flyer_path = create_flyer(case.flyer_size, work_dir) if case.flyer_size is not None else None
+    key_path = create_key(case.key_type, work_dir)
+    gen_config = Config("Benchmark", date.today(), case.num_tickets, work_dir / "tickets", key_path, flyer_path,
+                        output_mode=case.output_mode, key_type=case.key_type, payload_format=case.payload_format)
+
+    start = time.perf_counter()
+    # the worker of the generator, so the measured stages are the ones of a generation run
+    worker = TicketWorker(gen_config, read_key(key_path, case.key_type))
+    result = BenchmarkResult(case.num_tickets, list(case.flyer_size) if case.flyer_size is not None else None,
+                             case.key_type.name.lower(), case.payload_format.name.lower(),
+                             case.output_mode.name.lower(), time.perf_counter() - start)
+    for i_code in range(case.num_tickets):
+        message = worker.codec.get_signed_message(gen_config.event_name, gen_config.event_date, i_code)
+        worker.generate_ticket(SignedTicket(i_code, worker.codec.encode(message, worker.sign_message(message))))
+        os.remove(f"{get_ticket_file_path(gen_config, i_code)}.{worker.file_extension}")
+
+    totals = {stage: worker.timer.durations.get(stage, 0.0) for stage in STAGES}
+    result.stage_total_s = totals
+    result.stage_per_ticket_ms = {
+        stage: 1000 * total / case.num_tickets for stage, total in totals.items()}
+    result.tickets_per_second = case.num_tickets / (result.prepare_s + sum(totals.values()))
+    return result
+
+
+def measure_peak_memory(case: BenchmarkCase, work_dir: Path) -> int:
+    # tracing slows down the allocations, so memory is measured in a separate run
+    tracemalloc.start()
+    try:
+        run_case(case, work_dir)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measures the time of each ticket generation stage")
+    parser.add_argument("-n", "--num_tickets", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--flyer_sizes", nargs="+", default=["none", "1000x1500"],
+                        help="flyer sizes in pixels as WIDTHxHEIGHT, or none")
+    parser.add_argument("--key_types", nargs="+", default=[key_type.name.lower() for key_type in KeyType],
+                        choices=[key_type.name.lower() for key_type in KeyType])
+    parser.add_argument("--payload_formats", nargs="+", default=[PayloadFormat.LEGACY.name.lower()],
+                        choices=[fmt.name.lower() for fmt in PayloadFormat])
+    parser.add_argument("--output_modes", nargs="+", default=[OutputMode.SINGLE_FILES.name.lower()],
+                        choices=[output_mode.name.lower() for output_mode in OUTPUT_MODES])
+    parser.add_argument("-o", "--output", default="generator_benchmark.json",
+                        help="JSON file the results are written to")
+    parsed_args = parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    with tempfile.TemporaryDirectory() as work_dir_name:
+        work_dir = Path(work_dir_name)
+        for num_tickets, flyer_size, key_type, payload_format, output_mode in product(
+                parsed_args.num_tickets, parsed_args.flyer_sizes, parsed_args.key_types,
+                parsed_args.payload_formats, parsed_args.output_modes):
+            case = BenchmarkCase(num_tickets, parse_size(flyer_size), KeyType[key_type.upper()],
+                                 PayloadFormat[payload_format.upper()], OutputMode[output_mode.upper()])
+            result = run_case(case, work_dir)
+            result.peak_memory_bytes = measure_peak_memory(case, work_dir)
+            results.append(result)
+            print(f"{num_tickets} tickets, flyer {flyer_size}, {key_type}, {payload_format}, {output_mode}: "
+                  f"{result.tickets_per_second:.1f} tickets/s, "
+                  + ", ".join(f"{stage} {time_ms:.2f} ms" for stage, time_ms in result.stage_per_ticket_ms.items()))
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [asdict(result) for result in results],
+    }
+    with open(parsed_args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,12 @@
+from typing import Any
 from .config import *
-from .gui import *
 from .qr import *
 from .signing import *
+
+
+def __getattr__(name: str) -> Any:
+    # the GUI is only imported on first use, so that headless runs do not load PyQt5
+    if name in ("open_folder", "ProgressIndicator", "GeneratorQtMainWindow", "GeneratorGui"):
+        from . import gui  # pylint: disable=import-outside-toplevel
+        return getattr(gui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
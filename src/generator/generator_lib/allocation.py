@@ -0,0 +1,90 @@
+import socket
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Set
+from .config import Config
+from .csv_ledger import CsvLedger
+
+
+@dataclass
+class IdLease:
+    """Ticket IDs which have been handed out for an event, every id_step-th ID from first_id on"""
+    first_id: int
+    num_ids: int
+    id_step: int
+    # machine which leased the range
+    host: str = field(default="", compare=False)
+
+    def get_ids(self) -> range:
+        return range(self.first_id, self.first_id + self.num_ids * self.id_step, self.id_step)
+
+
+class IdAllocationLedger(CsvLedger):
+    """Class which records the ID ranges leased for the tickets of an event,
+    so a top-up never hands out the IDs of earlier tickets again"""
+
+    def __init__(self, file_name: Path) -> None:
+        self.leases: List[IdLease] = []
+        super().__init__(file_name)
+
+    def lease(self, gen_config: Config, completed_ids: Set[int]) -> Config:
+        # returns the configuration with the first ID of the leased range
+        if not 0 <= gen_config.shard_index < gen_config.num_shards:
+            raise ValueError(f"invalid shard {gen_config.shard_index + 1} of {gen_config.num_shards}")
+        unfinished_lease = self._get_unfinished_lease(gen_config, completed_ids) if gen_config.allocate_ids else None
+        if unfinished_lease is not None:
+            # an interrupted run is resumed instead of leaving its tickets without the rest of the range
+            return replace(gen_config, first_code=unfinished_lease.first_id, allocate_ids=False)
+        first_id = gen_config.first_code
+        if gen_config.allocate_ids:
+            first_id = self._get_next_free_id(
+                gen_config.first_code + gen_config.shard_index, gen_config.num_shards)
+        lease = IdLease(first_id, gen_config.num_qr_codes, gen_config.num_shards, socket.gethostname())
+        # explicitly given ranges are recorded as well, a range which was leased before is a reprint of its tickets
+        if lease not in self.leases:
+            self._check_not_leased(lease)
+            self._add(lease)
+        return replace(gen_config, first_code=first_id, allocate_ids=False)
+
+    def _check_not_leased(self, lease: IdLease) -> None:
+        # e.g. a second run without allocate_ids, which would hand out the IDs of sold tickets again
+        ticket_ids = set(lease.get_ids())
+        for leased in self.leases:
+            if not ticket_ids.isdisjoint(leased.get_ids()):
+                raise ValueError(f"the IDs {lease.first_id} to {lease.get_ids()[-1]} overlap the IDs "
+                                 f"{leased.first_id} to {leased.get_ids()[-1]} leased before, add tickets with "
+                                 f"--allocate_ids or reprint a leased range with its first ID and number of tickets")
+
+    def _get_unfinished_lease(self, gen_config: Config, completed_ids: Set[int]) -> Optional[IdLease]:
+        # the newest range leased by this machine for the shard, if not all of its tickets were written
+        lowest_id = gen_config.first_code + gen_config.shard_index
+        shard_leases = [lease for lease in self.leases
+                        if lease.host == socket.gethostname() and lease.id_step == gen_config.num_shards
+                        and lease.first_id >= lowest_id and lease.first_id % lease.id_step == lowest_id % lease.id_step]
+        if len(shard_leases) == 0:
+            return None
+        lease = shard_leases[-1]
+        if lease.num_ids != gen_config.num_qr_codes or all(ticket_id in completed_ids for ticket_id in lease.get_ids()):
+            return None
+        return lease
+
+    def _get_next_free_id(self, lowest_id: int, id_step: int) -> int:
+        # the first ID of the shard above all leased IDs, gaps between the leases are not reused
+        highest_leased_id = max((lease.get_ids()[-1] for lease in self.leases if lease.num_ids > 0), default=-1)
+        if highest_leased_id < lowest_id:
+            return lowest_id
+        return lowest_id + (highest_leased_id - lowest_id + id_step) // id_step * id_step
+
+    def _add(self, lease: IdLease) -> None:
+        if not self.is_open():
+            return
+        time_stamp = datetime.now(timezone.utc).isoformat()
+        self.leases.append(lease)
+        # the host shows which machine generated a range if the ledgers of several machines are compared
+        self._append_row([time_stamp, lease.first_id, lease.num_ids, lease.id_step, socket.gethostname()])
+
+    def _read_row(self, row: List[str]) -> None:
+        # the last row may be incomplete if the generator was interrupted
+        if len(row) == 5 and all(value.isdigit() for value in row[1:4]) and int(row[3]) > 0:
+            self.leases.append(IdLease(int(row[1]), int(row[2]), int(row[3]), row[4]))
@@ -0,0 +1,50 @@
+import tarfile
+import time
+import zipfile
+from io import BytesIO
+from types import TracebackType
+from .qr import create_parent_directories, remove_existing_file
+
+
+class TicketArchiveWriter:
+    """Class for streaming rendered tickets into a ZIP or tar archive without writing the single files"""
+
+    def __init__(self, file_name: str, root_dir: str, use_zip: bool) -> None:
+        self.archive_file_name = f"{file_name}.zip" if use_zip else f"{file_name}.tar"
+        create_parent_directories(self.archive_file_name)
+        remove_existing_file(self.archive_file_name)
+        # the entries are laid out like the single files in the output folder
+        self.root_dir = root_dir
+        self.zip_file: zipfile.ZipFile | None = None
+        self.tar_file: tarfile.TarFile | None = None
+        if use_zip:
+            # the PDF content is compressed already
+            self.zip_file = zipfile.ZipFile(
+                self.archive_file_name, "w", compression=zipfile.ZIP_STORED)
+        else:
+            self.tar_file = tarfile.open(self.archive_file_name, "w")
+
+    def __enter__(self) -> "TicketArchiveWriter":
+        return self
+
+    def __exit__(self,
+                 exc_type: type[BaseException] | None,
+                 exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        self.close()
+
+    def add_ticket(self, pdf: bytes, ticket_name: str) -> None:
+        entry_name = f"{self.root_dir}/{ticket_name}.pdf"
+        if self.zip_file is not None:
+            self.zip_file.writestr(entry_name, pdf)
+        if self.tar_file is not None:
+            info = tarfile.TarInfo(entry_name)
+            info.size = len(pdf)
+            info.mtime = int(time.time())
+            self.tar_file.addfile(info, BytesIO(pdf))
+
+    def close(self) -> None:
+        if self.zip_file is not None:
+            self.zip_file.close()
+        if self.tar_file is not None:
+            self.tar_file.close()
@@ -1,7 +1,33 @@
 from dataclasses import dataclass
+from enum import Enum
 from pathlib import Path
 from datetime import date
 
+# resolution of the flyer in the PDF tickets, high enough for printing
+DEFAULT_FLYER_DPI = 300
+
+
+class OutputMode(Enum):
+    """Ways of writing the generated tickets"""
+    SINGLE_FILES = 0
+    DOCUMENT = 1
+    ZIP_ARCHIVE = 2
+    TAR_ARCHIVE = 3
+    PNG_FILES = 4
+    WEBP_FILES = 5
+
+
+class KeyType(Enum):
+    """Types of the keys used for signing the tickets"""
+    RSA = 0
+    ED25519 = 1
+
+
+class PayloadFormat(Enum):
+    """Formats of the data stored in the QR-codes"""
+    LEGACY = 0
+    COMPACT = 1
+
 
 @dataclass
 class Config:
@@ -12,3 +38,19 @@ class Config:
     out_dir: Path
     private_key_path: Path
     flyer_file_name: Path | None
+    num_workers: int = 1
+    output_mode: OutputMode = OutputMode.SINGLE_FILES
+    tickets_per_page: int = 1
+    first_code: int = 0
+    key_type: KeyType = KeyType.RSA
+    payload_format: PayloadFormat = PayloadFormat.LEGACY
+    # the IDs are leased from the allocation ledger, starting at first_code at the lowest
+    allocate_ids: bool = False
+    # machines generating one event in parallel only use the IDs of their shard, every num_shards-th ID
+    shard_index: int = 0
+    num_shards: int = 1
+    # larger flyers are downsampled to this resolution at their printed size, 0 keeps the flyer as it is
+    flyer_dpi: int = DEFAULT_FLYER_DPI
+
+    def get_ticket_ids(self) -> range:
+        return range(self.first_code, self.first_code + self.num_qr_codes * self.num_shards, self.num_shards)
@@ -0,0 +1,66 @@
+import os
+import csv
+from io import TextIOWrapper
+from pathlib import Path
+from types import TracebackType
+from typing import Any, List, Optional
+
+
+class CsvLedger:
+    """Base class for the CSV files the generator only appends to, the rows of earlier runs are read when the
+    file is opened, every row is flushed, so an interrupted run loses at most the row it was writing"""
+
+    def __init__(self, file_name: Path) -> None:
+        self.file_name = file_name
+        self.file: Optional[TextIOWrapper] = None
+        self.writer: Optional[Any] = None
+
+    def __enter__(self) -> Any:
+        self._open()
+        return self
+
+    def __exit__(self,
+                 exc_type: type[BaseException] | None,
+                 exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            self.writer = None
+
+    def is_open(self) -> bool:
+        return self.file is not None and self.writer is not None
+
+    def _append_row(self, row: List[Any]) -> None:
+        if self.file is None or self.writer is None:
+            return
+        self.writer.writerow(row)
+        self.file.flush()
+
+    # called for every row of the file when it is opened, the last row may be incomplete
+    def _read_row(self, row: List[str]) -> None:
+        pass
+
+    def _open(self) -> None:
+        os.makedirs(self.file_name.parent, exist_ok=True)
+        if os.path.exists(self.file_name):
+            with open(self.file_name, "r", encoding="utf-8", newline="") as file:
+                for row in csv.reader(file, delimiter=','):
+                    self._read_row(row)
+        has_incomplete_row = self._has_incomplete_row()
+        self.file = open(self.file_name, "a", encoding="utf-8", newline="")
+        self.writer = csv.writer(self.file, delimiter=',')
+        if has_incomplete_row:
+            # the next row would otherwise continue the incomplete one and be lost as well
+            self.file.write("\r\n")
+            self.file.flush()
+
+    def _has_incomplete_row(self) -> bool:
+        if not os.path.exists(self.file_name):
+            return False
+        with open(self.file_name, "rb") as file:
+            file.seek(0, os.SEEK_END)
+            if file.tell() == 0:
+                return False
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) != b"\n"
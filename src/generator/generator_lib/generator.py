@@ -1,37 +1,399 @@
 import os
+import hashlib
 import threading
-from typing import Optional
-from generator_lib.signing import read_key, sign_message
-from generator_lib.config import Config
-from generator_lib.gui import ProgressIndicator
-from generator_lib.qr import TicketWriter, add_signature_to_message
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Protocol, Sequence, TypeVar, cast
+from generator_lib.signing import SigningKey, get_key_fingerprint, get_key_type, read_key, sign_message
+from generator_lib.config import Config, KeyType, OutputMode, PayloadFormat
+from generator_lib.job import Job
+from generator_lib.progress import ProgressListener
+from generator_lib.manifest import BatchManifest, read_completed_ids
+from generator_lib.allocation import IdAllocationLedger
+from generator_lib.signature_store import SignatureStore
+from generator_lib.issued_tickets import IssuedTicketList
+from generator_lib.archive import TicketArchiveWriter
+from generator_lib.metrics import GenerationMetrics, StageTimer
+from generator_lib.qr import TicketDocumentWriter, TicketWriter, save_ticket_file
+from generator_lib.raster import RASTER_FORMATS, RasterTicketWriter
+from generator_lib.payload import PayloadCodec
+
+# number of tickets handed to a worker process at once
+_CHUNK_SIZE = 4
+
+ItemT = TypeVar('ItemT')
+ResultT = TypeVar('ResultT')
+ResultT_contra = TypeVar('ResultT_contra', contravariant=True)
+
+
+class BatchWriter(Protocol[ResultT_contra]):
+    """Interface of the writers which collect all tickets of a batch in a single file"""
+
+    def __enter__(self) -> Any:
+        ...
+
+    def __exit__(self,
+                 exc_type: type[BaseException] | None,
+                 exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        ...
+
+    def add_ticket(self, ticket: ResultT_contra, ticket_name: str) -> None:
+        ...
+
+
+def get_folder_name(gen_config: Config) -> str:
+    return f"{gen_config.event_date.strftime('%Y-%m-%d')}_{gen_config.event_name}"
+
+
+def get_ticket_name(gen_config: Config, i_code: int) -> str:
+    return f"{get_folder_name(gen_config)}_{i_code}"
+
+
+def get_ticket_file_path(gen_config: Config, i_code: int) -> str:
+    return os.path.join(gen_config.out_dir, get_folder_name(gen_config), get_ticket_name(gen_config, i_code))
+
+
+# path without extension of the file which holds all tickets of the batch
+def get_batch_file_path(gen_config: Config) -> str:
+    folder_name = get_folder_name(gen_config)
+    file_name = folder_name
+    if gen_config.first_code != 0 or gen_config.num_shards > 1:
+        # a top-up or another shard must not overwrite the file of the earlier tickets
+        ticket_ids = gen_config.get_ticket_ids()
+        file_name = f"{folder_name}_{ticket_ids[0]}-{ticket_ids[-1]}"
+    return os.path.join(gen_config.out_dir, folder_name, file_name)
+
+
+def get_manifest_file_path(gen_config: Config) -> Path:
+    return gen_config.out_dir / f"{get_folder_name(gen_config)}_manifest.csv"
+
+
+def get_report_file_path(gen_config: Config) -> Path:
+    return gen_config.out_dir / f"{get_folder_name(gen_config)}_runs.jsonl"
+
+
+def get_job_report_file_path(job: Job) -> Path:
+    return job.configs[0].out_dir / f"{job.name}_runs.jsonl"
+
+
+def get_allocation_file_path(gen_config: Config) -> Path:
+    return gen_config.out_dir / f"{get_folder_name(gen_config)}_ids.csv"
+
+
+def get_signature_store_file_path(gen_config: Config) -> Path:
+    return gen_config.out_dir / f"{get_folder_name(gen_config)}_signatures.csv"
+
+
+# signed list of the issued tickets, which is copied to the scanner next to the public key
+def get_issued_tickets_file_path(gen_config: Config) -> Path:
+    if gen_config.num_shards > 1:
+        # every machine lists its own shard, the scanner loads the lists of all shards
+        return gen_config.out_dir / \
+            f"{get_folder_name(gen_config)}_issued_shard{gen_config.shard_index + 1}of{gen_config.num_shards}.txt"
+    return gen_config.out_dir / f"{get_folder_name(gen_config)}_issued.txt"
+
+
+# identifies everything besides the ID which changes the written ticket files
+def get_layout_key(gen_config: Config, key_fingerprint: str) -> str:
+    flyer = ""
+    if gen_config.flyer_file_name is not None:
+        flyer_stat = os.stat(gen_config.flyer_file_name)
+        flyer = f"{gen_config.flyer_file_name}:{flyer_stat.st_size}:{flyer_stat.st_mtime_ns}:{gen_config.flyer_dpi}"
+    layout = f"{flyer}|{gen_config.output_mode.name}|{gen_config.payload_format.name}|{key_fingerprint}"
+    return hashlib.sha256(layout.encode()).hexdigest()[:16]
+
+
+@dataclass
+class SignedTicket:
+    """ID of a ticket and the data of its QR-code"""
+    ticket_id: int
+    data: str
+
+
+class TicketWorker:
+    """Class which signs and renders single tickets"""
+
+    def __init__(self, gen_config: Config, key: SigningKey) -> None:
+        self.gen_config = gen_config
+        self.key = key
+        self.writer: TicketWriter | RasterTicketWriter = TicketWriter(gen_config.flyer_file_name,
+                                                                      gen_config.flyer_dpi)
+        self.file_extension = "pdf"
+        if gen_config.output_mode in RASTER_FORMATS:
+            self.writer = RasterTicketWriter(gen_config.flyer_file_name, gen_config.output_mode)
+            self.file_extension = RASTER_FORMATS[gen_config.output_mode]
+        self.codec = PayloadCodec(gen_config.payload_format)
+        self.timer = StageTimer()
+
+    def sign_message(self, message: bytes) -> bytes:
+        with self.timer.measure("sign"):
+            return sign_message(message, self.key)
+
+    def render_ticket(self, ticket: SignedTicket) -> bytes:
+        with self.timer.measure("render"):
+            return self.writer.render_ticket(ticket.data)
+
+    def generate_ticket(self, ticket: SignedTicket) -> int:
+        rendered = self.render_ticket(ticket)
+        with self.timer.measure("write"):
+            save_ticket_file(rendered, get_ticket_file_path(self.gen_config, ticket.ticket_id), self.file_extension)
+        return ticket.ticket_id
+
+
+class TicketWorkerCache:
+    """Class which keeps the workers of a process for all events of a job,
+    so the key and each flyer are only loaded once"""
+
+    def __init__(self) -> None:
+        self.keys: Dict[Path, SigningKey] = {}
+        self.workers: Dict[tuple[Path, Path | None, int, OutputMode, PayloadFormat], TicketWorker] = {}
+
+    def get_worker(self, gen_config: Config) -> TicketWorker:
+        worker_key = (gen_config.private_key_path, gen_config.flyer_file_name, gen_config.flyer_dpi,
+                      gen_config.output_mode, gen_config.payload_format)
+        worker = self.workers.get(worker_key)
+        if worker is None:
+            key = self.keys.get(gen_config.private_key_path)
+            if key is None:
+                key = read_key(gen_config.private_key_path)
+                self.keys[gen_config.private_key_path] = key
+            worker = TicketWorker(gen_config, key)
+            self.workers[worker_key] = worker
+        # the other values of the event only name the ticket files
+        worker.gen_config = gen_config
+        return worker
+
+
+# the workers of a worker process, kept for all events of the job, the main process uses the cache of its pool
+_PROCESS_WORKERS = TicketWorkerCache()
+
+
+def _run_timed(worker: TicketWorker, task: Callable[[TicketWorker, ItemT], ResultT],
+               item: ItemT) -> tuple[ResultT, Dict[str, float]]:
+    result = task(worker, item)
+    return result, worker.timer.pop_durations()
+
+
+def _run_in_process(gen_config: Config, task: Callable[[TicketWorker, ItemT], ResultT],
+                    item: ItemT) -> tuple[ResultT, Dict[str, float]]:
+    # the stage times are returned with the result, the worker process cannot update the metrics
+    return _run_timed(_PROCESS_WORKERS.get_worker(gen_config), task, item)
+
+
+class TicketWorkerPool:
+    """Class which runs the ticket tasks of all events of a job, in worker processes if there is more than one worker"""
+
+    def __init__(self, num_workers: int) -> None:
+        self.num_workers = num_workers
+        self.executor: Optional[ProcessPoolExecutor] = None
+        # also used for the tickets rendered by the main process
+        self.local_workers = TicketWorkerCache()
+
+    def __enter__(self) -> Any:
+        if self.num_workers > 1:
+            # the processes are started once and keep their workers for the following events
+            self.executor = ProcessPoolExecutor(max_workers=self.num_workers)
+        return self
+
+    def __exit__(self,
+                 exc_type: type[BaseException] | None,
+                 exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=exc_type is not None)
+            self.executor = None
+
+    # runs the task for every item and yields the results in the order of the items
+    def run_tasks(self, gen_config: Config, task: Callable[[TicketWorker, ItemT], ResultT],
+                  items: Sequence[ItemT], metrics: GenerationMetrics) -> Iterator[ResultT]:
+        if len(items) == 0:
+            return
+        if self.executor is None:
+            worker = self.local_workers.get_worker(gen_config)
+            for item in items:
+                result, durations = _run_timed(worker, task, item)
+                metrics.add_stage_durations(durations)
+                yield result
+            return
+        # map yields in submission order, so progress is reported in order
+        for result, durations in self.executor.map(partial(_run_in_process, gen_config, task),
+                                                   items,
+                                                   chunksize=_CHUNK_SIZE):
+            metrics.add_stage_durations(durations)
+            yield result
 
 
 class Generator:
     """Main class which handles generating QR-codes"""
 
-    def __init__(self, progress_indicator: ProgressIndicator) -> None:
+    def __init__(self, progress_indicator: ProgressListener) -> None:
         self.progress_indicator = progress_indicator
         self.processor_thread: Optional[threading.Thread] = None
+        self.metrics = GenerationMetrics(0)
+        self.worker_pool = TicketWorkerPool(1)
+        # number of tickets of the events of the job which have been generated before the current one
+        self.progress_offset = 0
+
+    def _set_progress(self, progress: int) -> None:
+        # the listeners and the metrics count the tickets of all events of the job
+        self.metrics.set_progress(self.progress_offset + progress)
+        self.progress_indicator.set_progress(self.progress_offset + progress)
+
+    def _sign_tickets(self, gen_config: Config, signature_store: SignatureStore,
+                      issued_tickets: IssuedTicketList, ticket_ids: Sequence[int]) -> List[SignedTicket]:
+        # first phase, only messages without a stored signature are signed
+        codec = PayloadCodec(gen_config.payload_format)
+        messages = [codec.get_signed_message(gen_config.event_name, gen_config.event_date, i_code)
+                    for i_code in ticket_ids]
+        unsigned_messages = [message for message in messages if signature_store.get(message) is None]
+        for message, signature in zip(unsigned_messages, self.worker_pool.run_tasks(
+                gen_config, TicketWorker.sign_message, unsigned_messages, self.metrics)):
+            signature_store.add(message, signature)
+        tickets = [SignedTicket(i_code, codec.encode(message, cast(bytes, signature_store.get(message))))
+                   for i_code, message in zip(ticket_ids, messages)]
+        for ticket in tickets:
+            issued_tickets.add(ticket.ticket_id, ticket.data)
+        # saved before any ticket is rendered, a ticket file which survives a hard kill is always listed
+        issued_tickets.save()
+        return tickets
+
+    def _generate_files(self, gen_config: Config, manifest: BatchManifest,
+                        signature_store: SignatureStore, issued_tickets: IssuedTicketList) -> None:
+        # the signatures of completed tickets are stored, signing them again only lists them as issued
+        tickets = self._sign_tickets(gen_config, signature_store, issued_tickets, gen_config.get_ticket_ids())
+        # tickets completed by an earlier, interrupted run are skipped
+        tickets = [ticket for ticket in tickets if not manifest.is_completed(ticket.ticket_id)]
+        num_skipped = gen_config.num_qr_codes - len(tickets)
+        self.metrics.add_skipped(num_skipped)
+        if num_skipped > 0:
+            self._set_progress(num_skipped - 1)
+        for i_progress, i_code in enumerate(self.worker_pool.run_tasks(gen_config, TicketWorker.generate_ticket,
+                                                                       tickets, self.metrics)):
+            manifest.add(i_code)
+            self._set_progress(num_skipped + i_progress)
 
-    def _generate(self, gen_config: Config) -> None:
-        key = read_key(gen_config.private_key_path)
-        self.progress_indicator.set_maximum(gen_config.num_qr_codes)
-        writer = TicketWriter(gen_config.flyer_file_name)
-        for i_code in range(gen_config.num_qr_codes):
-            data = f"{gen_config.event_name}_{gen_config.event_date.strftime('%Y-%m-%d')}_{i_code}"
-            signature = sign_message(data, key)
-            folder_name = f"{gen_config.event_date.strftime('%Y-%m-%d')}_{gen_config.event_name}"
-            file_name = f"{folder_name}_{i_code}"
-            file_path = os.path.join(
-                gen_config.out_dir, folder_name, file_name)
-            signed = add_signature_to_message(data, signature)
-            writer.save_ticket(signed, file_path)
-            self.progress_indicator.set_progress(i_code)
+    def _generate_batch_file(self, gen_config: Config, manifest: BatchManifest, batch_writer: BatchWriter[ResultT],
+                             results: Iterable[ResultT], batch_stage: str) -> None:
+        # the batch file is written sequentially, while the workers may still be creating the results
+        ticket_ids = gen_config.get_ticket_ids()
+        timer = StageTimer()
+        with batch_writer:
+            for i_progress, result in enumerate(results):
+                with timer.measure(batch_stage):
+                    batch_writer.add_ticket(result, get_ticket_name(
+                        gen_config, ticket_ids[i_progress]))
+                self.metrics.add_stage_durations(timer.pop_durations())
+                # the last ticket is reported once the batch file has been saved
+                if i_progress + 1 < gen_config.num_qr_codes:
+                    self._set_progress(i_progress)
+            # the batch file is saved when the writer is closed
+            close_start = time.perf_counter()
+        self.metrics.add_stage_durations({"write": time.perf_counter() - close_start})
+        for i_code in ticket_ids:
+            manifest.add(i_code)
+        self._set_progress(gen_config.num_qr_codes - 1)
+
+    def _generate_document(self, gen_config: Config, manifest: BatchManifest,
+                           signature_store: SignatureStore, issued_tickets: IssuedTicketList) -> None:
+        tickets = self._sign_tickets(gen_config, signature_store, issued_tickets, gen_config.get_ticket_ids())
+        # the flyer of the document is shared with the events of the job which use the same one
+        writer = cast(TicketWriter, self.worker_pool.local_workers.get_worker(gen_config).writer)
+        document = TicketDocumentWriter(writer, get_batch_file_path(gen_config),
+                                        gen_config.tickets_per_page, gen_config.num_qr_codes)
+        # the QR-codes are encoded and drawn while they are added to the document
+        self._generate_batch_file(
+            gen_config, manifest, document, (ticket.data for ticket in tickets), "render")
+
+    def _generate_archive(self, gen_config: Config, manifest: BatchManifest,
+                          signature_store: SignatureStore, issued_tickets: IssuedTicketList) -> None:
+        tickets = self._sign_tickets(gen_config, signature_store, issued_tickets, gen_config.get_ticket_ids())
+        archive = TicketArchiveWriter(get_batch_file_path(gen_config), get_folder_name(gen_config),
+                                      gen_config.output_mode == OutputMode.ZIP_ARCHIVE)
+        self._generate_batch_file(
+            gen_config, manifest, archive,
+            self.worker_pool.run_tasks(gen_config, TicketWorker.render_ticket, tickets, self.metrics), "write")
+
+    def _append_report(self, job: Job, key_type: KeyType) -> None:
+        events = [{
+            "event_name": gen_config.event_name,
+            "event_date": gen_config.event_date.strftime('%Y-%m-%d'),
+            "first_code": gen_config.first_code,
+            "num_shards": gen_config.num_shards,
+            "num_qr_codes": gen_config.num_qr_codes,
+            "output_mode": gen_config.output_mode.name.lower(),
+            "payload_format": gen_config.payload_format.name.lower(),
+        } for gen_config in job.configs]
+        first_config = job.configs[0]
+        run_values: Dict[str, object] = {
+            "num_workers": job.get_num_workers(),
+            "key_type": key_type.name.lower(),
+        }
+        if len(job.configs) == 1:
+            self.metrics.append_report(get_report_file_path(first_config), {**events[0], **run_values})
+            return
+        # the throughput of a job is only known for all of its events together
+        self.metrics.append_report(get_job_report_file_path(job), {"job_name": job.name, **run_values,
+                                                                   "events": events})
+
+    def _generate_event(self, gen_config: Config, key: SigningKey, key_fingerprint: str) -> None:
+        with BatchManifest(get_manifest_file_path(gen_config),
+                           get_layout_key(gen_config, key_fingerprint)) as manifest_any, \
+                SignatureStore(get_signature_store_file_path(gen_config), key_fingerprint) as store_any, \
+                IssuedTicketList(get_issued_tickets_file_path(gen_config), gen_config.event_name,
+                                 gen_config.event_date, key, key_fingerprint) as issued_any:
+            manifest = cast(BatchManifest, manifest_any)
+            signature_store = cast(SignatureStore, store_any)
+            issued_tickets = cast(IssuedTicketList, issued_any)
+            if gen_config.output_mode == OutputMode.DOCUMENT:
+                self._generate_document(gen_config, manifest, signature_store, issued_tickets)
+            elif gen_config.output_mode in (OutputMode.ZIP_ARCHIVE, OutputMode.TAR_ARCHIVE):
+                self._generate_archive(gen_config, manifest, signature_store, issued_tickets)
+            else:
+                self._generate_files(gen_config, manifest, signature_store, issued_tickets)
+
+    def _lease_ticket_ids(self, gen_config: Config) -> Config:
+        with IdAllocationLedger(get_allocation_file_path(gen_config)) as ledger_any:
+            return cast(IdAllocationLedger, ledger_any).lease(
+                gen_config, read_completed_ids(get_manifest_file_path(gen_config)))
+
+    def _generate(self, job: Job) -> None:
+        # the IDs stay leased if the job fails, a later run does not hand them out again
+        job = Job(job.name, [self._lease_ticket_ids(gen_config) for gen_config in job.configs])
+        # creates the keys if they do not exist yet, before any worker reads them
+        keys: Dict[Path, tuple[SigningKey, str]] = {}
+        for gen_config in job.configs:
+            if gen_config.private_key_path not in keys:
+                key = read_key(gen_config.private_key_path, gen_config.key_type)
+                keys[gen_config.private_key_path] = (key, get_key_fingerprint(key))
+        self.metrics = GenerationMetrics(job.get_num_qr_codes())
+        self.progress_indicator.set_metrics(self.metrics)
+        self.progress_indicator.set_maximum(job.get_num_qr_codes())
+        self.progress_indicator.set_progress(-1)
+        self.progress_offset = 0
+        with TicketWorkerPool(job.get_num_workers()) as pool_any:
+            self.worker_pool = cast(TicketWorkerPool, pool_any)
+            # the events run one after the other, the tickets of each event are spread over all workers
+            for gen_config in job.configs:
+                self._generate_event(gen_config, *keys[gen_config.private_key_path])
+                self.progress_offset += gen_config.num_qr_codes
+        self.worker_pool = TicketWorkerPool(1)
+        # an existing key is used whatever key type is configured
+        self._append_report(job, get_key_type(keys[job.configs[0].private_key_path][0]))
         self.processor_thread = None
 
+    def generate_blocking(self, gen_config: Config) -> None:
+        self._generate(Job(get_folder_name(gen_config), [gen_config]))
+
+    def generate_job_blocking(self, job: Job) -> None:
+        self._generate(job)
+
     def generate(self, gen_config: Config) -> None:
         if self.processor_thread is None:
             self.processor_thread = threading.Thread(
-                target=self._generate, args=[gen_config])
+                target=self._generate, args=[Job(get_folder_name(gen_config), [gen_config])])
             self.processor_thread.start()
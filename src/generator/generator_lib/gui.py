@@ -9,7 +9,8 @@ import PyQt5.QtWidgets as QtWidget
 import PyQt5.QtCore as QtCore
 import PyQt5.QtGui as QtGui
 
-from .config import Config
+from .config import Config, OutputMode
+from .metrics import GenerationMetrics, format_duration
 
 
 def open_folder(folder: Path) -> None:
@@ -26,6 +27,7 @@ class ProgressIndicator:
         self.out_dir = out_dir
         self._init_message_box()
         self.progress = 0
+        self.metrics: Optional[GenerationMetrics] = None
         self.lock = Lock()
 
     def _init_message_box(self) -> None:
@@ -38,6 +40,10 @@ class ProgressIndicator:
         self.box.addButton(QtWidget.QMessageBox.StandardButton.Ok)
         self.box.addButton(button, QtWidget.QMessageBox.ButtonRole.ActionRole)
 
+    def set_metrics(self, metrics: GenerationMetrics) -> None:
+        with self.lock:
+            self.metrics = metrics
+
     def set_maximum(self, progress_max: int) -> None:
         self.progress_bar.setMaximum(progress_max)
 
@@ -45,8 +51,26 @@ class ProgressIndicator:
         with self.lock:
             self.progress = progress
 
+    def _update_metrics(self) -> None:
+        with self.lock:
+            metrics = self.metrics
+        if metrics is None:
+            return
+        snapshot = metrics.get_snapshot()
+        text = f"%p% - {snapshot.tickets_per_second:.1f} Tickets/s"
+        if snapshot.eta_s is not None and snapshot.done < snapshot.total:
+            text += f" - noch {format_duration(snapshot.eta_s)}"
+        self.progress_bar.setFormat(text)
+        # the share of each stage shows whether signing, rendering or writing is the bottleneck
+        stage_total_s = sum(snapshot.stage_total_s.values())
+        if stage_total_s > 0:
+            self.progress_bar.setToolTip("\n".join(
+                f"{stage}: {time_ms:.1f} ms/Ticket ({100 * snapshot.stage_total_s[stage] / stage_total_s:.0f}%)"
+                for stage, time_ms in snapshot.get_stage_per_ticket_ms().items()))
+
     def update_progress(self) -> bool:
         self.progress_bar.setValue(self.progress + 1)
+        self._update_metrics()
         if self.progress_bar.value() == self.progress_bar.maximum():
             self.box.show()
             self.start_button.setEnabled(True)
@@ -83,6 +107,20 @@ class GeneratorQtMainWindow(QtWidget.QMainWindow):
         self.config.num_qr_codes = int(self.num_qr_codes_edit.text())
         self._enable_button()
 
+    def _on_first_code_set(self) -> None:
+        self.config.first_code = int(self.first_code_edit.text())
+
+    def _on_allocate_ids_set(self, state: int) -> None:
+        self.config.allocate_ids = state == QtCore.Qt.CheckState.Checked
+
+    def _on_output_mode_set(self, index: int) -> None:
+        self.config.output_mode = self.output_mode_combo_box.itemData(index)
+        self.tickets_per_page_spin_box.setEnabled(
+            self.config.output_mode == OutputMode.DOCUMENT)
+
+    def _on_tickets_per_page_set(self, tickets_per_page: int) -> None:
+        self.config.tickets_per_page = tickets_per_page
+
     def _on_start_button_pressed(self) -> None:
         self.progress_poll_timer.start()
         self.start_button.setEnabled(False)
@@ -152,6 +190,17 @@ class GeneratorQtMainWindow(QtWidget.QMainWindow):
             self._on_num_qr_codes_set)
         self.widget_layout.addWidget(self.num_qr_codes_edit)
 
+    def _init_first_code_edit(self) -> None:
+        self.first_code_edit = QtWidget.QLineEdit('')
+        self.first_code_edit.setText(str(self.config.first_code))
+        self.first_code_edit.editingFinished.connect(self._on_first_code_set)
+        self.widget_layout.addWidget(self.first_code_edit)
+        # a top-up continues after the IDs generated before, the first ID is then the lowest possible ID
+        self.allocate_ids_check_box = QtWidget.QCheckBox('An bisherige Tickets anschließen')
+        self.allocate_ids_check_box.setChecked(self.config.allocate_ids)
+        self.allocate_ids_check_box.stateChanged.connect(self._on_allocate_ids_set)
+        self.widget_layout.addWidget(self.allocate_ids_check_box)
+
     def _init_flyer_edit(self) -> None:
         self.browse_flyer_button = QtWidget.QPushButton('Auswahl')
         self.browse_flyer_button.setMaximumSize(100, 25)
@@ -161,9 +210,40 @@ class GeneratorQtMainWindow(QtWidget.QMainWindow):
             filter="Images (*.png *.jpg *.HEIC)")
         self.flyer_selection_dialog.fileSelected.connect(self._set_flyer_path)
         self.widget_layout.addWidget(self.browse_flyer_button)
-        self.flyer_selected_label: QtWidget.QLabel = QtWidget.QLabel('')
+        self.flyer_selected_label: QtWidget.QLabel = QtWidget.QLabel(
+            str(self.config.flyer_file_name) if self.config.flyer_file_name is not None else '')
         self.widget_layout.addWidget(self.flyer_selected_label)
 
+    def _init_output_mode_edit(self) -> None:
+        self.output_mode_combo_box = QtWidget.QComboBox()
+        self.output_mode_combo_box.addItem(
+            "Eine PDF-Datei pro Ticket", OutputMode.SINGLE_FILES)
+        self.output_mode_combo_box.addItem(
+            "Ein PDF-Dokument", OutputMode.DOCUMENT)
+        self.output_mode_combo_box.addItem(
+            "ZIP-Archiv", OutputMode.ZIP_ARCHIVE)
+        self.output_mode_combo_box.addItem(
+            "TAR-Archiv", OutputMode.TAR_ARCHIVE)
+        self.output_mode_combo_box.addItem(
+            "Ein PNG-Bild pro Ticket", OutputMode.PNG_FILES)
+        self.output_mode_combo_box.addItem(
+            "Ein WebP-Bild pro Ticket", OutputMode.WEBP_FILES)
+        self.output_mode_combo_box.setCurrentIndex(
+            self.output_mode_combo_box.findData(self.config.output_mode))
+        self.output_mode_combo_box.currentIndexChanged.connect(
+            self._on_output_mode_set)
+        self.widget_layout.addWidget(self.output_mode_combo_box)
+
+    def _init_tickets_per_page_edit(self) -> None:
+        self.tickets_per_page_spin_box = QtWidget.QSpinBox()
+        self.tickets_per_page_spin_box.setRange(1, 16)
+        self.tickets_per_page_spin_box.setValue(self.config.tickets_per_page)
+        self.tickets_per_page_spin_box.setEnabled(
+            self.config.output_mode == OutputMode.DOCUMENT)
+        self.tickets_per_page_spin_box.valueChanged.connect(
+            self._on_tickets_per_page_set)
+        self.widget_layout.addWidget(self.tickets_per_page_spin_box)
+
     def _init_start_button(self) -> None:
         self.start_button = QtWidget.QPushButton('Start')
         self.start_button.setEnabled(False)
@@ -242,8 +322,14 @@ class GeneratorQtMainWindow(QtWidget.QMainWindow):
         self._init_event_date_edit()
         self.widget_layout.addWidget(QtWidget.QLabel('Anzahl QR-Codes'))
         self._init_num_qr_codes_edit()
+        self.widget_layout.addWidget(QtWidget.QLabel('Erste Ticket-ID'))
+        self._init_first_code_edit()
         self.widget_layout.addWidget(QtWidget.QLabel('Flyer (optional)'))
         self._init_flyer_edit()
+        self.widget_layout.addWidget(QtWidget.QLabel('Ausgabe'))
+        self._init_output_mode_edit()
+        self.widget_layout.addWidget(QtWidget.QLabel('Tickets pro Seite'))
+        self._init_tickets_per_page_edit()
         self._init_start_button()
         self._init_progress_bar()
         self._init_out_dir_dialog()
@@ -0,0 +1,92 @@
+import os
+import json
+import base64
+import struct
+from datetime import date
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Set
+from .payload import PAYLOAD_HASH_SIZE, get_payload_hash
+from .signing import SigningKey, sign_message
+
+# Signed list of the issued tickets of an event, version 1: two lines of text
+#   JSON object with the event, the key fingerprint and the base64 encoded entries
+#   base64 encoded signature of the first line
+# Each entry is the ticket ID (8 bytes, big endian) followed by the payload hash. The format is read by the
+# scanner's issued_tickets module.
+ISSUED_TICKETS_VERSION = 1
+_ENTRY_FORMAT = f">Q{PAYLOAD_HASH_SIZE}s"
+
+
+class IssuedTicketList:
+    """Class which collects the payload hashes of all tickets of an event and saves them signed,
+    so the scanner can accept a ticket by looking up its hash instead of verifying its signature"""
+
+    def __init__(self, file_name: Path, event_name: str, event_date: date,
+                 key: SigningKey, key_fingerprint: str) -> None:
+        self.file_name = file_name
+        self.event_name = event_name
+        self.event_date = event_date
+        self.key = key
+        self.key_fingerprint = key_fingerprint
+        # an ID may have several hashes, e.g. after a reprint in another payload format
+        self.entries: Set[tuple[int, bytes]] = set()
+        self.is_changed = False
+
+    def __enter__(self) -> Any:
+        if os.path.exists(self.file_name):
+            self._read_file()
+        return self
+
+    def __exit__(self,
+                 exc_type: type[BaseException] | None,
+                 exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        # also saved after an interruption, the signed tickets are valid whether they were rendered or not
+        self.save()
+
+    def add(self, ticket_id: int, data: str) -> None:
+        entry = (ticket_id, get_payload_hash(data))
+        if entry not in self.entries:
+            self.entries.add(entry)
+            self.is_changed = True
+
+    def save(self) -> None:
+        if not self.is_changed:
+            return
+        self._save()
+        self.is_changed = False
+
+    def _save(self) -> None:
+        entries = b"".join(struct.pack(_ENTRY_FORMAT, ticket_id, payload_hash)
+                           for ticket_id, payload_hash in sorted(self.entries))
+        header = json.dumps({
+            "version": ISSUED_TICKETS_VERSION,
+            "event_name": self.event_name,
+            "event_date": self.event_date.strftime('%Y-%m-%d'),
+            "key_fingerprint": self.key_fingerprint,
+            "entries": base64.b64encode(entries).decode(),
+        }).encode()
+        signature = base64.b64encode(sign_message(header, self.key))
+        os.makedirs(self.file_name.parent, exist_ok=True)
+        # replaced at once, so the scanner never reads a partly written list
+        temp_file_name = self.file_name.with_suffix(".tmp")
+        with open(temp_file_name, "wb") as file:
+            file.write(header + b"\n" + signature + b"\n")
+        os.replace(temp_file_name, self.file_name)
+
+    def _read_file(self) -> None:
+        with open(self.file_name, "rb") as file:
+            lines = file.read().splitlines()
+        try:
+            header = json.loads(lines[0])
+            entries = base64.b64decode(header["entries"], validate=True)
+        except (IndexError, KeyError, ValueError):
+            # a damaged list is written again from the tickets of this run
+            return
+        # tickets signed with another key do not verify with the current public key
+        if header.get("version") != ISSUED_TICKETS_VERSION or header.get("key_fingerprint") != self.key_fingerprint \
+                or len(entries) % struct.calcsize(_ENTRY_FORMAT) != 0:
+            return
+        for ticket_id, payload_hash in struct.iter_unpack(_ENTRY_FORMAT, entries):
+            self.entries.add((ticket_id, payload_hash))
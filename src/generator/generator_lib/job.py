@@ -0,0 +1,82 @@
+import json
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+from .config import Config, OutputMode, PayloadFormat
+
+# Job file listing the events which are generated in one run, e.g.
+#   {
+#     "defaults": {"num_codes": 200, "flyer": "flyers/season.png", "output_mode": "document"},
+#     "events": [
+#       {"name": "Konzert", "date": "2026-11-07"},
+#       {"name": "Theater", "date": "2026-11-14", "num_codes": 80, "flyer": "flyers/theater.png"}
+#     ]
+#   }
+# Values missing in an event are taken from the defaults and then from the settings of the generator.
+# Relative flyer paths are relative to the job file.
+_EVENT_KEYS = {"name", "date", "num_codes", "flyer", "flyer_dpi", "first_id", "allocate_ids", "output_mode",
+               "tickets_per_page", "payload_format"}
+
+
+@dataclass
+class Job:
+    """Events which are generated in one run, with the same key and worker processes"""
+    name: str
+    configs: List[Config]
+
+    def get_num_qr_codes(self) -> int:
+        return sum(gen_config.num_qr_codes for gen_config in self.configs)
+
+    def get_num_workers(self) -> int:
+        return max(gen_config.num_workers for gen_config in self.configs)
+
+
+def _get_event_config(values: Dict[str, Any], base_config: Config, job_dir: Path) -> Config:
+    unknown_keys = values.keys() - _EVENT_KEYS
+    if len(unknown_keys) != 0:
+        raise ValueError(f"unknown job file values: {', '.join(sorted(unknown_keys))}")
+    gen_config = replace(base_config)
+    if "name" in values:
+        gen_config.event_name = str(values["name"])
+    if "date" in values:
+        gen_config.event_date = datetime.strptime(values["date"], '%Y-%m-%d').date()
+    if "num_codes" in values:
+        gen_config.num_qr_codes = int(values["num_codes"])
+    if "flyer" in values:
+        gen_config.flyer_file_name = job_dir / values["flyer"] if values["flyer"] is not None else None
+    if "flyer_dpi" in values:
+        gen_config.flyer_dpi = int(values["flyer_dpi"])
+    if "first_id" in values:
+        gen_config.first_code = int(values["first_id"])
+    if "allocate_ids" in values:
+        gen_config.allocate_ids = bool(values["allocate_ids"])
+    if "output_mode" in values:
+        gen_config.output_mode = OutputMode[values["output_mode"].upper()]
+    if "tickets_per_page" in values:
+        gen_config.tickets_per_page = int(values["tickets_per_page"])
+    if "payload_format" in values:
+        gen_config.payload_format = PayloadFormat[values["payload_format"].upper()]
+    return gen_config
+
+
+def read_job_file(file_name: Path, base_config: Config) -> Job:
+    with open(file_name, "r", encoding="utf-8") as file:
+        job_values = json.load(file)
+    try:
+        default_config = _get_event_config(job_values.get("defaults", {}), base_config, file_name.parent)
+        configs = [_get_event_config(values, default_config, file_name.parent)
+                   for values in job_values["events"]]
+    except KeyError as error:
+        raise ValueError(f"invalid job file value: {error}") from error
+    if len(configs) == 0:
+        raise ValueError("the job file contains no events")
+    for gen_config in configs:
+        if len(gen_config.event_name) == 0 or gen_config.num_qr_codes <= 0:
+            raise ValueError("every event needs a name and a positive number of codes")
+    event_keys = [(gen_config.out_dir, gen_config.event_name, gen_config.event_date, gen_config.first_code)
+                  for gen_config in configs]
+    if len(set(event_keys)) != len(event_keys):
+        # the events would overwrite each others tickets
+        raise ValueError("the job file contains an event twice")
+    return Job(file_name.stem, configs)
@@ -0,0 +1,39 @@
+import os
+import csv
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Set
+from .csv_ledger import CsvLedger
+
+
+def read_completed_ids(file_name: Path) -> Set[int]:
+    # IDs of the tickets written with any layout, e.g. to find out whether a leased range is finished
+    if not os.path.exists(file_name):
+        return set()
+    with open(file_name, "r", encoding="utf-8", newline="") as file:
+        return {int(row[1]) for row in csv.reader(file, delimiter=',') if len(row) == 3 and row[1].isdigit()}
+
+
+class BatchManifest(CsvLedger):
+    """Class which records the IDs of the tickets which have been written completely"""
+
+    def __init__(self, file_name: Path, layout_key: str = "") -> None:
+        # tickets written with another flyer, format or key are written again
+        self.layout_key = layout_key
+        self.completed: Set[int] = set()
+        super().__init__(file_name)
+
+    def is_completed(self, ticket_id: int) -> bool:
+        return ticket_id in self.completed
+
+    def add(self, ticket_id: int) -> None:
+        if not self.is_open():
+            return
+        time_stamp = datetime.now(timezone.utc).isoformat()
+        self.completed.add(ticket_id)
+        self._append_row([time_stamp, ticket_id, self.layout_key])
+
+    def _read_row(self, row: List[str]) -> None:
+        # the last row may be incomplete if the generator was interrupted
+        if len(row) == 3 and row[1].isdigit() and row[2] == self.layout_key:
+            self.completed.add(int(row[1]))
@@ -0,0 +1,109 @@
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterator, Optional
+
+# signing the payload, encoding and drawing the QR-code, writing the PDF to its file or batch
+STAGES = ["sign", "render", "write"]
+
+
+class StageTimer:
+    """Class which accumulates the time a worker spends in each generation stage"""
+
+    def __init__(self) -> None:
+        self.durations: Dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[stage] = self.durations.get(
+                stage, 0.0) + time.perf_counter() - start
+
+    def pop_durations(self) -> Dict[str, float]:
+        durations = self.durations
+        self.durations = {}
+        return durations
+
+
+@dataclass
+class MetricsSnapshot:
+    """Progress, throughput and stage times of a generation run at one point in time"""
+    done: int
+    total: int
+    num_skipped: int
+    elapsed_s: float
+    tickets_per_second: float
+    eta_s: Optional[float]
+    stage_total_s: Dict[str, float] = field(default_factory=dict)
+
+    def get_stage_per_ticket_ms(self) -> Dict[str, float]:
+        num_generated = max(self.done - self.num_skipped, 1)
+        return {stage: 1000 * total / num_generated for stage, total in self.stage_total_s.items()}
+
+
+class GenerationMetrics:
+    """Class which collects the throughput and stage times of a generation run,
+    can be read by other threads while the run is going on"""
+
+    def __init__(self, total: int, num_skipped: int = 0) -> None:
+        self.started = datetime.now(timezone.utc)
+        self.start_time = time.monotonic()
+        self.total = total
+        self.num_skipped = num_skipped
+        self.done = num_skipped
+        self.stage_total_s = dict.fromkeys(STAGES, 0.0)
+        self.lock = Lock()
+
+    def add_stage_durations(self, durations: Dict[str, float]) -> None:
+        with self.lock:
+            for stage, duration in durations.items():
+                self.stage_total_s[stage] = self.stage_total_s.get(
+                    stage, 0.0) + duration
+
+    def add_skipped(self, num_skipped: int) -> None:
+        with self.lock:
+            self.num_skipped += num_skipped
+            self.done += num_skipped
+
+    def set_progress(self, progress: int) -> None:
+        # progress is the index of the last finished ticket, like for the progress listeners
+        with self.lock:
+            self.done = progress + 1
+
+    def get_snapshot(self) -> MetricsSnapshot:
+        with self.lock:
+            elapsed_s = time.monotonic() - self.start_time
+            # tickets skipped because of an earlier run do not count for the throughput
+            num_generated = self.done - self.num_skipped
+            rate = num_generated / elapsed_s if elapsed_s > 0 else 0.0
+            eta_s = (self.total - self.done) / rate if rate > 0 else None
+            return MetricsSnapshot(self.done, self.total, self.num_skipped, elapsed_s, rate, eta_s,
+                                   dict(self.stage_total_s))
+
+    def append_report(self, file_name: Path, run_values: Dict[str, object]) -> None:
+        # one JSON object per run, so the reports of earlier runs remain for comparison
+        snapshot = self.get_snapshot()
+        report = {
+            "started": self.started.isoformat(),
+            **run_values,
+            **asdict(snapshot),
+            "stage_per_ticket_ms": snapshot.get_stage_per_ticket_ms(),
+        }
+        file_name.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_name, "a", encoding="utf-8") as file:
+            file.write(json.dumps(report) + "\n")
+
+
+def format_duration(duration_s: float) -> str:
+    minutes, seconds = divmod(int(duration_s), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours > 0:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
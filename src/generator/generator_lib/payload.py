@@ -0,0 +1,65 @@
+import hashlib
+from datetime import date
+from .config import PayloadFormat
+from .qr import add_signature_to_message
+
+# Compact payload, version 1: base45 (RFC 9285) text of
+#   version (1 byte) | event hash (4 bytes) | ticket ID (varint) | signature
+# The signature covers everything in front of it. Base45 only uses characters of the QR alphanumeric mode,
+# which stores 5.5 bits per character instead of 8 bits in byte mode.
+COMPACT_PAYLOAD_VERSION = 1
+EVENT_HASH_SIZE = 4
+# size of the hashes in the list of issued tickets, the scanner accepts a code with a listed hash
+PAYLOAD_HASH_SIZE = 16
+_BASE45_CHARSET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:"
+
+
+def base45_encode(data: bytes) -> str:
+    encoded = []
+    for i in range(0, len(data) - 1, 2):
+        value = data[i] * 256 + data[i + 1]
+        encoded.append(_BASE45_CHARSET[value % 45])
+        encoded.append(_BASE45_CHARSET[value // 45 % 45])
+        encoded.append(_BASE45_CHARSET[value // 45 // 45])
+    if len(data) % 2 == 1:
+        encoded.append(_BASE45_CHARSET[data[-1] % 45])
+        encoded.append(_BASE45_CHARSET[data[-1] // 45])
+    return "".join(encoded)
+
+
+def encode_varint(value: int) -> bytes:
+    encoded = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value == 0:
+            encoded.append(byte)
+            return bytes(encoded)
+        encoded.append(byte | 0x80)
+
+
+def get_event_hash(event_name: str, event_date: date) -> bytes:
+    return hashlib.sha256(f"{event_name}_{event_date.strftime('%Y-%m-%d')}".encode()).digest()[:EVENT_HASH_SIZE]
+
+
+def get_payload_hash(data: str) -> bytes:
+    # covers the signature as well, so only the issued code itself matches
+    return hashlib.sha256(data.encode()).digest()[:PAYLOAD_HASH_SIZE]
+
+
+class PayloadCodec:
+    """Class which creates the signed message of a ticket and combines it with the signature"""
+
+    def __init__(self, payload_format: PayloadFormat) -> None:
+        self.payload_format = payload_format
+
+    def get_signed_message(self, event_name: str, event_date: date, ticket_id: int) -> bytes:
+        if self.payload_format == PayloadFormat.COMPACT:
+            return bytes([COMPACT_PAYLOAD_VERSION]) + get_event_hash(event_name, event_date) + \
+                encode_varint(ticket_id)
+        return f"{event_name}_{event_date.strftime('%Y-%m-%d')}_{ticket_id}".encode()
+
+    def encode(self, message: bytes, signature: bytes) -> str:
+        if self.payload_format == PayloadFormat.COMPACT:
+            return base45_encode(message + signature)
+        return add_signature_to_message(message.decode(), signature)
@@ -0,0 +1,47 @@
+import copy
+import reportlab.pdfgen.canvas
+from reportlab.pdfbase.pdfdoc import PDFImageXObject
+
+# reportlab has no public way to embed already encoded image data once per document, so this module uses its
+# internals: the filters of an image XObject, the document of the canvas and the image flag of its page.
+# They may change with any reportlab version and are checked before use, the callers draw the image with
+# the public drawImage otherwise.
+_DOCUMENT_METHODS = ("getXObjectName", "addForm")
+
+
+def is_image_xobject_supported() -> bool:
+    return hasattr(PDFImageXObject(""), "_filters")
+
+
+def can_draw_image_xobject(canvas: reportlab.pdfgen.canvas.Canvas) -> bool:
+    document = getattr(canvas, "_doc", None)
+    return hasattr(canvas, "_currentPageHasImages") and isinstance(getattr(document, "idToObject", None), dict) \
+        and all(callable(getattr(document, name, None)) for name in _DOCUMENT_METHODS)
+
+
+def create_image_xobject(name: str, size: tuple[int, int], color_space: str, data: bytes,
+                         pdf_filter: str) -> PDFImageXObject:
+    image = PDFImageXObject(name)
+    image.width, image.height = size
+    image.bitsPerComponent = 8
+    image.colorSpace = color_space
+    image.mask = None
+    image.streamContent = data
+    image._filters = (pdf_filter,)  # pylint: disable=protected-access
+    return image
+
+
+def draw_image_xobject(canvas: reportlab.pdfgen.canvas.Canvas, image: PDFImageXObject,
+                       position: tuple[float, float], size: tuple[float, float]) -> None:
+    # pylint: disable=protected-access
+    document = canvas._doc
+    if document.idToObject.get(document.getXObjectName(image.name)) is None:
+        # reportlab tags registered objects with their document, so each document gets a
+        # shallow copy which shares the already encoded image data
+        document.addForm(image.name, copy.copy(image))
+    canvas._currentPageHasImages = 1
+    canvas.saveState()
+    canvas.translate(*position)
+    canvas.scale(*size)
+    canvas.doForm(image.name)
+    canvas.restoreState()
@@ -0,0 +1,49 @@
+import json
+import sys
+from typing import Optional, Protocol, TextIO
+from .metrics import GenerationMetrics
+
+
+class ProgressListener(Protocol):
+    """Interface of the classes which are informed about the generation progress"""
+
+    def set_metrics(self, metrics: GenerationMetrics) -> None:
+        ...
+
+    def set_maximum(self, progress_max: int) -> None:
+        ...
+
+    def set_progress(self, progress: int) -> None:
+        ...
+
+
+class StdoutProgressIndicator:
+    """Class which prints the progress as one JSON object per line"""
+
+    def __init__(self, stream: Optional[TextIO] = sys.stdout) -> None:
+        # there is no stdout in the executable built without console, only the exit code remains
+        self.stream = stream
+        self.progress_max = 0
+        self.metrics: Optional[GenerationMetrics] = None
+
+    def print_event(self, event: str, **values: object) -> None:
+        if self.stream is None:
+            return
+        self.stream.write(json.dumps({"event": event, **values}) + "\n")
+        self.stream.flush()
+
+    def set_metrics(self, metrics: GenerationMetrics) -> None:
+        self.metrics = metrics
+
+    def set_maximum(self, progress_max: int) -> None:
+        self.progress_max = progress_max
+
+    def set_progress(self, progress: int) -> None:
+        # progress is the index of the last finished ticket
+        if self.metrics is None:
+            self.print_event("progress", done=progress + 1, total=self.progress_max)
+            return
+        snapshot = self.metrics.get_snapshot()
+        self.print_event("progress", done=progress + 1, total=self.progress_max,
+                         tickets_per_second=round(snapshot.tickets_per_second, 2),
+                         eta_s=round(snapshot.eta_s, 1) if snapshot.eta_s is not None else None)
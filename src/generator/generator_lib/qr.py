@@ -1,13 +1,17 @@
 import base64
 import os
+from io import BytesIO
 from pathlib import Path
 from urllib.parse import quote
+from types import TracebackType
+from typing import BinaryIO, Dict, List, Optional
+import numpy as np
 import qrcode
-import qrcode.image.svg
 import reportlab.pdfgen.canvas
-import reportlab.graphics.renderPDF
-import svglib.svglib
-
+from reportlab.lib.pagesizes import A4
+from .config import DEFAULT_FLYER_DPI
+from .qr_encoder import QrBatchEncoder
+from .template import TicketTemplate
 
 
 def remove_existing_file(name: str) -> None:
@@ -17,16 +21,56 @@ def remove_existing_file(name: str) -> None:
 
 def create_parent_directories(file_name: str) -> None:
     dir_name = os.path.dirname(file_name)
-    if not os.path.exists(dir_name):
-        os.makedirs(dir_name)
-
-
-def save_svg(data: str, svg_file_name: str) -> None:
-    remove_existing_file(svg_file_name)
-    qr = qrcode.QRCode(border=0, image_factory=qrcode.image.svg.SvgPathImage)
-    qr.add_data(data)
-    img = qr.make_image()
-    img.save(svg_file_name)
+    # several worker processes may create the same directory concurrently
+    os.makedirs(dir_name, exist_ok=True)
+
+
+def get_module_rects(matrix: List[List[bool]]) -> List[tuple[int, int, int, int]]:
+    # dark modules merged into rectangles of column, row, width and height, rows count from the top
+    # horizontal runs are merged first and equal runs of the following rows are then added to them
+    modules = np.asarray(matrix, dtype=np.int8)
+    edges = np.diff(np.pad(modules, ((0, 0), (1, 1))), axis=1)
+    open_rects: Dict[tuple[int, int], List[int]] = {}
+    rects: List[tuple[int, int, int, int]] = []
+    for i_row, row_edges in enumerate(edges):
+        run_starts = np.flatnonzero(row_edges == 1)
+        run_ends = np.flatnonzero(row_edges == -1)
+        row_rects: Dict[tuple[int, int], List[int]] = {}
+        for run in zip(run_starts.tolist(), run_ends.tolist()):
+            rect = open_rects.pop(run, None)
+            if rect is None:
+                rect = [run[0], i_row, run[1] - run[0], 0]
+            rect[3] += 1
+            row_rects[run] = rect
+        # rectangles without an equal run in this row are complete
+        rects.extend((rect[0], rect[1], rect[2], rect[3]) for rect in open_rects.values())
+        open_rects = row_rects
+    rects.extend((rect[0], rect[1], rect[2], rect[3]) for rect in open_rects.values())
+    return rects
+
+
+def draw_qr_matrix(canvas: reportlab.pdfgen.canvas.Canvas, matrix: List[List[bool]],
+                   x: float, y: float, size: float) -> None:
+    # (x, y) is the lower left corner of the QR-code
+    module_size = size / len(matrix)
+    canvas.saveState()
+    # drawn in units of modules, so the path only contains short integers
+    canvas.translate(x, y)
+    canvas.scale(module_size, module_size)
+    path = canvas.beginPath()
+    for col, row, width, height in get_module_rects(matrix):
+        # the first matrix row is the top row of the QR-code
+        path.rect(col, len(matrix) - row - height, width, height)
+    canvas.drawPath(path, stroke=0, fill=1)
+    canvas.restoreState()
+
+
+def save_ticket_file(ticket: bytes, file_name: str, extension: str = "pdf") -> None:
+    create_parent_directories(file_name)
+    ticket_file_name = f"{file_name}.{extension}"
+    remove_existing_file(ticket_file_name)
+    with open(ticket_file_name, "wb") as file:
+        file.write(ticket)
 
 
 def save_png(data: str, png_file_name: str) -> None:
@@ -34,45 +78,144 @@ def save_png(data: str, png_file_name: str) -> None:
     img = qrcode.make(data)
     img.save(png_file_name)
 
+
 class TicketWriter:
     """Class for writing tickets"""
-    def __init__(self, flyer_file_name: Path | None) -> None:
-        if flyer_file_name is not None:
-            self.reader = reportlab.pdfgen.canvas.ImageReader(flyer_file_name)
-        else:
-            self.reader = None
-
-    def _convert_svg_to_ticket_pdf(self, svg_file_name: str, pdf_file_name: str) -> None:
-        border_size = 10
-        remove_existing_file(pdf_file_name)
-        canvas = reportlab.pdfgen.canvas.Canvas(pdf_file_name)
-        qr_drawing = svglib.svglib.svg2rlg(svg_file_name)
-        scale = 298/(qr_drawing.height + 2 * border_size)  # scale to width of A5
-        qr_drawing_size = qr_drawing.height * scale
-        qr_drawing.scale(scale, scale)
-        reportlab.graphics.renderPDF.draw(
-            qr_drawing, canvas=canvas, x=border_size, y=border_size)
-        if self.reader is not None:
-            flyer_size = self.reader.getSize()
-            scaled_flyer_size = [qr_drawing_size, flyer_size[1]
-                                 * (qr_drawing_size / flyer_size[0])]
-            canvas.drawImage(self.reader, x=border_size, y=qr_drawing_size + 2 * border_size,
-                             width=scaled_flyer_size[0], height=scaled_flyer_size[1])
-            canvas.setPageSize(
-                [qr_drawing_size + 2 * border_size,  qr_drawing_size + 3 * border_size + scaled_flyer_size[1]])
-        else:
-            canvas.setPageSize(
-                [qr_drawing_size + 2 * border_size,  qr_drawing_size + 2 * border_size])
-        canvas.save()
 
+    def __init__(self, flyer_file_name: Path | None, flyer_dpi: int = DEFAULT_FLYER_DPI) -> None:
+        self.template = TicketTemplate(flyer_file_name, flyer_dpi)
+        self.encoder = QrBatchEncoder()
+
+    def create_qr_matrix(self, data: str) -> List[List[bool]]:
+        return self.encoder.encode(data)
+
+    def get_ticket_size(self, matrix: List[List[bool]]) -> tuple[float, float]:
+        return self.template.get_layout(len(matrix)).page_size
+
+    def draw_ticket(self, canvas: reportlab.pdfgen.canvas.Canvas, matrix: List[List[bool]]) -> None:
+        # draws the ticket with its lower left corner at the origin of the canvas
+        layout = self.template.get_layout(len(matrix))
+        qr_x, qr_y = layout.get_qr_position()
+        draw_qr_matrix(canvas, matrix, qr_x, qr_y, layout.qr_size)
+        self.template.draw_flyer(canvas, layout)
+
+    def _write_ticket_pdf(self, matrix: List[List[bool]], pdf_file: str | BinaryIO) -> None:
+        canvas = reportlab.pdfgen.canvas.Canvas(pdf_file, pageCompression=1)
+        self.draw_ticket(canvas, matrix)
+        canvas.setPageSize(self.get_ticket_size(matrix))
+        canvas.save()
 
     def save_ticket(self, data: str, file_name: str) -> None:
+        save_ticket_file(self.render_ticket(data), file_name)
+
+    def render_ticket(self, data: str) -> bytes:
+        pdf_file = BytesIO()
+        self._write_ticket_pdf(self.create_qr_matrix(data), pdf_file)
+        return pdf_file.getvalue()
+
+
+# reportlab keeps every page of a canvas in memory until the document is saved, about 10 kB per ticket,
+# so the tickets of larger batches are split into several documents
+MAX_TICKETS_PER_DOCUMENT = 2000
+
+
+class TicketDocumentWriter:
+    """Class for writing many tickets into a single PDF document, either one ticket per page
+    or several tickets imposed on A4 sheets, a batch of more than MAX_TICKETS_PER_DOCUMENT tickets
+    is split into several documents, e.g. <file_name>_part2of3.pdf"""
+
+    def __init__(self, ticket_writer: TicketWriter, file_name: str, tickets_per_page: int, num_tickets: int) -> None:
         create_parent_directories(file_name)
-        svg_file_name = f"{file_name}.svg"
-        save_svg(data, svg_file_name)
-        pdf_file_name = f"{file_name}.pdf"
-        self._convert_svg_to_ticket_pdf(svg_file_name, pdf_file_name)
-        remove_existing_file(svg_file_name)
+        self.ticket_writer = ticket_writer
+        self.tickets_per_page = tickets_per_page
+        num_documents = max(-(-num_tickets // self._get_tickets_per_document()), 1)
+        self.pdf_file_names = [f"{file_name}.pdf"] if num_documents == 1 else \
+            [f"{file_name}_part{i_document + 1}of{num_documents}.pdf" for i_document in range(num_documents)]
+        for pdf_file_name in self.pdf_file_names:
+            remove_existing_file(pdf_file_name)
+        self.num_added = 0
+        self.canvas = self._create_canvas(0)
+        self.grid: Optional[tuple[int, int]] = None
+        self.num_on_page = 0
+
+    def _get_tickets_per_document(self) -> int:
+        # only whole sheets, so every document has the same imposition
+        return max(MAX_TICKETS_PER_DOCUMENT // self.tickets_per_page, 1) * self.tickets_per_page
+
+    def _create_canvas(self, i_document: int) -> reportlab.pdfgen.canvas.Canvas:
+        pdf_file_name = self.pdf_file_names[i_document]
+        canvas = reportlab.pdfgen.canvas.Canvas(pdf_file_name, pagesize=A4, pageCompression=1)
+        canvas.setTitle(os.path.splitext(os.path.basename(pdf_file_name))[0])
+        return canvas
+
+    def __enter__(self) -> "TicketDocumentWriter":
+        return self
+
+    def __exit__(self,
+                 exc_type: type[BaseException] | None,
+                 exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        self.close()
+
+    def _get_grid(self, ticket_size: tuple[float, float]) -> tuple[int, int]:
+        # columns and rows which allow the largest tickets on the sheet
+        if self.grid is None:
+            self.grid = max(
+                ((cols, -(-self.tickets_per_page // cols))
+                 for cols in range(1, self.tickets_per_page + 1)),
+                key=lambda grid: min(A4[0] / grid[0] / ticket_size[0], A4[1] / grid[1] / ticket_size[1]))
+        return self.grid
+
+    def _add_bookmark(self, ticket_name: str, left: float, top: float) -> None:
+        self.canvas.bookmarkPage(ticket_name, fit="XYZ", left=left, top=top)
+        self.canvas.addOutlineEntry(ticket_name, ticket_name)
+
+    def _add_ticket_page(self, matrix: List[List[bool]], ticket_name: str) -> None:
+        ticket_size = self.ticket_writer.get_ticket_size(matrix)
+        self.canvas.setPageSize(ticket_size)
+        self.ticket_writer.draw_ticket(self.canvas, matrix)
+        self._add_bookmark(ticket_name, 0, ticket_size[1])
+        self.canvas.showPage()
+
+    def _add_ticket_to_sheet(self, matrix: List[List[bool]], ticket_name: str) -> None:
+        ticket_size = self.ticket_writer.get_ticket_size(matrix)
+        cols, rows = self._get_grid(ticket_size)
+        cell_width = A4[0] / cols
+        cell_height = A4[1] / rows
+        scale = min(cell_width / ticket_size[0],
+                    cell_height / ticket_size[1], 1)
+        i_col = self.num_on_page % cols
+        i_row = self.num_on_page // cols
+        x = i_col * cell_width + (cell_width - ticket_size[0] * scale) / 2
+        y = A4[1] - (i_row + 1) * cell_height + \
+            (cell_height - ticket_size[1] * scale) / 2
+        self.canvas.saveState()
+        self.canvas.translate(x, y)
+        self.canvas.scale(scale, scale)
+        self.ticket_writer.draw_ticket(self.canvas, matrix)
+        self.canvas.restoreState()
+        self._add_bookmark(ticket_name, x, y + ticket_size[1] * scale)
+        self.num_on_page += 1
+        if self.num_on_page == self.tickets_per_page:
+            self.canvas.showPage()
+            self.num_on_page = 0
+
+    def add_ticket(self, data: str, ticket_name: str) -> None:
+        i_document, num_in_document = divmod(self.num_added, self._get_tickets_per_document())
+        if self.num_added > 0 and num_in_document == 0 and i_document < len(self.pdf_file_names):
+            # saving frees the pages of the full document
+            self.canvas.save()
+            self.canvas = self._create_canvas(i_document)
+        self.num_added += 1
+        matrix = self.ticket_writer.create_qr_matrix(data)
+        if self.tickets_per_page > 1:
+            self._add_ticket_to_sheet(matrix, ticket_name)
+        else:
+            self._add_ticket_page(matrix, ticket_name)
+
+    def close(self) -> None:
+        # shows the last, partially filled sheet
+        self.canvas.save()
 
 
 def save_public_key(data: str, file_name: str) -> None:
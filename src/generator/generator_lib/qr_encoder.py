@@ -0,0 +1,289 @@
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List
+import numpy as np
+import numpy.typing as npt
+from qrcode import QRCode, constants, exceptions, util
+from qrcode.base import EXP_TABLE, LOG_TABLE, rs_blocks
+
+BitArray = npt.NDArray[np.uint8]
+ModuleArray = npt.NDArray[np.bool_]
+
+NUM_MASKS = 8
+# first version of each range with the same sizes of the character count fields
+_VERSION_GROUPS = [(1, 10), (10, 27), (27, 41)]
+_PAD_CODEWORDS = [0xEC, 0x11]
+# dark:light ratio 1:1:3:1:1 of a finder pattern next to four light modules, as 11 bit numbers
+_FINDER_LIKE_PATTERNS = (0b10111010000, 0b00001011101)
+_FINDER_LIKE_LENGTH = 11
+
+
+def _create_gf_multiplication_table() -> npt.NDArray[np.uint8]:
+    exp_table = np.array(EXP_TABLE[:255] * 2, dtype=np.uint8)
+    log_table = np.array(LOG_TABLE, dtype=np.int32)
+    table: npt.NDArray[np.uint8] = exp_table[log_table[:, None] + log_table[None, :]]
+    table[0, :] = 0
+    table[:, 0] = 0
+    return table
+
+
+_GF_MUL = _create_gf_multiplication_table()
+
+
+def _to_bits(values: List[int], width: int) -> BitArray:
+    shifts = np.arange(width - 1, -1, -1, dtype=np.uint32)
+    return ((np.array(values, dtype=np.uint32)[:, None] >> shifts) & 1).astype(np.uint8).ravel()
+
+
+def _encode_segment_data(segment: util.QRData) -> BitArray:
+    data: bytes = segment.data
+    if segment.mode == util.MODE_NUMBER:
+        groups = [data[i:i + 3] for i in range(0, len(data), 3)]
+        return np.concatenate([_to_bits([int(group)], util.NUMBER_LENGTH[len(group)]) for group in groups])
+    if segment.mode == util.MODE_ALPHA_NUM:
+        values = [util.ALPHA_NUM.find(char) for char in data]
+        bits = _to_bits([first * 45 + second for first, second in zip(values[0::2], values[1::2])], 11)
+        if len(values) % 2 == 1:
+            bits = np.concatenate([bits, _to_bits([values[-1]], 6)])
+        return bits
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+
+
+def _create_rs_generator(num_ec: int) -> List[int]:
+    # product of (x - a^i) for i < num_ec, highest power first
+    generator = [1]
+    for i in range(num_ec):
+        factor = EXP_TABLE[i]
+        generator = [coefficient ^ int(_GF_MUL[previous, factor])
+                     for coefficient, previous in zip(generator + [0], [0] + generator)]
+    return generator
+
+
+def _create_rs_matrix(num_data: int, num_ec: int) -> npt.NDArray[np.float32]:
+    # the error correction bits are a linear function of the data bits over GF(2), so the
+    # codewords of every unit vector give the matrix which encodes a whole block at once
+    unit_vectors = np.packbits(np.eye(num_data * 8, dtype=np.uint8), axis=1)
+    generator_products = _GF_MUL[:, _create_rs_generator(num_ec)[1:]]
+    remainder = np.zeros((num_data * 8, num_ec), dtype=np.uint8)
+    for i_data in range(num_data):
+        factor = unit_vectors[:, i_data] ^ remainder[:, 0]
+        remainder[:, :-1] = remainder[:, 1:]
+        remainder[:, -1] = 0
+        remainder ^= generator_products[factor]
+    return np.unpackbits(remainder, axis=1).astype(np.float32)
+
+
+def _get_data_positions(is_function: ModuleArray) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    # two module wide columns from right to left, alternately upwards and downwards
+    size = len(is_function)
+    rows: List[int] = []
+    cols: List[int] = []
+    upwards = True
+    for right_col in range(size - 1, 0, -2):
+        if right_col <= 6:
+            right_col -= 1  # the vertical timing pattern is skipped
+        for row in (range(size - 1, -1, -1) if upwards else range(size)):
+            for col in (right_col, right_col - 1):
+                if not is_function[row, col]:
+                    rows.append(row)
+                    cols.append(col)
+        upwards = not upwards
+    return np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)
+
+
+def _create_masks(rows: npt.NDArray[np.intp], cols: npt.NDArray[np.intp]) -> ModuleArray:
+    return np.array([
+        (rows + cols) % 2 == 0,
+        rows % 2 == 0,
+        cols % 3 == 0,
+        (rows + cols) % 3 == 0,
+        (rows // 2 + cols // 3) % 2 == 0,
+        (rows * cols) % 2 + (rows * cols) % 3 == 0,
+        ((rows * cols) % 2 + (rows * cols) % 3) % 2 == 0,
+        ((rows * cols) % 3 + (rows + cols) % 2) % 2 == 0,
+    ], dtype=np.bool_)
+
+
+def _get_run_penalties(candidates: ModuleArray) -> npt.NDArray[np.int64]:
+    # 3 points for five modules of the same color in a row or column, 1 for each further module
+    num_candidates, size, _ = candidates.shape
+    lines = np.concatenate([candidates.reshape(-1, size),
+                            candidates.transpose(0, 2, 1).reshape(-1, size)])
+    is_run_start = np.ones((len(lines), size + 1), dtype=np.bool_)
+    is_run_start[:, 1:size] = lines[:, 1:] != lines[:, :-1]
+    starts = np.flatnonzero(is_run_start)
+    # the runs between the end of a line and the start of the next one have length 1
+    lengths = np.diff(starts)
+    penalties = np.where(lengths >= 5, lengths - 2, 0)
+    i_candidates = starts[:-1] // (size + 1) // size % num_candidates
+    return np.bincount(i_candidates, weights=penalties, minlength=num_candidates).astype(np.int64)
+
+
+def _get_finder_like_counts(lines: ModuleArray) -> npt.NDArray[np.int64]:
+    # each window of 11 modules in a row becomes a number, which is compared to the patterns
+    num_windows = lines.shape[2] - _FINDER_LIKE_LENGTH + 1
+    windows = np.zeros(lines.shape[:2] + (num_windows,), dtype=np.int16)
+    for offset in range(_FINDER_LIKE_LENGTH):
+        windows <<= 1
+        windows |= lines[:, :, offset:offset + num_windows]
+    matches = (windows == _FINDER_LIKE_PATTERNS[0]) | (windows == _FINDER_LIKE_PATTERNS[1])
+    counts: npt.NDArray[np.int64] = matches.sum(axis=(1, 2))
+    return counts
+
+
+def _get_penalties(candidates: ModuleArray) -> npt.NDArray[np.int64]:
+    # penalty rules of ISO/IEC 18004 for each candidate mask, the lowest penalty wins
+    size = candidates.shape[1]
+    penalties = _get_run_penalties(candidates)
+    same_blocks = (candidates[:, :-1, :-1] == candidates[:, 1:, :-1]) & \
+        (candidates[:, :-1, :-1] == candidates[:, :-1, 1:]) & \
+        (candidates[:, :-1, :-1] == candidates[:, 1:, 1:])
+    penalties += 3 * same_blocks.sum(axis=(1, 2))
+    penalties += 40 * (_get_finder_like_counts(candidates) +
+                       _get_finder_like_counts(candidates.transpose(0, 2, 1)))
+    dark_percent = candidates.sum(axis=(1, 2)) * 100 / (size * size)
+    penalties += 10 * (np.abs(dark_percent - 50) // 5).astype(np.int64)
+    return penalties
+
+
+@dataclass
+class _VersionTemplate:
+    """Modules and error correction structure which are the same for all QR-codes of a version"""
+    function_modules: ModuleArray  # function patterns including the format information of each mask
+    blank_modules: ModuleArray  # function patterns with empty format information, used for choosing the mask
+    data_rows: npt.NDArray[np.intp]
+    data_cols: npt.NDArray[np.intp]
+    masks: ModuleArray
+    num_data_codewords: int
+    block_index: npt.NDArray[np.intp]
+    interleave_index: npt.NDArray[np.intp]
+    rs_matrix: npt.NDArray[np.float32]
+
+
+def _create_function_modules(qr: QRCode, mask_pattern: int | None) -> ModuleArray:
+    size = qr.version * 4 + 17
+    qr.modules_count = size
+    qr.modules = [[None] * size for _ in range(size)]
+    qr.setup_position_probe_pattern(0, 0)
+    qr.setup_position_probe_pattern(size - 7, 0)
+    qr.setup_position_probe_pattern(0, size - 7)
+    qr.setup_position_adjust_pattern()
+    qr.setup_timing_pattern()
+    is_test = mask_pattern is None
+    qr.setup_type_info(is_test, mask_pattern or 0)
+    if qr.version >= 7:
+        qr.setup_type_number(is_test)
+    return np.array([[module is True for module in row] for row in qr.modules], dtype=np.bool_)
+
+
+def _create_block_indices(data_counts: List[int],
+                          num_ec: int) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    # index of the data codewords of each block and order of the data and error correction codewords
+    max_data_count = max(data_counts)
+    num_data_codewords = sum(data_counts)
+    offsets = np.cumsum([0] + data_counts)
+    # shorter blocks get leading zeros, which do not change their error correction codewords
+    block_index = np.full((len(data_counts), max_data_count), num_data_codewords, dtype=np.intp)
+    for i_block, data_count in enumerate(data_counts):
+        block_index[i_block, max_data_count - data_count:] = np.arange(
+            offsets[i_block], offsets[i_block] + data_count)
+    interleave_index = [offsets[i_block] + i_data
+                        for i_data in range(max_data_count)
+                        for i_block, data_count in enumerate(data_counts) if i_data < data_count]
+    interleave_index += [num_data_codewords + i_block * num_ec + i_ec
+                         for i_ec in range(num_ec) for i_block in range(len(data_counts))]
+    return block_index, np.array(interleave_index, dtype=np.intp)
+
+
+def _create_version_template(version: int, error_correction: int) -> _VersionTemplate:
+    qr = QRCode(version=version, error_correction=error_correction, border=0)
+    _create_function_modules(qr, None)
+    is_function = np.array([[module is not None for module in row] for row in qr.modules], dtype=np.bool_)
+    blank_modules = np.array([[module is True for module in row] for row in qr.modules], dtype=np.bool_)
+    function_modules = np.array([_create_function_modules(qr, mask_pattern)
+                                 for mask_pattern in range(NUM_MASKS)])
+    data_rows, data_cols = _get_data_positions(is_function)
+    blocks = rs_blocks(version, error_correction)
+    data_counts = [block.data_count for block in blocks]
+    num_ec = blocks[0].total_count - blocks[0].data_count
+    block_index, interleave_index = _create_block_indices(data_counts, num_ec)
+    return _VersionTemplate(function_modules, blank_modules, data_rows, data_cols,
+                            _create_masks(data_rows, data_cols), sum(data_counts), block_index,
+                            interleave_index, _create_rs_matrix(max(data_counts), num_ec))
+
+
+class QrBatchEncoder:
+    """Class which encodes the payloads of a batch into QR-code modules, the payloads of a batch have
+    the same length and structure, so the version dependent parts are computed once and reused"""
+
+    def __init__(self, error_correction: int = constants.ERROR_CORRECT_M) -> None:
+        self.error_correction = error_correction
+        self.templates: Dict[int, _VersionTemplate] = {}
+
+    def get_template(self, version: int) -> _VersionTemplate:
+        template = self.templates.get(version)
+        if template is None:
+            template = _create_version_template(version, self.error_correction)
+            self.templates[version] = template
+        return template
+
+    def _get_version(self, segments: List[util.QRData], data_bits: List[BitArray]) -> int:
+        # the smallest version which fits the data, like qrcode chooses it
+        bit_limits = util.BIT_LIMIT_TABLE[self.error_correction]
+        for first_version, end_version in _VERSION_GROUPS:
+            num_bits = sum(4 + util.length_in_bits(segment.mode, first_version) + len(bits)
+                           for segment, bits in zip(segments, data_bits))
+            version = bisect_left(bit_limits, num_bits, first_version)
+            if version < end_version:
+                return version
+        raise exceptions.DataOverflowError()
+
+    def _create_data_codewords(self, segments: List[util.QRData], data_bits: List[BitArray],
+                               version: int, num_data_codewords: int) -> BitArray:
+        bits = np.concatenate([
+            part for segment, segment_bits in zip(segments, data_bits)
+            for part in (_to_bits([segment.mode], 4),
+                         _to_bits([len(segment)], util.length_in_bits(segment.mode, version)),
+                         segment_bits)])
+        # terminator of up to four bits, the bytes are padded with zeros
+        num_terminator_bits = min(num_data_codewords * 8 - len(bits), 4)
+        codewords = np.packbits(np.concatenate([bits, np.zeros(num_terminator_bits, dtype=np.uint8)]))
+        num_pad_codewords = num_data_codewords - len(codewords)
+        return np.concatenate([codewords, np.resize(np.array(_PAD_CODEWORDS, dtype=np.uint8), num_pad_codewords),
+                               np.zeros(1, dtype=np.uint8)])
+
+    def _create_codewords(self, segments: List[util.QRData], data_bits: List[BitArray],
+                          version: int, template: _VersionTemplate) -> BitArray:
+        # the last data codeword is a zero used for the padding of shorter blocks
+        data_codewords = self._create_data_codewords(segments, data_bits, version, template.num_data_codewords)
+        block_bits = np.unpackbits(data_codewords[template.block_index], axis=1).astype(np.float32)
+        ec_bits = (block_bits @ template.rs_matrix).astype(np.int32) & 1
+        ec_codewords = np.packbits(ec_bits.astype(np.uint8), axis=1)
+        codewords: BitArray = np.concatenate([data_codewords[:-1], ec_codewords.ravel()])[template.interleave_index]
+        return codewords
+
+    def encode_modules(self, data: str) -> ModuleArray:
+        # same segments as qrcode, so the modules are identical to the ones qrcode creates
+        segments = list(util.optimal_data_chunks(data, minimum=20))
+        data_bits = [_encode_segment_data(segment) for segment in segments]
+        version = self._get_version(segments, data_bits)
+        template = self.get_template(version)
+        codewords = self._create_codewords(segments, data_bits, version, template)
+
+        # remainder bits after the last codeword stay light before masking
+        data_modules = np.zeros(len(template.data_rows), dtype=np.bool_)
+        codeword_bits = np.unpackbits(codewords)
+        data_modules[:len(codeword_bits)] = codeword_bits
+        masked_modules = data_modules[None, :] ^ template.masks
+
+        candidates = np.repeat(template.blank_modules[None], NUM_MASKS, axis=0)
+        candidates[:, template.data_rows, template.data_cols] = masked_modules
+        mask_pattern = int(np.argmin(_get_penalties(candidates)))
+
+        modules: ModuleArray = template.function_modules[mask_pattern].copy()
+        modules[template.data_rows, template.data_cols] = masked_modules[mask_pattern]
+        return modules
+
+    def encode(self, data: str) -> List[List[bool]]:
+        matrix: List[List[bool]] = self.encode_modules(data).tolist()
+        return matrix
@@ -0,0 +1,144 @@
+import struct
+import zlib
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Optional
+import numpy as np
+import numpy.typing as npt
+from PIL import Image
+from .config import OutputMode
+from .qr_encoder import ModuleArray, QrBatchEncoder
+
+# file extensions of the output modes which write one image per ticket
+RASTER_FORMATS: Dict[OutputMode, str] = {
+    OutputMode.PNG_FILES: "png",
+    OutputMode.WEBP_FILES: "webp",
+}
+MODULE_SIZE_PX = 10
+# light border around the QR-code which scanners need to find it on a screen
+QUIET_ZONE_MODULES = 4
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_PNG_FILTER_SUB = 1
+_ZLIB_HEADER = b"\x78\x9c"
+# the static rows are compressed once and well, the rows of each ticket are mostly white and
+# compress almost as well with a fast level
+_STATIC_COMPRESSION_LEVEL = 6
+_TICKET_COMPRESSION_LEVEL = 3
+
+PixelArray = npt.NDArray[np.uint8]
+
+
+def _create_png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data))
+
+
+def _filter_png_rows(pixels: PixelArray) -> bytes:
+    # each byte minus the same color channel of the pixel on its left, long runs become zeros
+    bytes_per_pixel = pixels.shape[2] if pixels.ndim == 3 else 1
+    rows = pixels.reshape(len(pixels), -1)
+    filtered = np.empty((len(rows), rows.shape[1] + 1), dtype=np.uint8)
+    filtered[:, 0] = _PNG_FILTER_SUB
+    filtered[:, 1:bytes_per_pixel + 1] = rows[:, :bytes_per_pixel]
+    filtered[:, bytes_per_pixel + 1:] = rows[:, bytes_per_pixel:] - rows[:, :-bytes_per_pixel]
+    return filtered.tobytes()
+
+
+class PngTemplate:
+    """Class which compresses the rows above the QR-code once and appends the compressed rows of each ticket"""
+
+    def __init__(self, background: PixelArray, num_static_rows: int) -> None:
+        height, width = background.shape[:2]
+        color_type = 2 if background.ndim == 3 else 0  # RGB or grayscale
+        self.header = _PNG_SIGNATURE + _create_png_chunk(
+            b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+        self.num_static_rows = num_static_rows
+        static_rows = _filter_png_rows(background[:num_static_rows])
+        # the sync flush ends the raw deflate data of the static rows without ending the stream, so the
+        # rows of each ticket can follow in separately compressed blocks
+        compressor = zlib.compressobj(_STATIC_COMPRESSION_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+        self.static_data = _ZLIB_HEADER + compressor.compress(static_rows) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        # the checksums are continued for each ticket instead of running over the static rows again
+        self.static_adler = zlib.adler32(static_rows)
+        self.static_crc = zlib.crc32(b"IDAT" + self.static_data)
+
+    def encode(self, rows: PixelArray) -> bytes:
+        # rows are the pixels below the static rows
+        ticket_rows = _filter_png_rows(rows)
+        compressor = zlib.compressobj(_TICKET_COMPRESSION_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+        ticket_data = compressor.compress(ticket_rows) + compressor.flush() + \
+            struct.pack(">I", zlib.adler32(ticket_rows, self.static_adler))
+        return b"".join([
+            self.header,
+            struct.pack(">I", len(self.static_data) + len(ticket_data)), b"IDAT", self.static_data, ticket_data,
+            struct.pack(">I", zlib.crc32(ticket_data, self.static_crc)),
+            _create_png_chunk(b"IEND", b"")])
+
+
+@dataclass
+class RasterLayout:
+    """Pixel positions on a raster ticket and the background with the already scaled flyer"""
+    qr_position: tuple[int, int]  # row and column of the upper left corner of the QR-code
+    background: PixelArray
+    png_template: PngTemplate
+
+
+class RasterTicketWriter:
+    """Class for rendering tickets into PNG or WebP images, the QR-code is at the bottom and the flyer above it"""
+
+    def __init__(self, flyer_file_name: Path | None, output_mode: OutputMode) -> None:
+        self.image_format = RASTER_FORMATS[output_mode]
+        self.flyer: Optional[Image.Image] = None
+        if flyer_file_name is not None:
+            with Image.open(flyer_file_name) as flyer:
+                self.flyer = flyer.convert("RGB")
+        self.encoder = QrBatchEncoder()
+        # the layout only depends on the number of QR-code modules
+        self.layouts: Dict[int, RasterLayout] = {}
+
+    def get_layout(self, num_modules: int) -> RasterLayout:
+        layout = self.layouts.get(num_modules)
+        if layout is None:
+            layout = self._create_layout(num_modules)
+            self.layouts[num_modules] = layout
+        return layout
+
+    def _create_layout(self, num_modules: int) -> RasterLayout:
+        qr_size = num_modules * MODULE_SIZE_PX
+        border = QUIET_ZONE_MODULES * MODULE_SIZE_PX
+        width = qr_size + 2 * border
+        if self.flyer is None:
+            background = np.full((width, width), 255, dtype=np.uint8)
+            return RasterLayout((border, border), background, PngTemplate(background, border))
+        # the flyer is scaled once, every ticket copies the prepared background
+        flyer_height = round(self.flyer.height * qr_size / self.flyer.width)
+        flyer = np.asarray(self.flyer.resize((qr_size, flyer_height), Image.Resampling.LANCZOS))
+        background = np.full((flyer_height + qr_size + 3 * border, width, 3), 255, dtype=np.uint8)
+        background[border:border + flyer_height, border:border + qr_size] = flyer
+        qr_row = flyer_height + 2 * border
+        return RasterLayout((qr_row, border), background, PngTemplate(background, qr_row))
+
+    def draw_ticket(self, modules: ModuleArray, first_row: int = 0) -> PixelArray:
+        # draws the rows of the ticket starting at first_row, which must be above the QR-code
+        layout = self.get_layout(len(modules))
+        pixels = layout.background[first_row:].copy()
+        gray_levels = np.where(modules, 0, 255).astype(np.uint8)
+        qr_pixels = np.repeat(np.repeat(gray_levels, MODULE_SIZE_PX, axis=0), MODULE_SIZE_PX, axis=1)
+        row, col = layout.qr_position
+        row -= first_row
+        if pixels.ndim == 3:
+            qr_pixels = qr_pixels[:, :, None]
+        pixels[row:row + len(qr_pixels), col:col + len(qr_pixels)] = qr_pixels
+        return pixels
+
+    def render_ticket(self, data: str) -> bytes:
+        modules = self.encoder.encode_modules(data)
+        if self.image_format == "png":
+            png_template = self.get_layout(len(modules)).png_template
+            # only the rows below the flyer differ between the tickets
+            return png_template.encode(self.draw_ticket(modules, png_template.num_static_rows))
+        image_file = BytesIO()
+        # lossless, so the edges of the modules stay sharp
+        Image.fromarray(self.draw_ticket(modules)).save(image_file, "WEBP", lossless=True, method=0)
+        return image_file.getvalue()
@@ -0,0 +1,34 @@
+import base64
+from pathlib import Path
+from typing import Dict, List, Optional
+from .csv_ledger import CsvLedger
+
+
+class SignatureStore(CsvLedger):
+    """Class which keeps the signatures of the tickets of an event, so tickets can be rendered again
+    without signing them again"""
+
+    def __init__(self, file_name: Path, key_fingerprint: str) -> None:
+        # signatures of other keys are ignored, they do not verify with the current public key
+        self.key_fingerprint = key_fingerprint
+        self.signatures: Dict[bytes, bytes] = {}
+        super().__init__(file_name)
+
+    def get(self, message: bytes) -> Optional[bytes]:
+        return self.signatures.get(message)
+
+    def add(self, message: bytes, signature: bytes) -> None:
+        if not self.is_open():
+            return
+        self.signatures[message] = signature
+        # flushed like the manifest, a resumed run reuses the signatures of the tickets written before
+        self._append_row([self.key_fingerprint, message.hex(), base64.b64encode(signature).decode()])
+
+    def _read_row(self, row: List[str]) -> None:
+        if len(row) != 3 or row[0] != self.key_fingerprint:
+            return
+        try:
+            self.signatures[bytes.fromhex(row[1])] = base64.b64decode(row[2], validate=True)
+        except ValueError:
+            # the last row may be incomplete if the generator was interrupted
+            return
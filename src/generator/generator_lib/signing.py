@@ -1,39 +1,80 @@
 import os
 import base64
+import hashlib
 from urllib.parse import quote
 from pathlib import Path
-from Crypto.PublicKey import RSA
-from Crypto.Signature import pss
+from Crypto.PublicKey import RSA, ECC
+from Crypto.Signature import pss, eddsa
 from Crypto.Hash import SHA256
 from . import qr
+from .config import KeyType
 
-def save_key(key: RSA.RsaKey, file_name: str) -> None:
+SigningKey = RSA.RsaKey | ECC.EccKey
+
+
+def export_key(key: SigningKey) -> bytes:
+    if isinstance(key, RSA.RsaKey):
+        return key.export_key()
+    return key.export_key(format="PEM").encode()
+
+
+def get_key_fingerprint(key: SigningKey) -> str:
+    return hashlib.sha256(export_key(key.public_key())).hexdigest()[:16]
+
+
+def save_key(key: SigningKey, file_name: str) -> None:
     with open(file_name, "wb") as file_out:
-        file_out.write(key.export_key())
+        file_out.write(export_key(key))
         file_out.close()
 
 
-def read_key(private_key_path: Path) -> RSA.RsaKey:
+def import_key(pem: bytes) -> SigningKey:
+    # the key type is detected from the PEM content
+    try:
+        return RSA.import_key(pem)
+    except ValueError:
+        return ECC.import_key(pem)
+
+
+def get_key_type(key: SigningKey) -> KeyType:
+    # Ed25519 is the only elliptic curve the generator creates keys for
+    if isinstance(key, ECC.EccKey):
+        return KeyType.ED25519
+    return KeyType.RSA
+
+
+def read_key(private_key_path: Path, key_type: KeyType = KeyType.RSA) -> SigningKey:
     if not os.path.exists(private_key_path):
-        write_keys(private_key_path)
+        write_keys(private_key_path, key_type)
     with open(private_key_path, "rb") as private_key_file:
-        return RSA.import_key(private_key_file.read())
+        return import_key(private_key_file.read())
+
+
+def generate_key(key_type: KeyType) -> SigningKey:
+    if key_type == KeyType.ED25519:
+        return ECC.generate(curve="ed25519")
+    return RSA.generate(1024)
 
 
-def write_keys(private_key_path: Path) -> None:
+def write_keys(private_key_path: Path, key_type: KeyType = KeyType.RSA) -> None:
     if not os.path.exists(private_key_path.parent):
         os.makedirs(private_key_path.parent)
-    key = RSA.generate(1024)
+    key = generate_key(key_type)
     save_key(key, str(private_key_path))
     file_name_public = str(private_key_path.parent / "public.pem")
     file_name_public_qr = str(private_key_path.parent / "public.png")
     save_key(key.public_key(), file_name_public)
-    pem_lines = key.public_key().export_key().splitlines()
+    pem_lines = export_key(key.public_key()).splitlines()
     raw_key = bytes().join(pem_lines[1:-1])
     encoded_key = quote(base64.b64encode(raw_key))
     qr.save_public_key(encoded_key, file_name_public_qr)
 
 
-def sign_message(message: str, private_key: RSA.RsaKey) -> bytes:
-    hashed = SHA256.new(message.encode())
+def sign_message(message: str | bytes, private_key: SigningKey) -> bytes:
+    if isinstance(message, str):
+        message = message.encode()
+    if isinstance(private_key, ECC.EccKey):
+        # Ed25519 hashes the message itself and creates 64 byte signatures
+        return eddsa.new(private_key, "rfc8032").sign(message)
+    hashed = SHA256.new(message)
     return pss.new(private_key).sign(hashed)
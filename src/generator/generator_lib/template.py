@@ -0,0 +1,115 @@
+import hashlib
+import math
+import zlib
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Optional
+import reportlab.pdfgen.canvas
+from reportlab.lib.units import inch, mm
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfdoc import PDFImageXObject
+from PIL import Image
+from .config import DEFAULT_FLYER_DPI
+from .pdf_image import can_draw_image_xobject, create_image_xobject, draw_image_xobject, is_image_xobject_supported
+
+BORDER_SIZE = 10
+TICKET_WIDTH = 298
+_JPEG_QUALITY = 90
+
+
+def _convert_flyer(image: Image.Image) -> Image.Image:
+    if image.mode in ("RGBA", "LA", "P"):
+        # transparent parts are printed on white paper
+        image = image.convert("RGBA")
+        flyer = Image.new("RGB", image.size, "white")
+        flyer.paste(image, mask=image)
+        return flyer
+    return image.convert("L" if image.mode == "L" else "RGB")
+
+
+def _read_flyer(flyer_file_name: Path, flyer_dpi: int) -> tuple[Image.Image, bool, bool]:
+    # returns the flyer, whether it is a JPEG photo and whether it was scaled down
+    with Image.open(flyer_file_name) as source:
+        # photos stay JPEG, the others are compressed losslessly like e.g. flyers with text
+        is_jpeg = source.format == "JPEG" and source.mode in ("L", "RGB")
+        flyer = _convert_flyer(source)
+    # the flyer is never printed wider than the QR-code
+    max_width = math.ceil((TICKET_WIDTH - 2 * BORDER_SIZE) / inch * flyer_dpi)
+    is_scaled = 0 < max_width < flyer.width
+    if is_scaled:
+        flyer = flyer.resize((max_width, round(flyer.height * max_width / flyer.width)), Image.Resampling.LANCZOS)
+    return (flyer, is_jpeg, is_scaled)
+
+
+def _create_flyer_image(name: str, flyer_file_name: Path, flyer: Image.Image, is_jpeg: bool,
+                        is_scaled: bool) -> PDFImageXObject:
+    # unlike reportlab, the image data is not ASCII85 encoded, which would make it a quarter larger
+    color_space = "DeviceGray" if flyer.mode == "L" else "DeviceRGB"
+    if is_jpeg and not is_scaled:
+        with open(flyer_file_name, "rb") as file:
+            return create_image_xobject(name, flyer.size, color_space, file.read(), "DCTDecode")
+    if is_jpeg:
+        jpeg_file = BytesIO()
+        flyer.save(jpeg_file, "JPEG", quality=_JPEG_QUALITY)
+        return create_image_xobject(name, flyer.size, color_space, jpeg_file.getvalue(), "DCTDecode")
+    return create_image_xobject(name, flyer.size, color_space, zlib.compress(flyer.tobytes(), 9), "FlateDecode")
+
+
+@dataclass
+class TicketLayout:
+    """Sizes of the elements on a ticket, the QR-code is at the bottom and the flyer above it"""
+    qr_size: float
+    flyer_size: tuple[float, float]
+    page_size: tuple[float, float]
+
+    def get_qr_position(self) -> tuple[float, float]:
+        return (BORDER_SIZE, BORDER_SIZE)
+
+    def get_flyer_position(self) -> tuple[float, float]:
+        return (BORDER_SIZE, self.qr_size + 2 * BORDER_SIZE)
+
+
+class TicketTemplate:
+    """Class which prepares the layout and the encoded flyer image once for all tickets of a batch"""
+
+    def __init__(self, flyer_file_name: Path | None, flyer_dpi: int = DEFAULT_FLYER_DPI) -> None:
+        self.flyer: Optional[Image.Image] = None
+        # the encoded flyer, None if this reportlab version does not support embedding it
+        self.flyer_xobject: Optional[PDFImageXObject] = None
+        if flyer_file_name is not None:
+            self.flyer, is_jpeg, is_scaled = _read_flyer(flyer_file_name, flyer_dpi)
+            if is_image_xobject_supported():
+                # compresses the image data, which is the expensive part of embedding the flyer
+                self.flyer_xobject = _create_flyer_image(
+                    f"flyer{hashlib.md5(str(flyer_file_name).encode()).hexdigest()}", flyer_file_name,
+                    self.flyer, is_jpeg, is_scaled)
+        # the layout only depends on the number of QR-code modules
+        self.layouts: Dict[int, TicketLayout] = {}
+
+    def get_layout(self, num_modules: int) -> TicketLayout:
+        layout = self.layouts.get(num_modules)
+        if layout is None:
+            layout = self._create_layout(num_modules)
+            self.layouts[num_modules] = layout
+        return layout
+
+    def _create_layout(self, num_modules: int) -> TicketLayout:
+        qr_height: float = num_modules * mm  # one millimeter per module
+        scale = TICKET_WIDTH/(qr_height + 2 * BORDER_SIZE)  # scale to width of A5
+        qr_size = qr_height * scale
+        if self.flyer is None:
+            return TicketLayout(qr_size, (0, 0), (qr_size + 2 * BORDER_SIZE, qr_size + 2 * BORDER_SIZE))
+        flyer_size = (qr_size, self.flyer.height * (qr_size / self.flyer.width))
+        return TicketLayout(qr_size, flyer_size,
+                            (qr_size + 2 * BORDER_SIZE, qr_size + 3 * BORDER_SIZE + flyer_size[1]))
+
+    def draw_flyer(self, canvas: reportlab.pdfgen.canvas.Canvas, layout: TicketLayout) -> None:
+        if self.flyer is None:
+            return
+        x, y = layout.get_flyer_position()
+        if self.flyer_xobject is not None and can_draw_image_xobject(canvas):
+            draw_image_xobject(canvas, self.flyer_xobject, (x, y), layout.flyer_size)
+            return
+        # encodes the flyer again for every document, but only uses the public API of reportlab
+        canvas.drawImage(ImageReader(self.flyer), x, y, *layout.flyer_size)
@@ -1,65 +1,173 @@
 import os
+import sys
+import multiprocessing
 from pathlib import Path
 import argparse
+from dataclasses import replace
 from datetime import datetime
+from typing import Any, Dict
 from generator_lib.persistence import Persistence, PersistedValues
-from generator_lib.config import Config
-from generator_lib.gui import GeneratorGui
+from generator_lib.config import DEFAULT_FLYER_DPI, Config, KeyType, OutputMode, PayloadFormat
 from generator_lib.generator import Generator
+from generator_lib.job import read_job_file
+from generator_lib.progress import StdoutProgressIndicator
 from generator_lib.signing import write_keys
 
 
-def main() -> None:
+def run_gui(initial_config: Config, persistence: Persistence) -> None:
+    # PyQt5 is only loaded when the GUI is shown
+    from generator_lib.gui import GeneratorGui  # pylint: disable=import-outside-toplevel
+    gui = GeneratorGui(initial_config)
+    progress_indicator = gui.get_progress_indicator()
+    generator = Generator(progress_indicator)
+
+    gui.set_generator(generator.generate)
+    gui.set_key_writer(lambda key_path: write_keys(
+        key_path, initial_config.key_type))
+    gui.set_out_dir_listener(persistence.persist_out_dir)
+    gui.set_key_path_listener(persistence.persist_key_path)
+    gui.run()
+
+
+def run_headless(config: Config) -> int:
+    progress_indicator = StdoutProgressIndicator()
+    if len(config.event_name) == 0 or config.num_qr_codes <= 0:
+        progress_indicator.print_event(
+            "error", message="an event name and a positive number of codes are required")
+        return 2
+    try:
+        Generator(progress_indicator).generate_blocking(config)
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        progress_indicator.print_event("error", message=str(error))
+        return 1
+    progress_indicator.print_event("finished", out_dir=str(config.out_dir))
+    return 0
+
+
+def run_job(job_file_name: Path, base_config: Config) -> int:
+    progress_indicator = StdoutProgressIndicator()
+    try:
+        job = read_job_file(job_file_name, base_config)
+    except (OSError, ValueError) as error:
+        progress_indicator.print_event("error", message=str(error))
+        return 2
+    try:
+        Generator(progress_indicator).generate_job_blocking(job)
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        progress_indicator.print_event("error", message=str(error))
+        return 1
+    progress_indicator.print_event("finished", out_dir=str(base_config.out_dir), num_events=len(job.configs))
+    return 0
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    # e.g. 2/3, returns the index of the shard and the number of shards
+    shard, _, shards = value.partition("/")
+    if not shard.isdigit() or not shards.isdigit() or not 1 <= int(shard) <= int(shards):
+        raise argparse.ArgumentTypeError("the shard must be given as e.g. 2/3")
+    return (int(shard) - 1, int(shards))
+
+
+def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser()
     parser.add_argument("-o", "--out_dir")
     parser.add_argument("-k", "--private_key_path")
     parser.add_argument("-e", "--event_name")
     parser.add_argument("-d", "--event_date",
                         help="date in the format yyyy-mm-dd")
-    parser.add_argument("-n", "--num_codes")
-    parsed_args = parser.parse_args()
+    parser.add_argument("-n", "--num_codes", type=int)
+    parser.add_argument("-F", "--flyer", help="image shown above the QR-code")
+    parser.add_argument("--flyer_dpi", type=int,
+                        help=f"resolution of the flyer in PDF tickets, 0 keeps the flyer as it is, "
+                             f"default {DEFAULT_FLYER_DPI}")
+    parser.add_argument("-b", "--headless", action="store_true",
+                        help="generate without GUI, print the progress as JSON lines and exit")
+    parser.add_argument("-j", "--job_file",
+                        help="JSON file listing several events, which are generated without GUI")
+    parser.add_argument("-t", "--key_type", choices=[key_type.name.lower() for key_type in KeyType],
+                        help="type of newly generated keys, ed25519 creates smaller QR-codes")
+    parser.add_argument("-f", "--payload_format", choices=[fmt.name.lower() for fmt in PayloadFormat],
+                        help="compact QR-codes can only be read by scanners which support them")
+    parser.add_argument("-s", "--first_id", type=int,
+                        help="ID of the first ticket, the lowest ID to lease with --allocate_ids")
+    parser.add_argument("-a", "--allocate_ids", action="store_true",
+                        help="lease IDs following the ones recorded for the event, used to add tickets to an event")
+    parser.add_argument("--shard", type=parse_shard,
+                        help="e.g. 2/3 to generate every third ID starting at the second one, "
+                             "so several machines can generate one event without colliding IDs")
+    parser.add_argument("-w", "--num_workers", type=int,
+                        help="number of processes generating tickets in parallel")
+    parser.add_argument("-m", "--output_mode", choices=[mode.name.lower() for mode in OutputMode],
+                        help="one PDF or image per ticket, all tickets in one PDF document or in one archive")
+    parser.add_argument("-p", "--tickets_per_page", type=int,
+                        help="number of tickets per A4 sheet in the PDF document")
+    return parser.parse_args()
 
-    default_dir = Path.home() / "Documents" / "ACR_QR_Generator"
-    out_dir = default_dir / "Codes"
-    private_key_path = default_dir / "Keys" / "private.pem"
-    config_path = default_dir / "config.json"
-    event_name: str = ""
-    event_date = datetime.today().date()
-    num_codes: int = 100
-    persistence = Persistence(config_path, PersistedValues(out_dir, private_key_path))
+
+def get_paths(parsed_args: argparse.Namespace, persistence: Persistence, default_dir: Path) -> tuple[Path, Path]:
+    # the output directory and the private key, the ones given to the GUI are kept for the next start
     out_dir = persistence.get_persisted_out_dir()
+    private_key_path = default_dir / "Keys" / "private.pem"
     persisted_private_key_path = persistence.get_persisted_key_path()
-    if (os.path.exists(persisted_private_key_path)):
+    # scripted runs do not change the settings of the GUI
+    persist = not parsed_args.headless and parsed_args.job_file is None
+    if os.path.exists(persisted_private_key_path):
         private_key_path = persisted_private_key_path
-    else:
+    elif persist:
         persistence.persist_key_path(private_key_path)
     if parsed_args.out_dir is not None:
         out_dir = Path(parsed_args.out_dir)
-        persistence.persist_out_dir(out_dir)
+        if persist:
+            persistence.persist_out_dir(out_dir)
     if parsed_args.private_key_path is not None:
         private_key_path = Path(parsed_args.private_key_path)
-        persistence.persist_key_path(private_key_path)
-    if parsed_args.event_name is not None:
-        event_name = parsed_args.event_name
-    if parsed_args.event_date is not None:
-        event_date = datetime.strptime(
-            parsed_args.event_date, '%Y-%m-%d').date()
-    if parsed_args.num_codes is not None:
-        num_codes = parsed_args.num_codes
+        if persist:
+            persistence.persist_key_path(private_key_path)
+    return (out_dir, private_key_path)
 
-    initial_config = Config(event_name, event_date,
-                            num_codes, out_dir, private_key_path, None)
 
-    gui = GeneratorGui(initial_config)
-    progress_indicator = gui.get_progress_indicator()
-    generator = Generator(progress_indicator)
+def create_config(parsed_args: argparse.Namespace, out_dir: Path, private_key_path: Path) -> Config:
+    config = Config("", datetime.today().date(), 100, out_dir, private_key_path, None, os.cpu_count() or 1)
+    shard_index, num_shards = parsed_args.shard if parsed_args.shard is not None else (None, None)
+    # only the values given on the command line replace the defaults
+    values: Dict[str, Any] = {
+        "event_name": parsed_args.event_name,
+        "event_date": datetime.strptime(parsed_args.event_date, '%Y-%m-%d').date()
+        if parsed_args.event_date is not None else None,
+        "num_qr_codes": parsed_args.num_codes,
+        "num_workers": parsed_args.num_workers,
+        "output_mode": OutputMode[parsed_args.output_mode.upper()] if parsed_args.output_mode is not None else None,
+        "tickets_per_page": parsed_args.tickets_per_page,
+        "first_code": parsed_args.first_id,
+        "key_type": KeyType[parsed_args.key_type.upper()] if parsed_args.key_type is not None else None,
+        "payload_format": PayloadFormat[parsed_args.payload_format.upper()]
+        if parsed_args.payload_format is not None else None,
+        "flyer_file_name": Path(parsed_args.flyer) if parsed_args.flyer is not None else None,
+        "flyer_dpi": parsed_args.flyer_dpi,
+        # the IDs of a shard are only known from the ledger
+        "allocate_ids": parsed_args.allocate_ids or parsed_args.shard is not None,
+        "shard_index": shard_index,
+        "num_shards": num_shards,
+    }
+    return replace(config, **{name: value for name, value in values.items() if value is not None})
 
-    gui.set_generator(generator.generate)
-    gui.set_key_writer(write_keys)
-    gui.set_out_dir_listener(persistence.persist_out_dir)
-    gui.set_key_path_listener(persistence.persist_key_path)
-    gui.run()
+
+def main() -> None:
+    parsed_args = parse_args()
+
+    default_dir = Path.home() / "Documents" / "ACR_QR_Generator"
+    persistence = Persistence(default_dir / "config.json",
+                              PersistedValues(default_dir / "Codes", default_dir / "Keys" / "private.pem"))
+    initial_config = create_config(parsed_args, *get_paths(parsed_args, persistence, default_dir))
+
+    if parsed_args.job_file is not None:
+        sys.exit(run_job(Path(parsed_args.job_file), initial_config))
+    if parsed_args.headless:
+        sys.exit(run_headless(initial_config))
+    run_gui(initial_config, persistence)
 
 
 if __name__ == "__main__":
+    # required for the ticket worker processes in the frozen executable
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,125 @@
+import argparse
+import json
+import platform
+import statistics
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import cv2
+from scanner_lib.config import DecoderType
+from scanner_lib.decoders import DecoderUnavailableError, QrDecoder, create_decoder
+from scanner_lib.detection import TrackingDetector
+
+
+@dataclass
+class BenchmarkResult:
+    """Decode rate and latency of a decoder backend on the benchmark frames"""
+    decoder: str
+    available: bool
+    error: Optional[str] = None
+    create_s: float = 0
+    num_frames: int = 0
+    num_decoded_frames: int = 0
+    num_codes: int = 0
+    decode_rate: float = 0
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+
+
+def read_frames(file_names: List[str], max_video_frames: int) -> List[Any]:
+    frames: List[Any] = []
+    for file_name in file_names:
+        image = cv2.imread(file_name)
+        if image is not None:
+            frames.append(image)
+            continue
+        # not an image, e.g. a recording of guests at the entrance
+        capture = cv2.VideoCapture(file_name)
+        num_video_frames = 0
+        while num_video_frames < max_video_frames:
+            is_read, frame = capture.read()
+            if not is_read:
+                break
+            frames.append(frame)
+            num_video_frames += 1
+        capture.release()
+        if num_video_frames == 0:
+            raise ValueError(f"{file_name} is neither an image nor a video")
+    return frames
+
+
+def run_decoder(decoder_type: DecoderType, frames: List[Any], num_repetitions: int,
+                is_tracking: bool) -> BenchmarkResult:
+    result = BenchmarkResult(decoder_type.name.lower(), True)
+    start = time.perf_counter()
+    try:
+        decoder: QrDecoder = create_decoder(decoder_type)
+        if is_tracking:
+            # like the scanner, which searches the region of the previous code and downscaled frames
+            decoder = TrackingDetector(decoder)
+    except DecoderUnavailableError as error:
+        result.available = False
+        result.error = str(error)
+        return result
+    result.create_s = time.perf_counter() - start
+    # every backend decodes the same frames, the first repetition also warms up caches and models
+    latencies: List[float] = []
+    for _ in range(num_repetitions):
+        for frame in frames:
+            start = time.perf_counter()
+            codes = decoder.decode(frame)
+            latencies.append(time.perf_counter() - start)
+            result.num_frames += 1
+            result.num_decoded_frames += len(codes) > 0
+            result.num_codes += len(codes)
+    result.decode_rate = result.num_decoded_frames / max(result.num_frames, 1)
+    latencies_ms = sorted(1000 * latency for latency in latencies)
+    result.latency_ms = {
+        "mean": statistics.fmean(latencies_ms),
+        "p50": latencies_ms[len(latencies_ms) // 2],
+        "p95": latencies_ms[min(int(len(latencies_ms) * 0.95), len(latencies_ms) - 1)],
+        "max": latencies_ms[-1],
+    }
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compares the decode rate and latency of the QR-code decoders")
+    parser.add_argument("files", nargs="+", help="images or videos with QR-codes, e.g. camera recordings")
+    parser.add_argument("--decoders", nargs="+", default=[decoder.name.lower() for decoder in DecoderType],
+                        choices=[decoder.name.lower() for decoder in DecoderType])
+    parser.add_argument("-r", "--repetitions", type=int, default=3)
+    parser.add_argument("--max_video_frames", type=int, default=300)
+    parser.add_argument("-t", "--tracking", action="store_true",
+                        help="decode the frames in order with the detection strategy of the scanner, e.g. for videos")
+    parser.add_argument("-o", "--output", default="scanner_benchmark.json",
+                        help="JSON file the results are written to")
+    parsed_args = parser.parse_args()
+
+    frames = read_frames(parsed_args.files, parsed_args.max_video_frames)
+    results: List[BenchmarkResult] = []
+    for decoder_name in parsed_args.decoders:
+        result = run_decoder(DecoderType[decoder_name.upper()], frames, parsed_args.repetitions,
+                             parsed_args.tracking)
+        results.append(result)
+        if not result.available:
+            print(f"{result.decoder}: not available, {result.error}")
+            continue
+        print(f"{result.decoder}: {100 * result.decode_rate:.1f} % of {len(frames)} frames decoded, "
+              + ", ".join(f"{name} {latency:.2f} ms" for name, latency in result.latency_ms.items()))
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "opencv": cv2.__version__,
+        "num_frames": len(frames),
+        "tracking": parsed_args.tracking,
+        "results": [asdict(result) for result in results],
+    }
+    with open(parsed_args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
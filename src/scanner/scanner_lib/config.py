@@ -1,10 +1,19 @@
 from dataclasses import dataclass
+from enum import Enum
 from pathlib import Path
 
 
+class DecoderType(Enum):
+    """QR-code decoder backends"""
+    OPENCV = 0
+    OPENCV_ARUCO = 1
+    WECHAT = 2
+    QREADER = 3
+
+
 @dataclass
 class Config:
     """Class which holds the configurable values of the QR-Code scanner"""
     log_dir: Path
     key_path: Path
-    
\ No newline at end of file
+    decoder: DecoderType = DecoderType.OPENCV
@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from typing import Any, List, Protocol
+import cv2
+import numpy as np
+from .config import DecoderType
+
+
+@dataclass
+class DetectedCode:
+    """Content of a QR-code found in a frame and its four corners in frame pixels"""
+    payload: str
+    points: Any
+
+
+class DecoderUnavailableError(Exception):
+    """Raised if the packages or OpenCV modules of a decoder are not installed"""
+
+
+class QrDecoder(Protocol):
+    """Interface of the QR-code decoder backends, which are created once and used for every frame"""
+
+    def decode(self, image: Any) -> List[DetectedCode]:
+        ...
+
+
+def _to_detected_codes(decoded_info: Any, points: Any) -> List[DetectedCode]:
+    # codes which have been located but could not be decoded have an empty payload
+    return [DetectedCode(payload, np.asarray(code_points, dtype=np.float32).reshape(4, 2))
+            for payload, code_points in zip(decoded_info, points) if len(payload) != 0]
+
+
+class OpenCvDecoder:
+    """Decoder using the standard QR-code detector of OpenCV"""
+
+    def __init__(self) -> None:
+        self.detector = cv2.QRCodeDetector()
+
+    def decode(self, image: Any) -> List[DetectedCode]:
+        ret_qr, decoded_info, points, _ = self.detector.detectAndDecodeMulti(image)
+        if not ret_qr:
+            return []
+        return _to_detected_codes(decoded_info, points)
+
+
+class OpenCvArucoDecoder:
+    """Decoder using the OpenCV detector which finds the finder patterns like ArUco markers,
+    more robust for small or tilted codes"""
+
+    def __init__(self) -> None:
+        if not hasattr(cv2, "QRCodeDetectorAruco"):
+            raise DecoderUnavailableError("the ArUco based detector requires OpenCV 4.8 or newer")
+        self.detector = cv2.QRCodeDetectorAruco()
+
+    def decode(self, image: Any) -> List[DetectedCode]:
+        ret_qr, decoded_info, points, _ = self.detector.detectAndDecodeMulti(image)
+        if not ret_qr:
+            return []
+        return _to_detected_codes(decoded_info, points)
+
+
+class WeChatDecoder:
+    """Decoder using the WeChat detector of the OpenCV contrib modules"""
+
+    def __init__(self) -> None:
+        if not hasattr(cv2, "wechat_qrcode_WeChatQRCode"):
+            raise DecoderUnavailableError("the WeChat detector requires opencv-contrib-python")
+        # without the CNN model files the detector locates the codes like the standard detector
+        self.detector = cv2.wechat_qrcode_WeChatQRCode()
+
+    def decode(self, image: Any) -> List[DetectedCode]:
+        decoded_info, points = self.detector.detectAndDecode(image)
+        return _to_detected_codes(decoded_info, points)
+
+
+class QReaderDecoder:
+    """Decoder using qreader, which locates the codes with a YOLO model and is slow without a GPU"""
+
+    def __init__(self) -> None:
+        try:
+            # the model is only loaded if this decoder is selected
+            from qreader import QReader  # pylint: disable=import-outside-toplevel
+        except ImportError as error:
+            raise DecoderUnavailableError("the qreader decoder requires the qreader package") from error
+        self.reader = QReader()
+
+    def decode(self, image: Any) -> List[DetectedCode]:
+        if image.ndim == 2:
+            # the detection model expects color images
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        decoded_info, detections = self.reader.detect_and_decode(image, return_detections=True, is_bgr=True)
+        return [DetectedCode(payload, np.asarray(detection["quad_xy"], dtype=np.float32))
+                for payload, detection in zip(decoded_info, detections) if payload]
+
+
+def create_decoder(decoder_type: DecoderType) -> QrDecoder:
+    if decoder_type == DecoderType.OPENCV_ARUCO:
+        return OpenCvArucoDecoder()
+    if decoder_type == DecoderType.WECHAT:
+        return WeChatDecoder()
+    if decoder_type == DecoderType.QREADER:
+        return QReaderDecoder()
+    return OpenCvDecoder()
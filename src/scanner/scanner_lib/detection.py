@@ -0,0 +1,113 @@
+from typing import Any, List, Optional
+import cv2
+import numpy as np
+from .decoders import DetectedCode, QrDecoder
+
+# width up to which the frames are halved before a search of the whole frame
+DEFAULT_DETECTION_WIDTH = 640
+# frames without a code in the region of the previous code, before the whole frame is searched again
+DEFAULT_MAX_REGION_MISSES = 5
+# codes too small for the halved frames are still found by every n-th search at full resolution
+_FULL_RESOLUTION_INTERVAL = 4
+# frames with a code in the region, after which the whole frame is searched for further codes, e.g. of a group
+_FRAME_SEARCH_INTERVAL = 5
+# side length in pixels down to which the region of a large code is halved
+_MIN_CODE_SIZE = 240
+# margin around the previous code, relative to its size, as guests move the ticket a little
+_REGION_MARGIN = 0.5
+
+
+def _to_gray(image: Any) -> Any:
+    if image.ndim == 2:
+        return image
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+class TrackingDetector:  # pylint: disable=too-many-instance-attributes
+    """Detection strategy in front of a decoder, which searches the region of the previous code
+    and otherwise a downscaled grayscale frame, the points are returned in frame pixels"""
+
+    def __init__(self, decoder: QrDecoder, detection_width: int = DEFAULT_DETECTION_WIDTH,
+                 max_region_misses: int = DEFAULT_MAX_REGION_MISSES) -> None:
+        self.decoder = decoder
+        self.detection_width = detection_width
+        self.max_region_misses = max_region_misses
+        # bounding box x0, y0, x1, y1 of the previous codes including the margin
+        self.region: Optional[tuple[int, int, int, int]] = None
+        self.region_scale = 1
+        self.num_region_misses = 0
+        self.num_region_hits = 0
+        self.num_frame_misses = 0
+
+    def decode(self, image: Any) -> List[DetectedCode]:
+        if self.region is not None:
+            codes = self._decode_region(image, self.region)
+            if len(codes) != 0:
+                self.num_region_misses = 0
+                self.num_region_hits += 1
+                if self.num_region_hits % _FRAME_SEARCH_INTERVAL == 0:
+                    codes = self._add_frame_codes(image, codes)
+                self._set_region(image, codes)
+                return codes
+            self.num_region_misses += 1
+            if self.num_region_misses < self.max_region_misses:
+                # the guest usually only moved the ticket for a moment
+                return []
+            self.region = None
+        codes = self._decode_frame(image)
+        if len(codes) != 0:
+            self.num_region_misses = 0
+            self.num_frame_misses = 0
+            self._set_region(image, codes)
+        return codes
+
+    def reset(self) -> None:
+        self.region = None
+        self.region_scale = 1
+        self.num_region_misses = 0
+        self.num_region_hits = 0
+        self.num_frame_misses = 0
+
+    def _decode_region(self, image: Any, region: tuple[int, int, int, int]) -> List[DetectedCode]:
+        x0, y0, x1, y1 = region
+        # only the region is converted, small codes at full resolution so they keep all their modules
+        level = image[y0:y1, x0:x1]
+        for _ in range(self.region_scale.bit_length() - 1):
+            level = cv2.pyrDown(level)
+        codes = self.decoder.decode(_to_gray(level))
+        offset = np.array([x0, y0], dtype=np.float32)
+        return [DetectedCode(code.payload, code.points * self.region_scale + offset) for code in codes]
+
+    def _add_frame_codes(self, image: Any, region_codes: List[DetectedCode]) -> List[DetectedCode]:
+        # codes outside of the region, the region codes are kept as they were decoded at a higher resolution
+        payloads = {code.payload for code in region_codes}
+        return region_codes + [code for code in self._decode_frame(image) if code.payload not in payloads]
+
+    def _decode_frame(self, image: Any) -> List[DetectedCode]:
+        level = image
+        scale = 1
+        while level.shape[1] // 2 >= self.detection_width:
+            level = cv2.pyrDown(level)
+            scale *= 2
+        codes = self.decoder.decode(_to_gray(level))
+        if len(codes) != 0:
+            return [DetectedCode(code.payload, code.points * scale) for code in codes]
+        self.num_frame_misses += 1
+        if scale == 1 or self.num_frame_misses % _FULL_RESOLUTION_INTERVAL != 0:
+            return []
+        # e.g. a ticket held far from the camera
+        return self.decoder.decode(_to_gray(image))
+
+    def _set_region(self, image: Any, codes: List[DetectedCode]) -> None:
+        points = np.concatenate([code.points for code in codes])
+        x_min, y_min = points.min(axis=0)
+        x_max, y_max = points.max(axis=0)
+        margin_x = (x_max - x_min) * _REGION_MARGIN
+        margin_y = (y_max - y_min) * _REGION_MARGIN
+        height, width = image.shape[:2]
+        code_size = min(float(np.ptp(code.points[:, 0])) for code in codes)
+        self.region_scale = 1
+        while code_size / (2 * self.region_scale) >= _MIN_CODE_SIZE:
+            self.region_scale *= 2
+        self.region = (max(int(x_min - margin_x), 0), max(int(y_min - margin_y), 0),
+                       min(int(x_max + margin_x) + 1, width), min(int(y_max + margin_y) + 1, height))
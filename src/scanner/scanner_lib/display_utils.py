@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 import time
-from typing import Any, Optional
+from typing import Any, List, Optional
 import cv2
 import numpy as np
 
@@ -9,7 +9,8 @@ from .gui import ImagePainter
 
 @dataclass
 class SuccessArgs:
-    """Class which holds the data necessary to create a QR-code frame indicating success"""
+    """Class which holds the data necessary to create a QR-code frame indicating success,
+    the points are the four corners of the code"""
     event: str
     ticket_id: int
     points: Any
@@ -22,28 +23,27 @@ class ErrorArgs:
     points: Any
 
 
+CheckResult = SuccessArgs | ErrorArgs
+
+
 class QrCodeImageDrawer:
     """Class for displaying images with smooth frames around detected QR-codes"""
 
     def __init__(self, trigger_length: float, painter: ImagePainter) -> None:
         self.timer: Optional[float] = None
         self.trigger_length = trigger_length
-        self.args: Optional[SuccessArgs | ErrorArgs] = None
+        self.results: List[CheckResult] = []
         self.painter = painter
 
-    def show_frame_verified(self, frame: Any, args: tuple[str, int, Any]) -> None:
-        self._trigger()
-        self.args = SuccessArgs(args[0], args[1], args[2])
-        self.painter.paint(decorate_frame_green(frame, args[0], args[1], args[2]))
-
-    def show_frame_denied(self, frame: Any, args: tuple[str, Any]) -> None:
+    def show_frame_checked(self, frame: Any, results: List[CheckResult]) -> None:
+        # one green or red frame per code, e.g. for the tickets of a group
         self._trigger()
-        self.args = ErrorArgs(args[0], args[1])
-        self.painter.paint(decorate_frame_red(frame, args[0], args[1]))
+        self.results = results
+        self.painter.paint(decorate_frame(frame, results))
 
     def show_frame_stored(self, frame: Any) -> None:
         if self._get_is_triggered():
-            self._show_frame_stored(frame)
+            self.painter.paint(decorate_frame(frame, self.results))
             return
         self.painter.paint(frame)
 
@@ -55,14 +55,15 @@ class QrCodeImageDrawer:
             return False
         return time.time() - self.timer < self.trigger_length
 
-    def _show_frame_stored(self, frame: Any) -> None:
-        if isinstance(self.args, SuccessArgs):
-            self.painter.paint(decorate_frame_green(
-                frame, self.args.event, self.args.ticket_id, self.args.points))
-            return
-        if isinstance(self.args, ErrorArgs):
-            self.painter.paint(decorate_frame_red(
-                frame, self.args.reason, self.args.points))
+
+def decorate_frame(frame: Any, results: List[CheckResult]) -> Any:
+    decorated = frame
+    for result in results:
+        if isinstance(result, SuccessArgs):
+            decorated = decorate_frame_green(decorated, result.event, result.ticket_id, result.points)
+        else:
+            decorated = decorate_frame_red(decorated, result.reason, result.points)
+    return decorated
 
 
 def decorate_frame_green(frame: Any, event: str, ticket_id: int, points: Any) -> Any:
@@ -73,7 +74,7 @@ def decorate_frame_green(frame: Any, event: str, ticket_id: int, points: Any) ->
     thickness = 2
 
     first_line = f"Event: {event}"
-    first_line_origin = np.copy(int_points[0][0][0])
+    first_line_origin = np.copy(int_points[0][0])
     first_line_origin[0] += 10  # horizontal offset
     first_line_origin[1] += 40  # vertical offset
 
@@ -82,7 +83,7 @@ def decorate_frame_green(frame: Any, event: str, ticket_id: int, points: Any) ->
     decorated = cv2.putText(decorated, first_line, first_line_origin, font,
                             font_scale, color, thickness, cv2.LINE_AA)
     second_line = f"ID: {ticket_id}"
-    second_line_origin = np.copy(int_points[0][0][0])
+    second_line_origin = np.copy(int_points[0][0])
     second_line_origin[0] += 10  # horizontal offset
     second_line_origin[1] += 100  # vertical offset
     decorated = cv2.putText(decorated, second_line, second_line_origin, font,
@@ -101,7 +102,7 @@ def decorate_frame_red(frame: Any, reason: str, points: Any) -> Any:
     thickness = 2
 
     first_line = reason
-    first_line_origin = np.copy(int_points[0][0][0])
+    first_line_origin = np.copy(int_points[0][0])
     first_line_origin[0] += 10  # horizontal offset
     first_line_origin[1] += 40  # vertical offset
 
@@ -89,8 +89,9 @@ class SetLogDirEventHandler(EventHandler[SetLogDirEvent]):
 class SetCameraEvent(Event):
     """Event signaling a camera change"""
 
-    def __init__(self, camera_index: int) -> None:
+    def __init__(self, lane: int, camera_index: int) -> None:
         super().__init__(EventType.SET_CAMERA)
+        self.lane = lane
         self.camera_index = camera_index
 
 
@@ -117,9 +117,9 @@ class ScannerQtMainWindow(QtWidget.QMainWindow):
     def _on_select_key_path_menu_triggered(self) -> None:
         self.key_path_menu.show()
 
-    def _on_camera_selected(self, camera: int) -> None:
+    def _on_camera_selected(self, lane: int, camera: int) -> None:
         if self.camera_listener is not None:
-            self.camera_listener(camera)
+            self.camera_listener(lane, camera)
 
     def _on_open_online_help_menu_triggered(self) -> None:
         git_hub_url = QtCore.QUrl("https://github.com/Broowl/acr_qr")
@@ -150,10 +150,12 @@ class ScannerQtMainWindow(QtWidget.QMainWindow):
 
     def _init_config_menu(self) -> None:
         config_menu = self.menuBar().addMenu("Konfiguration")
-        camera_menu = config_menu.addMenu("Kamera ändern")
-        for camera in self.camera_list:
-            camera_menu.addAction(f"{camera}").triggered.connect(
-                lambda _, c=camera: self._on_camera_selected(c))
+        for lane in range(self.num_lanes):
+            camera_menu = config_menu.addMenu(
+                "Kamera ändern" if self.num_lanes == 1 else f"Kamera von Spur {lane + 1} ändern")
+            for camera in self.camera_list:
+                camera_menu.addAction(f"{camera}").triggered.connect(
+                    lambda _, la=lane, c=camera: self._on_camera_selected(la, c))
 
     def _init_log_folder_menu(self) -> None:
         self.log_folder_menu = QtWidget.QFileDialog(
@@ -165,14 +167,30 @@ class ScannerQtMainWindow(QtWidget.QMainWindow):
             filter="*.pem")
         self.key_path_menu.fileSelected.connect(lambda p: self._set_key_path(Path(p)))
 
-    def _init_image_frame(self) -> None:
-        image_label = QtWidget.QLabel()
-        image_label.setMinimumSize(4 * 40, 3 * 40)
-        self.frame_painter = ImagePainter(image_label)
-        self.widget_layout.addWidget(image_label)
+    def _init_image_frames(self) -> None:
+        if self.num_lanes == 1:
+            image_label = QtWidget.QLabel()
+            image_label.setMinimumSize(4 * 40, 3 * 40)
+            self.frame_painters = [ImagePainter(image_label)]
+            self.widget_layout.addWidget(image_label)
+            return
+        # one tile per lane, two lanes next to each other
+        tile_layout = QtWidget.QGridLayout()
+        self.frame_painters = []
+        for lane in range(self.num_lanes):
+            tile = QtWidget.QGroupBox(f"Spur {lane + 1}")
+            tile_box_layout = QtWidget.QVBoxLayout()
+            image_label = QtWidget.QLabel()
+            image_label.setMinimumSize(4 * 40, 3 * 40)
+            tile_box_layout.addWidget(image_label)
+            tile.setLayout(tile_box_layout)
+            tile_layout.addWidget(tile, lane // 2, lane % 2)
+            self.frame_painters.append(ImagePainter(image_label))
+        self.widget_layout.addLayout(tile_layout)
 
     def _notify_timer_listener(self) -> None:
-        self.frame_painter.do_paint()
+        for frame_painter in self.frame_painters:
+            frame_painter.do_paint()
         if self.timer_listener is not None:
             self.timer_listener()
 
@@ -190,17 +208,18 @@ class ScannerQtMainWindow(QtWidget.QMainWindow):
         self.about_box.setText("Autor: Daniel Krieger<br>Version: 0.9.2")
         self.about_box.setWindowTitle("Über ACR QR-Code Generator")
 
-    def __init__(self, default_config: Config, camera_list: List[int]):
+    def __init__(self, default_config: Config, camera_list: List[int], num_lanes: int):
         super().__init__()
 
         self.timer_listener: Optional[Callable[[], None]] = None
         self.key_path_changed_listener: Optional[Callable[[Path], None]] = None
         self.log_dir_changed_listener: Optional[Callable[[Path], None]] = None
-        self.camera_listener: Optional[Callable[[int], None]] = None
+        self.camera_listener: Optional[Callable[[int, int], None]] = None
         self.event_name_listener: Optional[Callable[[
             EventCharacteristics], None]] = None
         self.config: Config = default_config
         self.camera_list = camera_list
+        self.num_lanes = num_lanes
 
         self.setWindowTitle("ACR QR-Code Scanner")
         self.widget_layout = QtWidget.QVBoxLayout()
@@ -208,14 +227,14 @@ class ScannerQtMainWindow(QtWidget.QMainWindow):
         self._init_log_folder_menu()
         self._init_key_path_menu()
         self._init_config_menu()
-        self._init_image_frame()
+        self._init_image_frames()
         self._init_help_menu()
         self._init_about_message_box()
 
         widget = QtWidget.QWidget()
         widget.setLayout(self.widget_layout)
 
-        self.resize(650, 550)
+        self.resize(650 if num_lanes == 1 else 1100, 550 if num_lanes <= 2 else 900)
         self.setCentralWidget(widget)
         self.timer = QtCore.QTimer()
         self.timer.setInterval(33)
@@ -237,10 +256,10 @@ class ScannerQtMainWindow(QtWidget.QMainWindow):
     def set_configuration_finished_listener(self, event_name_listener: Callable[[EventCharacteristics], None]) -> None:
         self.event_name_listener = event_name_listener
 
-    def get_painter(self) -> ImagePainter:
-        return self.frame_painter
+    def get_painters(self) -> List[ImagePainter]:
+        return self.frame_painters
 
-    def set_camera_listener(self, listener:  Callable[[int], None]) -> None:
+    def set_camera_listener(self, listener:  Callable[[int, int], None]) -> None:
         self.camera_listener = listener
 
     def show_start_menu(self) -> None:
@@ -250,12 +269,13 @@ class ScannerQtMainWindow(QtWidget.QMainWindow):
 class ScannerGui:
     """Class representing the generic interface the GUI must provide"""
 
-    def __init__(self, default_config: Config, camera_list: List[int]) -> None:
+    def __init__(self, default_config: Config, camera_list: List[int], num_lanes: int = 1) -> None:
         self.app = QtWidget.QApplication(sys.argv)
-        self.window = ScannerQtMainWindow(default_config, camera_list)
+        self.window = ScannerQtMainWindow(default_config, camera_list, num_lanes)
 
-    def get_painter(self) -> ImagePainter:
-        return self.window.get_painter()
+    def get_painters(self) -> List[ImagePainter]:
+        # one painter per lane
+        return self.window.get_painters()
 
     def set_timer_listener(self, timer_listener: Callable[[], None]) -> None:
         self.window.set_timer_listener(timer_listener)
@@ -266,7 +286,7 @@ class ScannerGui:
     def set_log_dir_changed_listener(self, log_dir_changed_listener: Callable[[Path], None]) -> None:
         self.window.set_log_dir_changed_listener(log_dir_changed_listener)
 
-    def set_camera_listener(self, camera_listener:  Callable[[int], None]) -> None:
+    def set_camera_listener(self, camera_listener:  Callable[[int, int], None]) -> None:
         self.window.set_camera_listener(camera_listener)
 
     def set_configuration_finished_listener(self, event_name_listener: Callable[[EventCharacteristics], None]) -> None:
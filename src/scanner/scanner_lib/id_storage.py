@@ -2,26 +2,32 @@ import os
 from pathlib import Path
 import time
 import csv
+import threading
 from datetime import datetime, timezone
 from io import TextIOWrapper
 from types import TracebackType
-from typing import Dict, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 import iso8601
 from .persistence import Persistence
 from .event_characteristics import EventCharacteristics
 
 
 class IdStorage:
-    """Class for storing scanned ticket IDs"""
+    """Class for storing scanned ticket IDs, shared by the scanners of all lanes"""
 
     def __init__(self, log_dir: Path, grace_period_s: int, persistence: Persistence) -> None:
         self.log_dir = log_dir
         self.grace_period_s = grace_period_s
         self.storage: Dict[int, float] = {}
+        # IDs which were scanned first at another station, by the name of the station
+        self.remote_ids: Dict[int, str] = {}
+        self.added_listener: Optional[Callable[[int, float], None]] = None
         self.file: Optional[TextIOWrapper] = None
         self.writer: Optional[Any] = None
         self.persistence = persistence
         self.event_characteristics: Optional[EventCharacteristics] = None
+        # the lanes check their tickets at the same time
+        self.lock = threading.Lock()
 
     def __enter__(self) -> Any:
         self._save_open()
@@ -35,34 +41,74 @@ class IdStorage:
             self.file.close()
 
     def try_add_id(self, ticket_id: int) -> bool:
-        stored_time = self.storage.get(ticket_id)
-        if stored_time is None:
-            self._add(ticket_id)
+        with self.lock:
+            stored_time = self.storage.get(ticket_id)
+            if stored_time is None:
+                added_time = self._add(ticket_id)
+            elif ticket_id in self.remote_ids:
+                # the grace period is only for reading the same ticket again at this station
+                return False
+            else:
+                return time.time() - stored_time < self.grace_period_s
+        if self.added_listener is not None and added_time is not None:
+            self.added_listener(ticket_id, added_time)
+        return True
+
+    def merge_id(self, ticket_id: int, scan_time: float, station: str) -> bool:
+        # ID scanned at another station, the earlier scan wins if the ticket was scanned at both
+        with self.lock:
+            stored_time = self.storage.get(ticket_id)
+            if stored_time is not None and stored_time <= scan_time:
+                return False
+            self._add_remote(ticket_id, scan_time, station)
             return True
-        return time.time() - stored_time < self.grace_period_s
+
+    def get_ids(self) -> List[tuple[int, float, Optional[str]]]:
+        # the IDs with the time of the first scan and the station, None for this station
+        with self.lock:
+            return [(ticket_id, scan_time, self.remote_ids.get(ticket_id))
+                    for ticket_id, scan_time in self.storage.items()]
+
+    def set_added_listener(self, added_listener: Callable[[int, float], None]) -> None:
+        self.added_listener = added_listener
 
     def set_dir(self, log_dir: Path) -> None:
-        if self.file is not None:
-            self.file.close()
-        self.log_dir = log_dir
-        self._save_open()
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+            self.log_dir = log_dir
+            self._save_open()
         self.persistence.persist_log_dir(log_dir)
 
     def set_event_characteristics(self, event_characteristics: EventCharacteristics) -> None:
-        self.event_characteristics = event_characteristics
-        if self.file is not None:
-            self.file.close()
-        self._save_open()
+        with self.lock:
+            self.event_characteristics = event_characteristics
+            self.storage.clear()
+            self.remote_ids.clear()
+            if self.file is not None:
+                self.file.close()
+            self._save_open()
 
-    def _add(self, ticket_id: int) -> None:
+    def _add(self, ticket_id: int) -> Optional[float]:
         if self.file is None or self.writer is None:
-            return
+            return None
         now = time.time()
         # inequality to now is fine here
         time_stamp = datetime.now(timezone.utc).isoformat()
         self.storage[ticket_id] = now
         self.writer.writerow([time_stamp, ticket_id])
         self.file.flush()
+        return now
+
+    def _add_remote(self, ticket_id: int, scan_time: float, station: str) -> None:
+        self.storage[ticket_id] = scan_time
+        self.remote_ids[ticket_id] = station
+        if self.file is None or self.writer is None:
+            return
+        # the station is the third column, so a restarted scanner still knows where the ID was scanned
+        time_stamp = datetime.fromtimestamp(scan_time, timezone.utc).isoformat()
+        self.writer.writerow([time_stamp, ticket_id, station])
+        self.file.flush()
 
     def _save_open(self) -> None:
         file_name = self._get_file_name()
@@ -91,5 +137,14 @@ class IdStorage:
                 if len(row) != 0:
                     date_time = iso8601.parse_date(row[0])
                     epoch = datetime.fromtimestamp(0, timezone.utc)
-                    self.storage[int(row[1])] = (
-                        date_time - epoch).total_seconds()
+                    scan_time = (date_time - epoch).total_seconds()
+                    ticket_id = int(row[1])
+                    # an ID merged from another station may be logged after the local scan it replaced
+                    stored_time = self.storage.get(ticket_id)
+                    if stored_time is not None and stored_time <= scan_time:
+                        continue
+                    self.storage[ticket_id] = scan_time
+                    if len(row) > 2:
+                        self.remote_ids[ticket_id] = row[2]
+                    else:
+                        self.remote_ids.pop(ticket_id, None)
@@ -0,0 +1,84 @@
+import os
+import re
+import json
+import base64
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+from .payload import PAYLOAD_HASH_SIZE, get_payload_hash
+from .signature_validator import SignatureValidator
+from .event_characteristics import EventCharacteristics
+
+# Signed list of the issued tickets of an event, the format is written by the generator's issued_tickets module.
+ISSUED_TICKETS_VERSION = 1
+_ENTRY_FORMAT = f">Q{PAYLOAD_HASH_SIZE}s"
+
+
+def get_issued_tickets_file_names(key_path: Path, event_characteristics: EventCharacteristics) -> List[Path]:
+    # the lists are copied from the generator's output directory next to the public key, an event generated on
+    # several machines has one list per shard, e.g. 2026-11-07_Konzert_issued_shard2of3.txt
+    date_str = event_characteristics.date.strftime("%Y-%m-%d")
+    matcher = re.compile(rf"^{re.escape(f'{date_str}_{event_characteristics.name}_issued')}(_shard(\d+)of(\d+))?\.txt$")
+    if not os.path.isdir(key_path.parent):
+        return []
+    file_names: List[Path] = []
+    shards: Set[tuple[int, int]] = set()
+    for file_name in sorted(os.listdir(key_path.parent)):
+        matches = matcher.match(file_name)
+        if matches is None:
+            continue
+        file_names.append(key_path.parent / file_name)
+        if matches.group(1) is not None:
+            shards.add((int(matches.group(2)), int(matches.group(3))))
+    num_shards = {shard[1] for shard in shards}
+    if len(shards) != 0 and (len(num_shards) != 1 or len(shards) != num_shards.pop()):
+        # the tickets of a missing shard would be rejected, so all tickets are verified by their signature
+        return []
+    return file_names
+
+
+def _read_entries(file_name: Path, event_characteristics: EventCharacteristics,
+                  validator: SignatureValidator) -> Optional[bytes]:
+    with open(file_name, "rb") as file:
+        lines = file.read().splitlines()
+    try:
+        # the list is trusted only with the signature of the ticket key, like the tickets themselves
+        if len(lines) < 2 or not validator.verify_message(lines[0], base64.b64decode(lines[1], validate=True)):
+            return None
+        header = json.loads(lines[0])
+        entries = base64.b64decode(header["entries"], validate=True)
+    except (KeyError, ValueError):
+        return None
+    if header.get("version") != ISSUED_TICKETS_VERSION \
+            or header.get("event_name") != event_characteristics.name \
+            or header.get("event_date") != event_characteristics.date.strftime("%Y-%m-%d") \
+            or len(entries) % struct.calcsize(_ENTRY_FORMAT) != 0:
+        return None
+    return entries
+
+
+class IssuedTicketIndex:
+    """Class which maps the payload hashes of the issued tickets of the event to their IDs"""
+
+    def __init__(self) -> None:
+        self.ticket_ids: Dict[bytes, int] = {}
+        self.is_loaded = False
+
+    def load(self, file_names: List[Path], event_characteristics: EventCharacteristics,
+             validator: SignatureValidator) -> None:
+        # without valid lists every ticket is verified by its signature
+        self.ticket_ids = {}
+        self.is_loaded = False
+        ticket_ids: Dict[bytes, int] = {}
+        for file_name in file_names:
+            entries = _read_entries(file_name, event_characteristics, validator)
+            if entries is None:
+                # the tickets of a shard with an invalid list would be rejected although they are valid
+                return
+            for ticket_id, payload_hash in struct.iter_unpack(_ENTRY_FORMAT, entries):
+                ticket_ids[payload_hash] = ticket_id
+        self.ticket_ids = ticket_ids
+        self.is_loaded = len(file_names) != 0
+
+    def get_ticket_id(self, payload: str) -> Optional[int]:
+        return self.ticket_ids.get(get_payload_hash(payload))
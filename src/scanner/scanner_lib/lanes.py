@@ -0,0 +1,74 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, List, Optional
+from .event_characteristics import EventCharacteristics
+from .issued_tickets import IssuedTicketIndex, get_issued_tickets_file_names
+from .qr import CameraCapture
+from .scanner import Scanner
+from .signature_validator import SignatureValidator
+from .verification_cache import VerificationCache
+
+
+@dataclass
+class Lane:
+    """Camera and scanner of one lane of the entrance"""
+    camera_capture: CameraCapture
+    scanner: Scanner
+
+
+class LanePool:
+    """Pool which processes the frames of all lanes at the same time, the lanes share the signature validator,
+    the ID storage, the issued tickets and the verification cache of their scanners"""
+
+    def __init__(self, lanes: List[Lane], validator: SignatureValidator, issued_tickets: IssuedTicketIndex,
+                 verification_cache: VerificationCache) -> None:
+        self.lanes = lanes
+        self.validator = validator
+        self.issued_tickets = issued_tickets
+        self.verification_cache = verification_cache
+        self.event_characteristics: Optional[EventCharacteristics] = None
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    def __enter__(self) -> Any:
+        if len(self.lanes) > 1:
+            # threads, as OpenCV releases the GIL while detecting and the lanes share one ID storage
+            self.executor = ThreadPoolExecutor(max_workers=min(len(self.lanes), os.cpu_count() or 1),
+                                               thread_name_prefix="lane")
+        return self
+
+    def __exit__(self,
+                 exc_type: type[BaseException] | None,
+                 exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def process_frames(self, origin_time: float) -> None:
+        if self.executor is None:
+            for lane in self.lanes:
+                lane.scanner.process_frame(origin_time)
+            return
+        futures = [self.executor.submit(lane.scanner.process_frame, origin_time) for lane in self.lanes]
+        # the other events are only handled after all lanes, so they never change a scanner while it is checking
+        for future in futures:
+            future.result()
+
+    def set_event_characteristics(self, event_characteristics: EventCharacteristics) -> None:
+        self.event_characteristics = event_characteristics
+        for lane in self.lanes:
+            lane.scanner.set_event_characteristics(event_characteristics)
+        self.load_issued_tickets()
+
+    def load_issued_tickets(self) -> None:
+        if self.event_characteristics is None:
+            return
+        # the results depend on the event and the list of issued tickets, the list is read once for all lanes
+        self.verification_cache.clear()
+        self.issued_tickets.load(get_issued_tickets_file_names(self.validator.key_path, self.event_characteristics),
+                                 self.event_characteristics, self.validator)
+
+    def set_camera(self, lane: int, camera_index: int) -> None:
+        self.lanes[lane].camera_capture.set_camera(camera_index)
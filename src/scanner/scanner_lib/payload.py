@@ -0,0 +1,56 @@
+import hashlib
+from datetime import date
+from typing import Optional
+
+# Compact payload, version 1: base45 (RFC 9285) text of
+#   version (1 byte) | event hash (4 bytes) | ticket ID (varint) | signature
+# The signature covers everything in front of it. The format is written by the generator's payload module.
+COMPACT_PAYLOAD_VERSION = 1
+EVENT_HASH_SIZE = 4
+PAYLOAD_HASH_SIZE = 16
+_BASE45_CHARSET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:"
+_BASE45_VALUES = {char: value for value, char in enumerate(_BASE45_CHARSET)}
+
+
+def base45_decode(data: str) -> Optional[bytes]:
+    if len(data) % 3 == 1:
+        return None
+    decoded = bytearray()
+    try:
+        for i in range(0, len(data), 3):
+            chunk = [_BASE45_VALUES[char] for char in data[i:i + 3]]
+            value = sum(digit * 45 ** position for position,
+                        digit in enumerate(chunk))
+            if len(chunk) == 3:
+                if value > 0xffff:
+                    return None
+                decoded.extend(divmod(value, 256))
+            else:
+                if value > 0xff:
+                    return None
+                decoded.append(value)
+    except KeyError:
+        return None
+    return bytes(decoded)
+
+
+def decode_varint(data: bytes, offset: int) -> Optional[tuple[int, int]]:
+    # returns the value and the offset behind it
+    value = 0
+    shift = 0
+    while offset < len(data):
+        byte = data[offset]
+        value |= (byte & 0x7f) << shift
+        offset += 1
+        if byte & 0x80 == 0:
+            return (value, offset)
+        shift += 7
+    return None
+
+
+def get_event_hash(event_name: str, event_date: date) -> bytes:
+    return hashlib.sha256(f"{event_name}_{event_date.strftime('%Y-%m-%d')}".encode()).digest()[:EVENT_HASH_SIZE]
+
+
+def get_payload_hash(data: str) -> bytes:
+    return hashlib.sha256(data.encode()).digest()[:PAYLOAD_HASH_SIZE]
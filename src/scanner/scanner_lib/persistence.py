@@ -1,8 +1,10 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import os
 from pathlib import Path
 import json
 from io import TextIOWrapper
+from typing import List
+from .config import DecoderType
 
 
 @dataclass
@@ -11,6 +13,9 @@ class PersistedValues:
     log_dir: Path
     key_path: Path
     camera_index: int
+    decoder: DecoderType = DecoderType.OPENCV
+    # cameras of the lanes if several lanes are scanned, the first one is also the camera_index
+    lane_camera_indices: List[int] = field(default_factory=list)
 
 
 class Persistence:
@@ -27,8 +32,11 @@ class Persistence:
                 try:
                     content = file.read()
                     parsed = json.loads(content)
+                    # settings files of older versions have no decoder
+                    decoder = DecoderType.__members__.get(parsed.get("decoder", ""), DecoderType.OPENCV)
                     self.persisted_values = PersistedValues(
-                        Path(parsed["log_dir"]), Path(parsed["key_path"]), int(parsed["camera_index"]))
+                        Path(parsed["log_dir"]), Path(parsed["key_path"]), int(parsed["camera_index"]), decoder,
+                        [int(index) for index in parsed.get("lane_camera_indices", [])])
                 except json.JSONDecodeError:
                     self._write(file)
         else:
@@ -48,8 +56,23 @@ class Persistence:
         with open(self.config_path, "w", encoding = "utf-8") as file:
             self._write(file)
 
-    def persist_camera_index(self, camera_index: int) -> None:
-        self.persisted_values.camera_index=camera_index
+    def persist_camera_index(self, camera_index: int, lane: int = 0) -> None:
+        if lane == 0:
+            self.persisted_values.camera_index=camera_index
+        if lane < len(self.persisted_values.lane_camera_indices):
+            self.persisted_values.lane_camera_indices[lane] = camera_index
+        with open(self.config_path, "w", encoding = "utf-8") as file:
+            self._write(file)
+
+    def persist_decoder(self, decoder: DecoderType) -> None:
+        self.persisted_values.decoder = decoder
+        with open(self.config_path, "w", encoding = "utf-8") as file:
+            self._write(file)
+
+    def persist_lane_camera_indices(self, camera_indices: List[int]) -> None:
+        # a single camera is the default mode without lanes
+        self.persisted_values.lane_camera_indices = camera_indices if len(camera_indices) > 1 else []
+        self.persisted_values.camera_index = camera_indices[0]
         with open(self.config_path, "w", encoding = "utf-8") as file:
             self._write(file)
 
@@ -62,12 +85,22 @@ class Persistence:
     def get_persisted_camera_index(self) -> int:
         return self.persisted_values.camera_index
 
+    def get_persisted_camera_indices(self) -> List[int]:
+        if len(self.persisted_values.lane_camera_indices) != 0:
+            return list(self.persisted_values.lane_camera_indices)
+        return [self.persisted_values.camera_index]
+
+    def get_persisted_decoder(self) -> DecoderType:
+        return self.persisted_values.decoder
+
     def _write(self, file: TextIOWrapper) -> None:
         serialized=json.dumps(
             {
                 "log_dir": self.persisted_values.log_dir.as_posix(),
                 "key_path": self.persisted_values.key_path.as_posix(),
                 "camera_index": self.persisted_values.camera_index,
+                "decoder": self.persisted_values.decoder.name,
+                "lane_camera_indices": self.persisted_values.lane_camera_indices,
             })
         file.write(serialized)
         file.flush()
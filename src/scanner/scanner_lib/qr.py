@@ -1,61 +1,127 @@
 import base64
+from collections import deque
 from dataclasses import dataclass
 import re
+import threading
+import time
 from types import TracebackType
 from urllib.parse import unquote_to_bytes
-from typing import Any, List, Optional
+from typing import Any, Deque, List, Optional
 from datetime import date
 import cv2
 from .persistence import Persistence
+from .decoders import DetectedCode, QrDecoder
 from .utils import str_to_date
+from .payload import COMPACT_PAYLOAD_VERSION, EVENT_HASH_SIZE, base45_decode, decode_varint, get_event_hash
 
+_FRAME_BUFFER_SIZE = 4
+_READ_RETRY_INTERVAL_S = 0.1
 
-def read(image: Any) -> tuple[str, Any] | None:
-    detector = cv2.QRCodeDetector()
-    ret_qr, decoded_info, points, _ = detector.detectAndDecodeMulti(image)
-    if not ret_qr or len(decoded_info[0]) == 0:
-        return None
-    return (decoded_info[0], points)
+
+def read(image: Any, decoder: QrDecoder) -> List[DetectedCode]:
+    # every code in the frame, e.g. the phone tickets of a group
+    return decoder.decode(image)
 
 
 @dataclass
 class DecodeResult:
     """Result of the decode_message function"""
-    encoded: str
-    event_name: str
-    event_date: date
+    encoded: bytes
+    event_hash: bytes
+    event_name: Optional[str]
+    event_date: Optional[date]
     ticket_id: int
     signature: bytes
 
 
-def decode_message(data: str) -> DecodeResult | None:
-    matcher = re.compile(r"^((.*)_([-\d]+)_(\d+))__(.*)$")
-    matches = re.match(matcher, data)
+_LEGACY_MATCHER = re.compile(r"^((.*)_([-\d]+)_(\d+))__(.*)$")
+
+
+def _decode_legacy_message(data: str) -> DecodeResult | None:
+    matches = _LEGACY_MATCHER.match(data)
     if matches is None:
         return None
     groups = matches.groups()
     encoded = groups[0]
     event_name = groups[1]
-    event_date = str_to_date(groups[2])
+    try:
+        event_date = str_to_date(groups[2])
+        # binascii.Error of a corrupt signature is a ValueError as well
+        signature = base64.b64decode(unquote_to_bytes(groups[4]))
+    except ValueError:
+        return None
     ticket_id = int(groups[3])
-    signature = unquote_to_bytes(groups[4])
-    return DecodeResult(encoded, event_name, event_date, ticket_id, base64.b64decode(signature))
+    return DecodeResult(encoded.encode(), get_event_hash(event_name, event_date),
+                        event_name, event_date, ticket_id, signature)
+
+
+def _decode_compact_message(data: str) -> DecodeResult | None:
+    decoded = base45_decode(data)
+    if decoded is None or len(decoded) < EVENT_HASH_SIZE + 2 or decoded[0] != COMPACT_PAYLOAD_VERSION:
+        return None
+    event_hash = decoded[1:1 + EVENT_HASH_SIZE]
+    varint = decode_varint(decoded, 1 + EVENT_HASH_SIZE)
+    if varint is None:
+        return None
+    ticket_id, signature_offset = varint
+    # the compact format only identifies the event by its hash
+    return DecodeResult(decoded[:signature_offset], event_hash,
+                        None, None, ticket_id, decoded[signature_offset:])
+
+
+def decode_message(data: str) -> DecodeResult | None:
+    # the legacy format is the only one containing underscores
+    if "__" in data:
+        return _decode_legacy_message(data)
+    return _decode_compact_message(data)
+
+
+@dataclass
+class CapturedFrame:
+    """Camera frame with its sequence number and the time it was read"""
+    image: Any
+    sequence_number: int
+    timestamp: float
+
+
+@dataclass
+class CaptureStatistics:
+    """Numbers of the frames read from the camera and of those replaced by a newer frame before processing"""
+    num_grabbed: int
+    num_processed: int
+    num_dropped: int
 
 
 class CameraCapture:
-    """Class which represents camera"""
+    """Class which represents camera, a grab thread reads the frames so the newest one is always ready"""
 
-    def __init__(self, camera_index: int, persistence: Persistence) -> None:
+    def __init__(self, camera_index: int, persistence: Persistence, lane: int = 0,
+                 allow_fallback: bool = True) -> None:
         self.capture: Optional[cv2.VideoCapture] = None
         self.persistence = persistence
         self.camera_index = camera_index
+        self.lane = lane
+        # with several lanes a fallback to camera 0 would scan the same entrance twice
+        self.allow_fallback = allow_fallback
+        # only the newest frames are kept, older ones are never processed
+        self.frames: Deque[CapturedFrame] = deque(maxlen=_FRAME_BUFFER_SIZE)
+        self.lock = threading.Lock()
+        self.grab_thread: Optional[threading.Thread] = None
+        self.stop_requested = False
+        self.num_grabbed = 0
+        self.num_dropped = 0
+        self.num_processed = 0
+        self.last_sequence_number = 0
 
     def __enter__(self) -> Any:
         self._try_open_camera()
+        self._start_grabbing()
         return self
 
     def _try_open_camera(self) -> None:
         self.capture = cv2.VideoCapture(self.camera_index)
+        if not self.capture.isOpened() and not self.allow_fallback:
+            raise IOError(f"Cannot open webcam {self.camera_index} of lane {self.lane + 1}")
         if not self.capture.isOpened() and self.camera_index == 0:
             raise IOError("Cannot open webcam")
         if not self.capture.isOpened() and self.camera_index != 0:
@@ -66,23 +132,62 @@ class CameraCapture:
                  exc_type: type[BaseException] | None,
                  exc_val: BaseException | None,
                  exc_tb: TracebackType | None) -> None:
+        self._stop_grabbing()
         if self.capture is not None:
             self.capture.release()
             cv2.destroyAllWindows()
 
-    def get_frame(self) -> Any:
+    def _start_grabbing(self) -> None:
+        self.stop_requested = False
+        self.grab_thread = threading.Thread(target=self._grab, args=(), daemon=True)
+        self.grab_thread.start()
+
+    def _stop_grabbing(self) -> None:
+        self.stop_requested = True
+        if self.grab_thread is not None:
+            # returns after the current read, at most one frame interval
+            self.grab_thread.join()
+            self.grab_thread = None
+
+    def _grab(self) -> None:
+        while not self.stop_requested and self.capture is not None:
+            is_read, image = self.capture.read()
+            if not is_read:
+                # e.g. the camera was unplugged, retried without blocking a core
+                time.sleep(_READ_RETRY_INTERVAL_S)
+                continue
+            with self.lock:
+                self.num_grabbed += 1
+                self.frames.append(CapturedFrame(image, self.num_grabbed, time.time()))
+
+    def get_frame(self) -> Optional[CapturedFrame]:
+        # the newest frame, None if it has been returned before
         if self.capture is None:
             raise RuntimeError("VideoCapture not initialized")
-        _, frame = self.capture.read()
-        return frame
+        with self.lock:
+            if len(self.frames) == 0 or self.frames[-1].sequence_number == self.last_sequence_number:
+                return None
+            frame = self.frames[-1]
+            self.num_dropped += frame.sequence_number - self.last_sequence_number - 1
+            self.num_processed += 1
+            self.last_sequence_number = frame.sequence_number
+            return frame
+
+    def get_statistics(self) -> CaptureStatistics:
+        with self.lock:
+            return CaptureStatistics(self.num_grabbed, self.num_processed, self.num_dropped)
 
     def set_camera(self, index: int) -> None:
+        self._stop_grabbing()
         if self.capture is not None:
             self.capture.release()
         self.capture = cv2.VideoCapture(index)
+        with self.lock:
+            self.frames.clear()
         if not self.capture.isOpened():
             raise IOError("Cannot open webcam")
-        self.persistence.persist_camera_index(index)
+        self._start_grabbing()
+        self.persistence.persist_camera_index(index, self.lane)
 
 
 def scan_for_cameras() -> List[int]:
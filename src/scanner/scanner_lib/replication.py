@@ -0,0 +1,219 @@
+import json
+import socket
+import sys
+import threading
+import uuid
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Dict, List, Optional
+from .event_characteristics import EventCharacteristics
+from .id_storage import IdStorage
+from .payload import get_event_hash
+
+DEFAULT_REPLICATION_PORT = 47800
+# interval of the requests for missed IDs, which also reconnects stations after a network partition
+_PULL_INTERVAL_S = 1.0
+# IDs per datagram, which stays below the usual MTU of 1500 bytes
+_MAX_ENTRIES_PER_MESSAGE = 20
+_MAX_MESSAGE_SIZE = 65507
+
+# Stations exchange JSON datagrams:
+#   {"type": "entries", "event": ..., "station": ..., "session": ..., "index": i, "entries": [[id, time, station]]}
+#   {"type": "pull", "event": ..., "station": ..., "session": ..., "index": i}
+# Every station keeps a log of the IDs it scanned or merged. A new ID is sent to all peers right away, a pull asks
+# a peer for its log from the given index on, so IDs lost while a station was unreachable are sent again.
+# The session changes with every start, after which the peers read the log from the beginning.
+
+
+@dataclass
+class ReplicatedId:
+    """ID scanned at a station, with the time of the scan"""
+    ticket_id: int
+    scan_time: float
+    station: str
+
+
+@dataclass
+class PeerCursor:
+    """Position up to which the log of a peer has been merged"""
+    session: str
+    index: int
+
+
+def get_default_station(port: int) -> str:
+    # stations on the same computer, e.g. two scanners of a small entrance, only differ by their port
+    return f"{socket.gethostname()}:{port}"
+
+
+def parse_peer(peer: str) -> tuple[str, int]:
+    # e.g. 192.168.1.12:47800 or scanner-nord, which uses the default port
+    host, _, port = peer.rpartition(":")
+    if len(host) == 0:
+        return (peer, DEFAULT_REPLICATION_PORT)
+    return (host, int(port))
+
+
+class IdReplicator:
+    """Class which shares the scanned IDs with the scanner stations on the local network"""
+
+    def __init__(self, station: str, port: int, peers: List[tuple[str, int]], id_storage: IdStorage) -> None:
+        self.station = station
+        self.port = port
+        self.peers = peers
+        self.id_storage = id_storage
+        self.session = uuid.uuid4().hex
+        self.event_key = ""
+        self.log: List[ReplicatedId] = []
+        self.cursors: Dict[tuple[str, int], PeerCursor] = {}
+        self.lock = threading.Lock()
+        self.socket: Optional[socket.socket] = None
+        self.threads: List[threading.Thread] = []
+        self.stop_requested = threading.Event()
+
+    def __enter__(self) -> Any:
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(("", self.port))
+        self.socket.settimeout(_PULL_INTERVAL_S)
+        self.peers = self._resolve_peers(self.peers)
+        self.id_storage.set_added_listener(self._on_id_added)
+        self.stop_requested.clear()
+        self.threads = [threading.Thread(target=self._receive, args=(), daemon=True),
+                        threading.Thread(target=self._pull, args=(), daemon=True)]
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def __exit__(self,
+                 exc_type: type[BaseException] | None,
+                 exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        self.stop_requested.set()
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+    def _resolve_peers(self, peers: List[tuple[str, int]]) -> List[tuple[str, int]]:
+        # the peers are resolved once, so their datagrams can be matched with the cursors
+        resolved = []
+        for host, port in peers:
+            try:
+                resolved.append((socket.gethostbyname(host), port))
+            except OSError:
+                # an unknown station must not keep the scanner from starting
+                print(f"cannot resolve scanner station {host}, IDs are not shared with it", file=sys.stderr)
+        return resolved
+
+    def set_event_characteristics(self, event_characteristics: EventCharacteristics) -> None:
+        # called after the ID storage restored the IDs of the event, which are offered to the peers again
+        with self.lock:
+            self.event_key = get_event_hash(event_characteristics.name, event_characteristics.date).hex()
+            self.session = uuid.uuid4().hex
+            self.cursors.clear()
+            self.log = [ReplicatedId(ticket_id, scan_time, self.station if station is None else station)
+                        for ticket_id, scan_time, station in self.id_storage.get_ids()]
+            self.log.sort(key=lambda replicated_id: replicated_id.scan_time)
+
+    def _on_id_added(self, ticket_id: int, scan_time: float) -> None:
+        with self.lock:
+            if len(self.event_key) == 0:
+                return
+            replicated_id = ReplicatedId(ticket_id, scan_time, self.station)
+            self.log.append(replicated_id)
+            message = self._create_entries_message(len(self.log) - 1, [replicated_id])
+        # pushed right away, a lost datagram is sent again on the next pull
+        for peer in self.peers:
+            self._send(message, peer)
+
+    def _create_entries_message(self, index: int, replicated_ids: List[ReplicatedId]) -> Dict[str, Any]:
+        return {
+            "type": "entries", "event": self.event_key, "station": self.station, "session": self.session,
+            "index": index,
+            "entries": [[entry.ticket_id, entry.scan_time, entry.station] for entry in replicated_ids],
+        }
+
+    def _send(self, message: Dict[str, Any], peer: tuple[str, int]) -> None:
+        if self.socket is None:
+            return
+        try:
+            self.socket.sendto(json.dumps(message).encode(), peer)
+        except OSError:
+            # e.g. the network is down, the peer catches up with the next pull
+            pass
+
+    def _pull(self) -> None:
+        while not self.stop_requested.wait(_PULL_INTERVAL_S):
+            for peer in self.peers:
+                self._send_pull(peer)
+
+    def _send_pull(self, peer: tuple[str, int]) -> None:
+        with self.lock:
+            if len(self.event_key) == 0:
+                return
+            cursor = self.cursors.get(peer, PeerCursor("", 0))
+            message = {"type": "pull", "event": self.event_key, "station": self.station,
+                       "session": cursor.session, "index": cursor.index}
+        self._send(message, peer)
+
+    def _receive(self) -> None:
+        while not self.stop_requested.is_set() and self.socket is not None:
+            try:
+                data, sender = self.socket.recvfrom(_MAX_MESSAGE_SIZE)
+            except socket.timeout:
+                continue
+            except OSError:
+                # e.g. an ICMP port unreachable of a stopped peer on Windows
+                continue
+            try:
+                message = json.loads(data)
+                self._handle_message(message, sender)
+            except (ValueError, KeyError, TypeError):
+                # not a message of a scanner station
+                continue
+
+    def _handle_message(self, message: Dict[str, Any], sender: tuple[str, int]) -> None:
+        if message["event"] != self.event_key or message["station"] == self.station:
+            return
+        if message["type"] == "pull":
+            self._answer_pull(message, sender)
+        elif message["type"] == "entries":
+            self._merge_entries(message, sender)
+
+    def _answer_pull(self, message: Dict[str, Any], sender: tuple[str, int]) -> None:
+        with self.lock:
+            # a peer which knows an older session reads the log from the beginning
+            index = int(message["index"]) if message["session"] == self.session else 0
+            replicated_ids = self.log[index:index + _MAX_ENTRIES_PER_MESSAGE]
+            if len(replicated_ids) == 0 and message["session"] == self.session:
+                return
+            reply = self._create_entries_message(index, replicated_ids)
+        self._send(reply, sender)
+
+    def _merge_entries(self, message: Dict[str, Any], sender: tuple[str, int]) -> None:
+        session = str(message["session"])
+        index = int(message["index"])
+        replicated_ids = [ReplicatedId(int(ticket_id), float(scan_time), str(station))
+                          for ticket_id, scan_time, station in message["entries"]]
+        for replicated_id in replicated_ids:
+            if replicated_id.station == self.station:
+                # scanned here, the local entry is already in the storage
+                continue
+            if self.id_storage.merge_id(replicated_id.ticket_id, replicated_id.scan_time, replicated_id.station):
+                with self.lock:
+                    # forwarded to the other peers, which may not reach the station of the scan
+                    self.log.append(replicated_id)
+        with self.lock:
+            cursor = self.cursors.get(sender)
+            if cursor is None or cursor.session != session:
+                cursor = PeerCursor(session, 0)
+                self.cursors[sender] = cursor
+            if index > cursor.index:
+                # IDs are missing in between, they are requested with the next pull
+                return
+            cursor.index = max(cursor.index, index + len(replicated_ids))
+            is_catching_up = len(replicated_ids) == _MAX_ENTRIES_PER_MESSAGE
+        if is_catching_up:
+            # the rest of the log after a partition or a restart is requested without waiting
+            self._send_pull(sender)
@@ -1,59 +1,97 @@
 import time
-from typing import Optional
+from typing import Optional, Set
 from scanner_lib.signature_validator import SignatureValidator
-from scanner_lib.display_utils import QrCodeImageDrawer
+from scanner_lib.display_utils import CheckResult, ErrorArgs, QrCodeImageDrawer, SuccessArgs
 from scanner_lib.id_storage import IdStorage
 from scanner_lib.qr import decode_message, read, CameraCapture
+from scanner_lib.decoders import DetectedCode, QrDecoder
 from scanner_lib.event_characteristics import EventCharacteristics
+from scanner_lib.payload import get_event_hash
+from scanner_lib.verification_cache import VerificationCache, VerifiedPayload
+from scanner_lib.issued_tickets import IssuedTicketIndex
 
 
 class Scanner:
     """Main class which handles scanning of QR codes"""
 
-    def __init__(self, camera_capture: CameraCapture,
-                 validator: SignatureValidator,
-                 qr_code_image_drawer: QrCodeImageDrawer,
-                 storage: IdStorage) -> None:
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+            self, camera_capture: CameraCapture,
+            validator: SignatureValidator,
+            qr_code_image_drawer: QrCodeImageDrawer,
+            storage: IdStorage,
+            decoder: QrDecoder,
+            issued_tickets: IssuedTicketIndex,
+            verification_cache: VerificationCache) -> None:
         self.camera_capture = camera_capture
+        # created once, the detectors keep their state between the frames, e.g. the region of the last code
+        self.decoder = decoder
         self.validator = validator
         self.qr_code_image_drawer = qr_code_image_drawer
         self.storage = storage
         self.event_characteristics: Optional[EventCharacteristics] = None
+        self.event_hash = b""
+        # shared by the lanes and loaded by their pool, as a ticket shown to one camera is often seen by the next
+        self.issued_tickets = issued_tickets
+        # a code in view is decoded about 30 times a second, but only verified once
+        self.verification_cache = verification_cache
 
     def process_frame(self, origin_time: float) -> None:
         if time.time() - origin_time > 1:
             return
-        frame = self.camera_capture.get_frame()
-        read_result = read(frame)
-        if read_result is None:
+        captured_frame = self.camera_capture.get_frame()
+        if captured_frame is None:
+            # the camera has not delivered a new frame since the last tick
+            return
+        frame = captured_frame.image
+        codes = read(frame, self.decoder)
+        if len(codes) == 0:
             self.qr_code_image_drawer.show_frame_stored(frame)
             return
-        payload, frame_points = read_result
+        # all tickets of a group are checked in one pass, the IDs accepted in this frame are tracked as the
+        # grace period would accept a second copy of a ticket, e.g. a screenshot shown next to the printout
+        frame_ids: Set[int] = set()
+        self.qr_code_image_drawer.show_frame_checked(frame, [self._check_code(code, frame_ids) for code in codes])
+
+    def _check_code(self, code: DetectedCode, frame_ids: Set[int]) -> CheckResult:
+        verified = self.verification_cache.get(code.payload, self.validator.key_generation)
+        if verified is None:
+            verified = self._verify_payload(code.payload)
+            self.verification_cache.put(code.payload, verified)
+        if verified.reason is not None or verified.decode_result is None:
+            return ErrorArgs(verified.reason or "Wrong format", code.points)
+        decode_result = verified.decode_result
+        # the duplicate check depends on the time of the scan and is never cached
+        if decode_result.ticket_id in frame_ids or not self.storage.try_add_id(decode_result.ticket_id):
+            return ErrorArgs("Duplicate ID", code.points)
+        frame_ids.add(decode_result.ticket_id)
+        event_name = decode_result.event_name
+        if event_name is None:
+            event_name = self.event_characteristics.name if self.event_characteristics is not None else "?"
+        return SuccessArgs(event_name, decode_result.ticket_id, code.points)
+
+    def _verify_payload(self, payload: str) -> VerifiedPayload:
         decode_result = decode_message(payload)
         if decode_result is None:
-            self.qr_code_image_drawer.show_frame_denied(
-                frame, ("Wrong format", frame_points))
-            return
-        if self.event_characteristics is not None and decode_result.event_name != self.event_characteristics.name:
-            self.qr_code_image_drawer.show_frame_denied(
-                frame, ("Wrong event name", frame_points))
-            return
-        if self.event_characteristics is not None and decode_result.event_date != self.event_characteristics.date:
-            self.qr_code_image_drawer.show_frame_denied(
-                frame, ("Wrong event date", frame_points))
-            return
-        is_verified = self.validator.verify_message(
-            decode_result.encoded, decode_result.signature)
-        if not is_verified:
-            self.qr_code_image_drawer.show_frame_denied(
-                frame, ("Invalid signature", frame_points))
-            return
-        if not self.storage.try_add_id(decode_result.ticket_id):
-            self.qr_code_image_drawer.show_frame_denied(
-                frame, ("Duplicate ID", frame_points))
-            return
-        self.qr_code_image_drawer.show_frame_verified(
-            frame, (decode_result.event_name, decode_result.ticket_id, frame_points))
+            return VerifiedPayload(None, "Wrong format")
+        if self.event_characteristics is not None and decode_result.event_name is None \
+                and decode_result.event_hash != self.event_hash:
+            return VerifiedPayload(decode_result, "Wrong event")
+        if self.event_characteristics is not None and decode_result.event_name is not None \
+                and decode_result.event_name != self.event_characteristics.name:
+            return VerifiedPayload(decode_result, "Wrong event name")
+        if self.event_characteristics is not None and decode_result.event_date is not None \
+                and decode_result.event_date != self.event_characteristics.date:
+            return VerifiedPayload(decode_result, "Wrong event date")
+        if self.issued_tickets.is_loaded:
+            # the list is signed, so a listed code needs no verification of its own signature
+            if self.issued_tickets.get_ticket_id(payload) != decode_result.ticket_id:
+                return VerifiedPayload(decode_result, "Not issued")
+        elif not self.validator.verify_message(decode_result.encoded, decode_result.signature):
+            return VerifiedPayload(decode_result, "Invalid signature")
+        return VerifiedPayload(decode_result, None)
 
     def set_event_characteristics(self, event_characteristics: EventCharacteristics) -> None:
+        # the pool of the lanes clears the shared cache and loads the issued tickets of the event
         self.event_characteristics = event_characteristics
+        self.event_hash = get_event_hash(
+            event_characteristics.name, event_characteristics.date)
@@ -1,37 +1,54 @@
 import os
 from pathlib import Path
 from typing import Optional
-from Crypto.PublicKey import RSA
-from Crypto.Signature import pss
+from Crypto.PublicKey import RSA, ECC
+from Crypto.Signature import pss, eddsa
 from Crypto.Hash import SHA256
 from .persistence import Persistence
 
+VerificationKey = RSA.RsaKey | ECC.EccKey
+
 
 class SignatureValidator:
     """Class which verifies signatures"""
 
     def __init__(self, file_name: Path, persistence: Persistence) -> None:
-        self.key: Optional[RSA.RsaKey] = read_key(file_name)
+        self.key: Optional[VerificationKey] = read_key(file_name)
+        self.key_path = file_name
         self.persistence = persistence
+        # changes with every key, e.g. for caches of verified signatures
+        self.key_generation = 0
 
     def set_key(self, file_name: Path) -> None:
         self.key = read_key(file_name)
+        self.key_path = file_name
+        self.key_generation += 1
         self.persistence.persist_key_path(file_name)
 
-    def verify_message(self, message: str, signature: bytes) -> bool:
+    def verify_message(self, message: str | bytes, signature: bytes) -> bool:
         if self.key is None:
             return False
-        hashed = SHA256.new(message.encode())
-        verifier = pss.new(self.key)
+        if isinstance(message, str):
+            message = message.encode()
         try:
+            if isinstance(self.key, ECC.EccKey):
+                eddsa.new(self.key, "rfc8032").verify(message, signature)
+                return True
+            hashed = SHA256.new(message)
+            verifier = pss.new(self.key)
             verifier.verify(hashed, signature)
             return True
         except (ValueError, TypeError):
             return False
 
 
-def read_key(file_name: Path) -> Optional[RSA.RsaKey]:
+def read_key(file_name: Path) -> Optional[VerificationKey]:
     if not os.path.exists(file_name):
         return None
     with open(file_name, 'rb') as public_key_file:
-        return RSA.import_key(public_key_file.read())
+        pem = public_key_file.read()
+    # the key type is detected from the PEM content
+    try:
+        return RSA.import_key(pem)
+    except ValueError:
+        return ECC.import_key(pem)
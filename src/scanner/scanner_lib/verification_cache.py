@@ -0,0 +1,49 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from .qr import DecodeResult
+
+DEFAULT_CACHE_SIZE = 256
+
+
+@dataclass
+class VerifiedPayload:
+    """Result of the checks of a payload which do not depend on the already scanned IDs"""
+    decode_result: Optional[DecodeResult]
+    # reason for denying the code, None if it is a valid ticket of the event
+    reason: Optional[str]
+
+
+class VerificationCache:
+    """Bounded LRU cache of the verified payloads, so a ticket held in front of the camera is only verified once"""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.entries: OrderedDict[str, VerifiedPayload] = OrderedDict()
+        self.key_generation = 0
+        # shared by the lanes, which check their frames at the same time
+        self.lock = threading.Lock()
+
+    def get(self, payload: str, key_generation: int) -> Optional[VerifiedPayload]:
+        with self.lock:
+            if key_generation != self.key_generation:
+                # the signatures were verified with another key
+                self.entries.clear()
+                self.key_generation = key_generation
+                return None
+            verified = self.entries.get(payload)
+            if verified is not None:
+                self.entries.move_to_end(payload)
+            return verified
+
+    def put(self, payload: str, verified: VerifiedPayload) -> None:
+        with self.lock:
+            self.entries[payload] = verified
+            self.entries.move_to_end(payload)
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
@@ -1,14 +1,18 @@
 import argparse
+from contextlib import ExitStack
+import sys
 from pathlib import Path
 import time
-from typing import cast
+from typing import Optional, cast
 from scanner_lib.persistence import Persistence, PersistedValues
 from scanner_lib.signature_validator import SignatureValidator
 from scanner_lib.display_utils import QrCodeImageDrawer
 from scanner_lib.id_storage import IdStorage
 from scanner_lib.qr import CameraCapture, scan_for_cameras
 from scanner_lib.gui import ScannerGui
-from scanner_lib.config import Config
+from scanner_lib.config import Config, DecoderType
+from scanner_lib.decoders import DecoderUnavailableError, QrDecoder, create_decoder
+from scanner_lib.detection import TrackingDetector
 from scanner_lib.event_processor import EventProcessor,\
     ProcessFrameEvent, ProcessFrameEventHandler, \
     SetKeyPathEvent, SetKeyPathEventHandler, \
@@ -16,31 +20,82 @@ from scanner_lib.event_processor import EventProcessor,\
     SetCameraEvent, SetCameraEventHandler, \
     ConfigurationFinishedEvent, ConfigurationFinishedEventHandler
 from scanner_lib.scanner import Scanner
+from scanner_lib.lanes import Lane, LanePool
+from scanner_lib.issued_tickets import IssuedTicketIndex
+from scanner_lib.verification_cache import VerificationCache
+from scanner_lib.replication import DEFAULT_REPLICATION_PORT, IdReplicator, get_default_station, parse_peer
 from scanner_lib.event_characteristics import EventCharacteristics
 
 
-def on_configuration_finished(scanner: Scanner, id_storage: IdStorage, characteristics: EventCharacteristics) -> None:
-    scanner.set_event_characteristics(characteristics)
+def on_configuration_finished(lane_pool: LanePool, id_storage: IdStorage, replicator: Optional[IdReplicator],
+                              characteristics: EventCharacteristics) -> None:
+    lane_pool.set_event_characteristics(characteristics)
     id_storage.set_event_characteristics(characteristics)
+    if replicator is not None:
+        # offers the IDs restored from the log to the other stations
+        replicator.set_event_characteristics(characteristics)
 
 
-def main() -> None:
+def on_key_path_changed(lane_pool: LanePool, validator: SignatureValidator, key_path: Path) -> None:
+    validator.set_key(key_path)
+    # the list of issued tickets is signed with the key and lies next to it
+    lane_pool.load_issued_tickets()
+
+
+def create_decoder_or_default(decoder_type: DecoderType) -> QrDecoder:
+    try:
+        return create_decoder(decoder_type)
+    except DecoderUnavailableError as error:
+        # a missing optional package must not keep the scanner from starting
+        print(f"{error}, using the OpenCV decoder", file=sys.stderr)
+        return create_decoder(DecoderType.OPENCV)
+
+
+def create_lane(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        camera_stack: ExitStack, lane: int, camera_index: int, persistence: Persistence,
+        validator: SignatureValidator, id_storage: IdStorage, issued_tickets: IssuedTicketIndex,
+        verification_cache: VerificationCache, qr_code_image_drawer: QrCodeImageDrawer, decoder_type: DecoderType,
+        num_lanes: int) -> Lane:
+    camera_capture = cast(CameraCapture, camera_stack.enter_context(
+        CameraCapture(camera_index, persistence, lane, allow_fallback=num_lanes == 1)))
+    # every lane has its own detector, the validator, the ID storage, the issued tickets and the cache are shared
+    scanner = Scanner(camera_capture, validator, qr_code_image_drawer, id_storage,
+                      TrackingDetector(create_decoder_or_default(decoder_type)), issued_tickets, verification_cache)
+    return Lane(camera_capture, scanner)
+
+
+def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser()
     parser.add_argument("-k", "--public_key")
     parser.add_argument("-l", "--log_dir")
-    parsed_args = parser.parse_args()
+    parser.add_argument("-d", "--decoder", choices=[decoder.name.lower() for decoder in DecoderType],
+                        help="QR-code detector, opencv_aruco finds small codes better, "
+                             "wechat requires opencv-contrib-python")
+    parser.add_argument("-c", "--cameras", nargs="+", type=int,
+                        help="camera index of each lane, e.g. 0 1 2 to scan three lanes of an entrance")
+    parser.add_argument("-p", "--peers", nargs="+",
+                        help="other scanner stations of the event as host or host:port, "
+                             "their scanned IDs are rejected as duplicates here and vice versa")
+    parser.add_argument("--replication_port", type=int, default=DEFAULT_REPLICATION_PORT)
+    parser.add_argument("--station",
+                        help="name of this station, unique among the peers, by default host:replication_port")
+    return parser.parse_args()
+
+
+def main() -> None:
+    parsed_args = parse_args()
 
     default_dir = Path.home() / "Documents" / "ACR_QR_Scanner"
     log_dir = default_dir / "Logs"
     public_key_path = default_dir / "Keys" / "public.pem"
     config_path = default_dir / "config.json"
-    camera_index = 0
 
     persistence = Persistence(config_path, PersistedValues(
-        log_dir, public_key_path, camera_index))
+        log_dir, public_key_path, 0, DecoderType.OPENCV))
     log_dir = persistence.get_persisted_log_dir()
     public_key_path = persistence.get_persisted_key_path()
-    camera_index = persistence.get_persisted_camera_index()
+    camera_indices = persistence.get_persisted_camera_indices()
+    decoder_type = persistence.get_persisted_decoder()
 
     if parsed_args.log_dir is not None:
         log_dir = Path(parsed_args.log_dir)
@@ -48,31 +103,44 @@ def main() -> None:
     if parsed_args.public_key is not None:
         public_key_path = Path(parsed_args.public_key)
         persistence.persist_key_path(public_key_path)
+    if parsed_args.cameras is not None:
+        camera_indices = parsed_args.cameras
+        persistence.persist_lane_camera_indices(camera_indices)
+    if parsed_args.decoder is not None:
+        decoder_type = DecoderType[parsed_args.decoder.upper()]
+        persistence.persist_decoder(decoder_type)
 
-    initial_config = Config(log_dir, public_key_path)
+    initial_config = Config(log_dir, public_key_path, decoder_type)
     validator = SignatureValidator(public_key_path, persistence)
 
-    gui = ScannerGui(initial_config, scan_for_cameras())
-    painter = gui.get_painter()
-    qr_code_image_drawer = QrCodeImageDrawer(3, painter)
-    with IdStorage(log_dir, 5, persistence) as id_storage_any:
+    gui = ScannerGui(initial_config, scan_for_cameras(), len(camera_indices))
+    with IdStorage(log_dir, 5, persistence) as id_storage_any, ExitStack() as context_stack:
         id_storage = cast(IdStorage, id_storage_any)
-        with CameraCapture(camera_index, persistence) as camera_capture_any:
-            camera_capture = cast(CameraCapture, camera_capture_any)
-            scanner = Scanner(camera_capture, validator,
-                              qr_code_image_drawer, id_storage)
+        replicator: Optional[IdReplicator] = None
+        if parsed_args.peers is not None:
+            replicator = cast(IdReplicator, context_stack.enter_context(IdReplicator(
+                parsed_args.station or get_default_station(parsed_args.replication_port), parsed_args.replication_port,
+                [parse_peer(peer) for peer in parsed_args.peers], id_storage)))
+        issued_tickets = IssuedTicketIndex()
+        verification_cache = VerificationCache()
+        lanes = [create_lane(context_stack, lane, camera_index, persistence, validator, id_storage, issued_tickets,
+                             verification_cache, QrCodeImageDrawer(3, painter), decoder_type, len(camera_indices))
+                 for lane, (camera_index, painter) in enumerate(zip(camera_indices, gui.get_painters()))]
+        with LanePool(lanes, validator, issued_tickets, verification_cache) as lane_pool_any:
+            lane_pool = cast(LanePool, lane_pool_any)
             event_processor = EventProcessor()
 
             event_processor.register_processor(
-                ProcessFrameEventHandler(lambda event: scanner.process_frame(event.origin_time)))
+                ProcessFrameEventHandler(lambda event: lane_pool.process_frames(event.origin_time)))
             event_processor.register_processor(
-                SetKeyPathEventHandler(lambda event: validator.set_key(event.key_path)))
+                SetKeyPathEventHandler(lambda event: on_key_path_changed(lane_pool, validator, event.key_path)))
             event_processor.register_processor(
                 SetLogDirEventHandler(lambda event: id_storage.set_dir(event.log_dir)))
             event_processor.register_processor(
-                SetCameraEventHandler(lambda event: camera_capture.set_camera(event.camera_index)))
+                SetCameraEventHandler(lambda event: lane_pool.set_camera(event.lane, event.camera_index)))
             event_processor.register_processor(
-                ConfigurationFinishedEventHandler(lambda event: on_configuration_finished(scanner, id_storage, event.event_characteristics)))
+                ConfigurationFinishedEventHandler(lambda event: on_configuration_finished(
+                    lane_pool, id_storage, replicator, event.event_characteristics)))
 
             gui.set_timer_listener(
                 lambda: event_processor.push(ProcessFrameEvent(time.time())))
@@ -81,7 +149,7 @@ def main() -> None:
             gui.set_log_dir_changed_listener(
                 lambda log_dir: event_processor.push(SetLogDirEvent(log_dir)))
             gui.set_camera_listener(
-                lambda camera_index: event_processor.push(SetCameraEvent(camera_index)))
+                lambda lane, camera_index: event_processor.push(SetCameraEvent(lane, camera_index)))
             gui.set_configuration_finished_listener(
                 lambda event_characteristics: event_processor.push(ConfigurationFinishedEvent(event_characteristics)))
 
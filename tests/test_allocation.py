@@ -0,0 +1,95 @@
+import sys
+import tempfile
+import unittest
+from dataclasses import replace
+from datetime import date
+from pathlib import Path
+from typing import Set
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "generator"))
+
+# pylint: disable=wrong-import-position
+from generator_lib.allocation import IdAllocationLedger
+from generator_lib.config import Config
+
+NUM_CODES = 10
+
+
+class IdAllocationLedgerTest(unittest.TestCase):
+    """ID ranges leased for the tickets of an event"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.out_dir = Path(self.temp_dir.name)
+        self.gen_config = Config("Konzert", date(2026, 11, 7), NUM_CODES, self.out_dir,
+                                 self.out_dir / "private.pem", None, allocate_ids=True)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _lease(self, gen_config: Config, completed_ids: Set[int] | None = None,
+               ledger_name: str = "ids.csv") -> range:
+        # a new ledger object for every run, like separate starts of the generator
+        with IdAllocationLedger(self.out_dir / ledger_name) as ledger:
+            leased_config = ledger.lease(gen_config, completed_ids or set())
+        self.assertFalse(leased_config.allocate_ids)
+        return leased_config.get_ticket_ids()
+
+    def test_consecutive_leases(self) -> None:
+        first_ids = self._lease(self.gen_config, set(range(NUM_CODES)))
+        second_ids = self._lease(self.gen_config, set(range(2 * NUM_CODES)))
+        third_ids = self._lease(replace(self.gen_config, num_qr_codes=3), set(range(2 * NUM_CODES)))
+        self.assertEqual(first_ids, range(0, 10))
+        self.assertEqual(second_ids, range(10, 20))
+        self.assertEqual(third_ids, range(20, 23))
+
+    def test_lowest_id_is_respected(self) -> None:
+        self.assertEqual(self._lease(replace(self.gen_config, first_code=100)), range(100, 110))
+        # the IDs below the lowest one stay free, but are not handed out after a higher lease
+        self.assertEqual(self._lease(self.gen_config, set(range(100, 110))), range(110, 120))
+
+    def test_unfinished_lease_is_resumed(self) -> None:
+        self.assertEqual(self._lease(self.gen_config), range(0, 10))
+        # interrupted after five tickets, the next start continues the range
+        self.assertEqual(self._lease(self.gen_config, set(range(5))), range(0, 10))
+        # a run with another number of tickets is a new top-up
+        self.assertEqual(self._lease(replace(self.gen_config, num_qr_codes=4), set(range(5))), range(10, 14))
+        self.assertEqual(self._lease(replace(self.gen_config, num_qr_codes=4), set(range(5))), range(10, 14))
+        self.assertEqual(self._lease(self.gen_config, set(range(14))), range(14, 24))
+        with IdAllocationLedger(self.out_dir / "ids.csv") as ledger:
+            self.assertEqual([lease.get_ids() for lease in ledger.leases],
+                             [range(0, 10), range(10, 14), range(14, 24)])
+
+    def test_shards_are_disjoint(self) -> None:
+        shards = [replace(self.gen_config, shard_index=shard_index, num_shards=3) for shard_index in range(3)]
+        # every machine has its own ledger
+        separate_ids = [set(self._lease(shard, ledger_name=f"ids{i}.csv")) for i, shard in enumerate(shards)]
+        self.assertEqual(set().union(*separate_ids), set(range(3 * NUM_CODES)))
+        self.assertEqual(sum(len(ids) for ids in separate_ids), 3 * NUM_CODES)
+        # the shards of one ledger continue above all leased IDs
+        shared_ids = [set(self._lease(shard)) for shard in shards]
+        self.assertEqual(len(set().union(*shared_ids)), 3 * NUM_CODES)
+        for shard_index, ids in enumerate(shared_ids):
+            self.assertTrue(all(ticket_id % 3 == shard_index for ticket_id in ids))
+        # a top-up of a shard gets new IDs of the shard
+        top_up_ids = set(self._lease(shards[1], set().union(*shared_ids)))
+        self.assertTrue(top_up_ids.isdisjoint(set().union(*shared_ids)))
+
+    def test_leased_ids_are_not_handed_out_again(self) -> None:
+        self.assertEqual(self._lease(self.gen_config), range(0, 10))
+        explicit_config = replace(self.gen_config, allocate_ids=False)
+        # the same range again is a reprint or a resumed run
+        self.assertEqual(self._lease(explicit_config), range(0, 10))
+        with self.assertRaises(ValueError):
+            self._lease(replace(explicit_config, num_qr_codes=5))
+        with self.assertRaises(ValueError):
+            self._lease(replace(explicit_config, first_code=5))
+        self.assertEqual(self._lease(replace(explicit_config, first_code=10)), range(10, 20))
+
+    def test_invalid_shard_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            self._lease(replace(self.gen_config, shard_index=2, num_shards=2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import re
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from typing import List
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "generator"))
+
+# pylint: disable=wrong-import-position
+from generator_lib.qr import TicketDocumentWriter, TicketWriter
+
+MAX_TICKETS = 4
+_PAGE_MATCHER = re.compile(rb"/Type /Page\b(?!s)")
+_BOOKMARK_MATCHER = re.compile(rb"/Title \(Ticket (\d+)\)")
+
+
+class TicketDocumentWriterTest(unittest.TestCase):
+    """Tickets of a batch written into PDF documents of a bounded size"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.file_name = str(Path(self.temp_dir.name) / "Codes" / "2026-11-07_Konzert")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _write(self, num_tickets: int, tickets_per_page: int) -> List[str]:
+        # returns the names of the written documents
+        with mock.patch("generator_lib.qr.MAX_TICKETS_PER_DOCUMENT", MAX_TICKETS), \
+                TicketDocumentWriter(TicketWriter(None), self.file_name, tickets_per_page, num_tickets) as writer:
+            for ticket_id in range(num_tickets):
+                writer.add_ticket(f"Konzert_2026-11-07_{ticket_id}__c2ln", f"Ticket {ticket_id}")
+        return sorted(os.listdir(os.path.dirname(self.file_name)))
+
+    def _read(self, document_name: str) -> bytes:
+        with open(Path(self.file_name).parent / document_name, "rb") as file:
+            pdf = file.read()
+        self.assertTrue(pdf.startswith(b"%PDF"))
+        return pdf
+
+    def _get_num_pages(self, document_name: str) -> int:
+        return len(_PAGE_MATCHER.findall(self._read(document_name)))
+
+    def _get_ticket_ids(self, document_name: str) -> List[int]:
+        return [int(ticket_id) for ticket_id in _BOOKMARK_MATCHER.findall(self._read(document_name))]
+
+    def test_small_batch_is_one_document(self) -> None:
+        self.assertEqual(self._write(MAX_TICKETS, 1), ["2026-11-07_Konzert.pdf"])
+        self.assertEqual(self._get_num_pages("2026-11-07_Konzert.pdf"), MAX_TICKETS)
+
+    def test_large_batch_is_split(self) -> None:
+        documents = self._write(2 * MAX_TICKETS + 2, 1)
+        self.assertEqual(documents, [f"2026-11-07_Konzert_part{i}of3.pdf" for i in range(1, 4)])
+        self.assertEqual([self._get_num_pages(document) for document in documents], [4, 4, 2])
+        self.assertEqual([self._get_ticket_ids(document) for document in documents],
+                         [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+
+    def test_sheets_are_not_split(self) -> None:
+        # three tickets per sheet, so a document holds one full sheet instead of four tickets
+        documents = self._write(7, 3)
+        self.assertEqual(len(documents), 3)
+        self.assertEqual([self._get_ticket_ids(document) for document in documents], [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEqual([self._get_num_pages(document) for document in documents], [1, 1, 1])
+
+    def test_documents_of_earlier_run_are_replaced(self) -> None:
+        self._write(2 * MAX_TICKETS, 1)
+        documents = self._write(2 * MAX_TICKETS, 1)
+        self.assertEqual(documents, ["2026-11-07_Konzert_part1of2.pdf", "2026-11-07_Konzert_part2of2.pdf"])
+        self.assertEqual(self._get_ticket_ids(documents[1]), [4, 5, 6, 7])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "scanner"))
+
+# pylint: disable=wrong-import-position
+from scanner_lib.event_characteristics import EventCharacteristics
+from scanner_lib.id_storage import IdStorage
+from scanner_lib.persistence import Persistence, PersistedValues
+
+KONZERT = EventCharacteristics("Konzert", date(2026, 11, 7))
+THEATER = EventCharacteristics("Theater", date(2026, 11, 7))
+
+
+class IdStorageTest(unittest.TestCase):
+    """Scanned IDs of the selected event"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        persistence = Persistence(Path(self.temp_dir.name) / "config.json",
+                                  PersistedValues(Path(self.temp_dir.name), Path(self.temp_dir.name) / "public.pem", 0))
+        # no grace period, so every second scan is a duplicate
+        self.id_storage = IdStorage(Path(self.temp_dir.name) / "Logs", 0, persistence)
+        self.id_storage.__enter__()  # pylint: disable=unnecessary-dunder-call
+
+    def tearDown(self) -> None:
+        self.id_storage.__exit__(None, None, None)
+        self.temp_dir.cleanup()
+
+    def test_ids_of_other_event_are_dropped(self) -> None:
+        self.id_storage.set_event_characteristics(KONZERT)
+        self.assertTrue(self.id_storage.try_add_id(1))
+        self.assertTrue(self.id_storage.merge_id(2, 100.0, "kasse:5000"))
+        self.assertFalse(self.id_storage.try_add_id(1))
+        # the tickets of another event have IDs of their own
+        self.id_storage.set_event_characteristics(THEATER)
+        self.assertEqual(self.id_storage.get_ids(), [])
+        self.assertTrue(self.id_storage.try_add_id(1))
+        self.assertTrue(self.id_storage.try_add_id(2))
+
+    def test_ids_are_restored_for_same_event(self) -> None:
+        self.id_storage.set_event_characteristics(KONZERT)
+        self.assertTrue(self.id_storage.try_add_id(1))
+        self.assertTrue(self.id_storage.merge_id(2, 100.0, "kasse:5000"))
+        self.id_storage.set_event_characteristics(THEATER)
+        # switching back reads the log of the event again
+        self.id_storage.set_event_characteristics(KONZERT)
+        self.assertEqual(sorted(ticket_id for ticket_id, _, _ in self.id_storage.get_ids()), [1, 2])
+        self.assertEqual(self.id_storage.remote_ids, {2: "kasse:5000"})
+        self.assertFalse(self.id_storage.try_add_id(1))
+        self.assertFalse(self.id_storage.try_add_id(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
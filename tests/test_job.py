@@ -0,0 +1,150 @@
+import json
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "generator"))
+
+# pylint: disable=wrong-import-position
+from generator_lib.config import Config, KeyType, OutputMode, PayloadFormat
+from generator_lib.generator import Generator, get_job_report_file_path, get_report_file_path
+from generator_lib.job import Job, read_job_file
+from generator_lib.metrics import GenerationMetrics
+from generator_lib.signing import write_keys
+
+
+class SilentProgress:
+    """Progress listener which ignores the progress"""
+
+    def set_metrics(self, metrics: GenerationMetrics) -> None:
+        pass
+
+    def set_maximum(self, progress_max: int) -> None:
+        pass
+
+    def set_progress(self, progress: int) -> None:
+        pass
+
+
+class ReadJobFileTest(unittest.TestCase):
+    """Events of a job file, merged with the defaults of the file and the settings of the generator"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.job_dir = Path(self.temp_dir.name) / "jobs"
+        self.job_dir.mkdir()
+        self.base_config = Config("", date(2026, 1, 1), 10, Path(self.temp_dir.name) / "Codes",
+                                  Path(self.temp_dir.name) / "Keys" / "private.pem", None, num_workers=2)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _read(self, job_values: Dict[str, Any]) -> Job:
+        file_name = self.job_dir / "saison.json"
+        with open(file_name, "w", encoding="utf-8") as file:
+            json.dump(job_values, file)
+        return read_job_file(file_name, self.base_config)
+
+    def test_defaults_are_merged(self) -> None:
+        job = self._read({
+            "defaults": {"num_codes": 200, "flyer": "flyers/season.png", "output_mode": "document"},
+            "events": [
+                {"name": "Konzert", "date": "2026-11-07"},
+                {"name": "Theater", "date": "2026-11-14", "num_codes": 80, "flyer": None,
+                 "payload_format": "compact", "first_id": 1000},
+            ]})
+        self.assertEqual(job.name, "saison")
+        konzert, theater = job.configs
+        self.assertEqual((konzert.event_name, konzert.event_date), ("Konzert", date(2026, 11, 7)))
+        self.assertEqual(konzert.num_qr_codes, 200)
+        # relative to the job file
+        self.assertEqual(konzert.flyer_file_name, self.job_dir / "flyers" / "season.png")
+        self.assertEqual(konzert.output_mode, OutputMode.DOCUMENT)
+        self.assertEqual(konzert.payload_format, PayloadFormat.LEGACY)
+        self.assertEqual(konzert.first_code, 0)
+        self.assertEqual((theater.event_name, theater.event_date), ("Theater", date(2026, 11, 14)))
+        self.assertEqual(theater.num_qr_codes, 80)
+        self.assertIsNone(theater.flyer_file_name)
+        self.assertEqual(theater.output_mode, OutputMode.DOCUMENT)
+        self.assertEqual(theater.payload_format, PayloadFormat.COMPACT)
+        self.assertEqual(theater.first_code, 1000)
+        # the settings of the generator are kept
+        for gen_config in job.configs:
+            self.assertEqual(gen_config.out_dir, self.base_config.out_dir)
+            self.assertEqual(gen_config.num_workers, 2)
+        self.assertEqual(job.get_num_qr_codes(), 280)
+        self.assertEqual(self.base_config.event_name, "")
+
+    def test_without_defaults(self) -> None:
+        job = self._read({"events": [{"name": "Konzert", "date": "2026-11-07"}]})
+        self.assertEqual(job.configs[0].num_qr_codes, 10)
+        self.assertEqual(job.configs[0].output_mode, OutputMode.SINGLE_FILES)
+
+    def test_same_event_with_other_ids(self) -> None:
+        job = self._read({"events": [{"name": "Konzert", "date": "2026-11-07"},
+                                     {"name": "Konzert", "date": "2026-11-07", "first_id": 10}]})
+        self.assertEqual([gen_config.first_code for gen_config in job.configs], [0, 10])
+
+    def test_invalid_job_files_are_rejected(self) -> None:
+        konzert = {"name": "Konzert", "date": "2026-11-07"}
+        invalid_jobs = {
+            "unknown event value": {"events": [{**konzert, "num_tickets": 5}]},
+            "unknown default": {"defaults": {"colour": "red"}, "events": [konzert]},
+            "duplicate event": {"events": [konzert, {**konzert, "num_codes": 5}]},
+            "duplicate event by defaults": {"defaults": {"name": "Konzert", "date": "2026-11-07"},
+                                            "events": [{}, {"flyer": None}]},
+            "no events": {"events": []},
+            "missing events": {"defaults": konzert},
+            "missing name": {"events": [{"date": "2026-11-07"}]},
+            "no codes": {"events": [{**konzert, "num_codes": 0}]},
+            "invalid date": {"events": [{**konzert, "date": "07.11.2026"}]},
+            "invalid output mode": {"events": [{**konzert, "output_mode": "poster"}]},
+            "invalid payload format": {"events": [{**konzert, "payload_format": "tiny"}]},
+        }
+        for description, job_values in invalid_jobs.items():
+            with self.subTest(description):
+                with self.assertRaises(ValueError):
+                    self._read(job_values)
+
+
+class JobReportTest(unittest.TestCase):
+    """Report of a generation run"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.gen_config = Config("Konzert", date(2026, 11, 7), 2, Path(self.temp_dir.name) / "Codes",
+                                 Path(self.temp_dir.name) / "Keys" / "private.pem", None,
+                                 key_type=KeyType.RSA, output_mode=OutputMode.PNG_FILES)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _read_report(self, file_name: Path) -> Dict[str, Any]:
+        with open(file_name, "r", encoding="utf-8") as file:
+            return json.loads(file.readlines()[-1])
+
+    def test_type_of_loaded_key_is_reported(self) -> None:
+        # the key on disk was created as Ed25519, the configured type only applies to new keys
+        write_keys(self.gen_config.private_key_path, KeyType.ED25519)
+        Generator(SilentProgress()).generate_blocking(self.gen_config)
+        self.assertEqual(self._read_report(get_report_file_path(self.gen_config))["key_type"], "ed25519")
+
+    def test_job_report(self) -> None:
+        theater_config = Config("Theater", date(2026, 11, 14), 3, self.gen_config.out_dir,
+                                self.gen_config.private_key_path, None, key_type=KeyType.ED25519,
+                                output_mode=OutputMode.PNG_FILES)
+        job = Job("saison", [self.gen_config, theater_config])
+        # pylint: disable=protected-access
+        Generator(SilentProgress())._generate(job)
+        report = self._read_report(get_job_report_file_path(job))
+        self.assertEqual(report["job_name"], "saison")
+        # the key is created with the type of the first event
+        self.assertEqual(report["key_type"], "rsa")
+        self.assertEqual([event["event_name"] for event in report["events"]], ["Konzert", "Theater"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import sys
+import tempfile
+import unittest
+from dataclasses import replace
+from datetime import date
+from pathlib import Path
+from typing import List
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "generator"))
+
+# pylint: disable=wrong-import-position
+from generator_lib.config import Config, KeyType, OutputMode
+from generator_lib.generator import Generator, TicketWorker, get_manifest_file_path, get_ticket_file_path
+from generator_lib.manifest import BatchManifest, read_completed_ids
+from generator_lib.metrics import GenerationMetrics
+
+NUM_CODES = 8
+NUM_BEFORE_INTERRUPTION = 3
+
+
+class GenerationInterrupted(Exception):
+    """Raised instead of a hard kill of the generator"""
+
+
+class InterruptingProgress:
+    """Progress listener which interrupts the run once the given number of tickets is written"""
+
+    def __init__(self, num_tickets: int | None) -> None:
+        self.num_tickets = num_tickets
+
+    def set_metrics(self, metrics: GenerationMetrics) -> None:
+        pass
+
+    def set_maximum(self, progress_max: int) -> None:
+        pass
+
+    def set_progress(self, progress: int) -> None:
+        if progress + 1 == self.num_tickets:
+            raise GenerationInterrupted()
+
+
+class ResumeTest(unittest.TestCase):
+    """Runs which continue the tickets of an interrupted run"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.gen_config = Config("Konzert", date(2026, 11, 7), NUM_CODES, Path(self.temp_dir.name) / "Codes",
+                                 Path(self.temp_dir.name) / "Keys" / "private.pem", None, key_type=KeyType.ED25519,
+                                 output_mode=OutputMode.PNG_FILES)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _get_file_name(self, gen_config: Config, ticket_id: int) -> str:
+        return f"{get_ticket_file_path(gen_config, ticket_id)}.png"
+
+    def _generate(self, gen_config: Config) -> List[int]:
+        # returns the IDs of the rendered tickets
+        with mock.patch.object(TicketWorker, "generate_ticket", autospec=True,
+                               side_effect=TicketWorker.generate_ticket) as generate_ticket:
+            Generator(InterruptingProgress(None)).generate_blocking(gen_config)
+        return [call.args[1].ticket_id for call in generate_ticket.call_args_list]
+
+    def _interrupt(self, gen_config: Config) -> None:
+        with self.assertRaises(GenerationInterrupted):
+            Generator(InterruptingProgress(NUM_BEFORE_INTERRUPTION)).generate_blocking(gen_config)
+
+    def test_interrupted_run_is_continued(self) -> None:
+        self._interrupt(self.gen_config)
+        written = [ticket_id for ticket_id in self.gen_config.get_ticket_ids()
+                   if os.path.exists(self._get_file_name(self.gen_config, ticket_id))]
+        self.assertEqual(written, list(range(NUM_BEFORE_INTERRUPTION)))
+        modification_times = [os.stat(self._get_file_name(self.gen_config, ticket_id)).st_mtime_ns
+                              for ticket_id in written]
+        # only the missing tickets are rendered
+        self.assertEqual(self._generate(self.gen_config), list(range(NUM_BEFORE_INTERRUPTION, NUM_CODES)))
+        self.assertEqual(modification_times, [os.stat(self._get_file_name(self.gen_config, ticket_id)).st_mtime_ns
+                                              for ticket_id in written])
+        for ticket_id in self.gen_config.get_ticket_ids():
+            self.assertTrue(os.path.exists(self._get_file_name(self.gen_config, ticket_id)))
+        self.assertEqual(read_completed_ids(get_manifest_file_path(self.gen_config)), set(range(NUM_CODES)))
+        # a finished run has nothing left to render
+        self.assertEqual(self._generate(self.gen_config), [])
+
+    def test_other_layout_is_rendered_again(self) -> None:
+        self._interrupt(self.gen_config)
+        webp_config = replace(self.gen_config, output_mode=OutputMode.WEBP_FILES)
+        # the tickets written as PNG do not count for the WebP tickets
+        self.assertEqual(self._generate(webp_config), list(range(NUM_CODES)))
+
+    def test_incomplete_last_row_is_ignored(self) -> None:
+        manifest_file_name = Path(self.temp_dir.name) / "manifest.csv"
+        with BatchManifest(manifest_file_name, "layout") as manifest:
+            manifest.add(1)
+            manifest.add(2)
+        with open(manifest_file_name, "a", encoding="utf-8") as file:
+            # killed while the row of ticket 3 was written
+            file.write("2026-11-07T10:00:00+00:00,3")
+        with BatchManifest(manifest_file_name, "layout") as manifest:
+            self.assertEqual(manifest.completed, {1, 2})
+            manifest.add(4)
+        # the ticket written after the interruption is not lost in the incomplete row
+        with BatchManifest(manifest_file_name, "layout") as manifest:
+            self.assertEqual(manifest.completed, {1, 2, 4})
+        with BatchManifest(manifest_file_name, "other layout") as manifest:
+            self.assertEqual(manifest.completed, set())
+
+
+if __name__ == "__main__":
+    unittest.main()
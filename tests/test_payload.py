@@ -0,0 +1,128 @@
+import os
+import sys
+import unittest
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "generator"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "scanner"))
+
+# pylint: disable=wrong-import-position
+from generator_lib.config import PayloadFormat
+from generator_lib.payload import PayloadCodec, base45_encode, encode_varint
+from scanner_lib.payload import EVENT_HASH_SIZE, base45_decode, decode_varint, get_event_hash
+from scanner_lib.qr import decode_message
+
+EVENT_NAME = "Konzert"
+EVENT_DATE = date(2026, 11, 7)
+TICKET_IDS = [0, 1, 127, 128, 16383, 16384, 2 ** 31, 2 ** 63]
+SIGNATURE = bytes(range(64))
+
+
+class EncodingTest(unittest.TestCase):
+    """Base45 and varint encoding of the generator decoded by the scanner"""
+
+    def test_base45_round_trip(self) -> None:
+        for data in [b"", b"\x00", b"\xff", b"\xff\xff", b"AB", b"ietf!", bytes(range(256)), os.urandom(101)]:
+            with self.subTest(data=data):
+                self.assertEqual(base45_decode(base45_encode(data)), data)
+
+    def test_base45_known_values(self) -> None:
+        # examples of RFC 9285
+        self.assertEqual(base45_encode(b"AB"), "BB8")
+        self.assertEqual(base45_encode(b"Hello!!"), "%69 VD92EX0")
+        self.assertEqual(base45_decode("QED8WEX0"), b"ietf!")
+
+    def test_invalid_base45_is_rejected(self) -> None:
+        # a single character left over, characters outside the alphabet, values beyond two and one bytes
+        for data in ["A", "BB8A", "bb8", "BB_", "GGW", "GGW0", "::"]:
+            with self.subTest(data=data):
+                self.assertIsNone(base45_decode(data))
+
+    def test_varint_round_trip(self) -> None:
+        for value in TICKET_IDS:
+            with self.subTest(value=value):
+                encoded = encode_varint(value)
+                self.assertEqual(decode_varint(b"\x05" + encoded + b"rest", 1), (value, 1 + len(encoded)))
+        self.assertEqual(encode_varint(127), b"\x7f")
+        self.assertEqual(encode_varint(128), b"\x80\x01")
+
+    def test_truncated_varint_is_rejected(self) -> None:
+        self.assertIsNone(decode_varint(encode_varint(2 ** 31)[:-1], 0))
+        self.assertIsNone(decode_varint(b"", 0))
+
+
+class DecodeMessageTest(unittest.TestCase):
+    """Payloads written by the generator and decoded by the scanner"""
+
+    def _encode(self, payload_format: PayloadFormat, ticket_id: int) -> tuple[bytes, str]:
+        codec = PayloadCodec(payload_format)
+        message = codec.get_signed_message(EVENT_NAME, EVENT_DATE, ticket_id)
+        return (message, codec.encode(message, SIGNATURE))
+
+    def test_compact_round_trip(self) -> None:
+        for ticket_id in TICKET_IDS:
+            with self.subTest(ticket_id=ticket_id):
+                message, payload = self._encode(PayloadFormat.COMPACT, ticket_id)
+                decode_result = decode_message(payload)
+                assert decode_result is not None
+                self.assertEqual(decode_result.encoded, message)
+                self.assertEqual(decode_result.event_hash, get_event_hash(EVENT_NAME, EVENT_DATE))
+                self.assertEqual(decode_result.ticket_id, ticket_id)
+                self.assertEqual(decode_result.signature, SIGNATURE)
+                self.assertIsNone(decode_result.event_name)
+                self.assertIsNone(decode_result.event_date)
+
+    def test_legacy_round_trip(self) -> None:
+        for ticket_id in TICKET_IDS:
+            with self.subTest(ticket_id=ticket_id):
+                message, payload = self._encode(PayloadFormat.LEGACY, ticket_id)
+                decode_result = decode_message(payload)
+                assert decode_result is not None
+                self.assertEqual(decode_result.encoded, message)
+                self.assertEqual(decode_result.event_hash, get_event_hash(EVENT_NAME, EVENT_DATE))
+                self.assertEqual(decode_result.event_name, EVENT_NAME)
+                self.assertEqual(decode_result.event_date, EVENT_DATE)
+                self.assertEqual(decode_result.ticket_id, ticket_id)
+                self.assertEqual(decode_result.signature, SIGNATURE)
+
+    def test_legacy_payload_of_earlier_versions(self) -> None:
+        # written by the generator before the compact format existed
+        decode_result = decode_message("Konzert_2026-11-07_12__c2lnbmF0dXJl")
+        assert decode_result is not None
+        self.assertEqual(decode_result.encoded, b"Konzert_2026-11-07_12")
+        self.assertEqual(decode_result.ticket_id, 12)
+        self.assertEqual(decode_result.signature, b"signature")
+
+    def test_truncated_compact_payload_is_rejected(self) -> None:
+        _, payload = self._encode(PayloadFormat.COMPACT, 2 ** 31)
+        # too short for the header, cut inside the ticket ID or a single character left over
+        header_length = (1 + EVENT_HASH_SIZE) * 3 // 2
+        for length in [0, 2, header_length, header_length + 2, len(payload) - 1]:
+            with self.subTest(length=length):
+                self.assertIsNone(decode_message(payload[:length]))
+
+    def test_truncated_signature_fails_verification_only(self) -> None:
+        _, payload = self._encode(PayloadFormat.COMPACT, 12)
+        decode_result = decode_message(payload[:-3])
+        # the header is complete, the signature validator rejects the shortened signature
+        assert decode_result is not None
+        self.assertEqual(decode_result.ticket_id, 12)
+        self.assertEqual(decode_result.signature, SIGNATURE[:-2])
+
+    def test_corrupt_compact_payload_is_rejected(self) -> None:
+        _, payload = self._encode(PayloadFormat.COMPACT, 12)
+        unknown_version = base45_encode(b"\x02" + base45_decode(payload)[1:])  # type: ignore[index]
+        for data in [unknown_version, payload.lower(), payload + "_", "ZZZ" + payload[3:], "%%%", ""]:
+            with self.subTest(data=data):
+                self.assertIsNone(decode_message(data))
+
+    def test_corrupt_legacy_payload_is_rejected(self) -> None:
+        for data in ["Konzert_2026-13-07_12__c2ln", "Konzert_07.11.2026_12__c2ln", "Konzert_2026-11-07_12__c2lnbm",
+                     "Konzert_2026-11-07__c2ln", "Konzert_12__c2ln", "a_-_1__AAAA"]:
+            with self.subTest(data=data):
+                self.assertIsNone(decode_message(data))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import random
+import string
+import sys
+import unittest
+from pathlib import Path
+from typing import List
+
+import qrcode
+from qrcode import constants
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "generator"))
+
+# pylint: disable=wrong-import-position
+from generator_lib.qr_encoder import QrBatchEncoder
+
+ERROR_CORRECTIONS = [constants.ERROR_CORRECT_L, constants.ERROR_CORRECT_M,
+                     constants.ERROR_CORRECT_Q, constants.ERROR_CORRECT_H]
+# compact payloads use the alphanumeric charset of base45, legacy payloads are bytes
+_ALPHABETS = {
+    "numeric": string.digits,
+    "alphanumeric": "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:",
+    "bytes": string.ascii_letters + string.digits + "_-%",
+}
+_LENGTHS = [1, 7, 20, 41, 77, 150, 300, 600]
+
+
+def _get_reference_matrix(data: str, error_correction: int) -> List[List[bool]]:
+    qr = qrcode.QRCode(error_correction=error_correction, border=0)
+    qr.add_data(data)
+    qr.make(fit=True)
+    matrix: List[List[bool]] = qr.get_matrix()
+    return matrix
+
+
+class QrBatchEncoderTest(unittest.TestCase):
+    """The modules of the batch encoder have to be identical to the ones of the qrcode package"""
+
+    def _assert_same_modules(self, data: str, error_correction: int) -> None:
+        with self.subTest(data=data[:20], length=len(data), error_correction=error_correction):
+            expected = _get_reference_matrix(data, error_correction)
+            self.assertEqual(QrBatchEncoder(error_correction).encode(data), expected)
+
+    def test_modes_lengths_and_error_corrections(self) -> None:
+        generator = random.Random(18004)
+        for error_correction in ERROR_CORRECTIONS:
+            for alphabet in _ALPHABETS.values():
+                for length in _LENGTHS:
+                    self._assert_same_modules("".join(generator.choices(alphabet, k=length)), error_correction)
+
+    def test_mixed_segments(self) -> None:
+        # long digit runs get their own segment, like in a legacy payload with a long ticket ID
+        for data in ["Konzert_2026-11-07_123456789012345678901234__abc%2F",
+                     "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789abcdefghijklmnopqrstuvwxyz",
+                     "x" * 10 + "1" * 30 + "Y" * 30 + "z" * 10]:
+            for error_correction in ERROR_CORRECTIONS:
+                self._assert_same_modules(data, error_correction)
+
+    def test_all_versions(self) -> None:
+        # the longest byte payload of each version, so every version template is checked
+        encoder = QrBatchEncoder(constants.ERROR_CORRECT_M)
+        for version in range(1, 41):
+            qr = qrcode.QRCode(version=version, error_correction=constants.ERROR_CORRECT_M, border=0)
+            num_bytes = (qrcode.util.BIT_LIMIT_TABLE[constants.ERROR_CORRECT_M][version]
+                         - 4 - qrcode.util.length_in_bits(qrcode.util.MODE_8BIT_BYTE, version)) // 8
+            data = "".join(random.Random(version).choices(string.ascii_lowercase, k=num_bytes))
+            qr.add_data(data)
+            qr.make(fit=False)
+            with self.subTest(version=version):
+                self.assertEqual(len(encoder.encode_modules(data)), version * 4 + 17)
+                self.assertEqual(encoder.encode(data), qr.get_matrix())
+
+    def test_templates_are_reused(self) -> None:
+        encoder = QrBatchEncoder()
+        for ticket_id in range(20):
+            data = f"Konzert_2026-11-07_{ticket_id}__signature"
+            self.assertEqual(encoder.encode(data), _get_reference_matrix(data, constants.ERROR_CORRECT_M))
+        self.assertEqual(len(encoder.templates), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
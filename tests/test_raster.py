@@ -0,0 +1,103 @@
+import sys
+import tempfile
+import unittest
+import zlib
+from io import BytesIO
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "generator"))
+
+# pylint: disable=wrong-import-position
+from generator_lib.config import OutputMode
+from generator_lib.raster import MODULE_SIZE_PX, QUIET_ZONE_MODULES, PngTemplate, RasterTicketWriter
+
+PAYLOADS = ["Konzert_2026-11-07_12__c2lnbmF0dXJl", "K1:$X3G1/ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789" * 2]
+
+
+def _decode_qr(pixels: np.ndarray) -> str:
+    gray = pixels if pixels.ndim == 2 else cv2.cvtColor(pixels, cv2.COLOR_RGB2GRAY)
+    data, _, _ = cv2.QRCodeDetector().detectAndDecode(gray)
+    return str(data)
+
+
+def _get_idat(png: bytes) -> bytes:
+    # the data of all IDAT chunks, the CRCs are checked by PIL
+    offset = 8
+    data = b""
+    while offset < len(png):
+        length = int.from_bytes(png[offset:offset + 4], "big")
+        if png[offset + 4:offset + 8] == b"IDAT":
+            data += png[offset + 8:offset + 8 + length]
+        offset += length + 12
+    return data
+
+
+class RasterTicketWriterTest(unittest.TestCase):
+    """The PNG and WebP tickets have to open in other programs and show the QR-code of the ticket"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.flyer_file_name = Path(self.temp_dir.name) / "flyer.png"
+        flyer = np.zeros((300, 400, 3), dtype=np.uint8)
+        flyer[:, :, 0] = np.arange(400)[None, :] * 255 // 400
+        flyer[:, :, 1] = np.arange(300)[:, None] * 255 // 300
+        Image.fromarray(flyer).save(self.flyer_file_name)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _assert_ticket(self, writer: RasterTicketWriter, data: str, image_format: str) -> None:
+        rendered = writer.render_ticket(data)
+        modules = writer.encoder.encode_modules(data)
+        expected = writer.draw_ticket(modules)
+        with Image.open(BytesIO(rendered)) as image:
+            self.assertEqual(image.format, image_format)
+            image.verify()
+        with Image.open(BytesIO(rendered)) as image:
+            # WebP has no grayscale images
+            pixels = np.asarray(image.convert("L") if expected.ndim == 2 else image)
+        width = (len(modules) + 2 * QUIET_ZONE_MODULES) * MODULE_SIZE_PX
+        self.assertEqual(pixels.shape[1], width)
+        self.assertEqual(pixels.shape, expected.shape)
+        np.testing.assert_array_equal(pixels, expected)
+        self.assertEqual(_decode_qr(pixels), data)
+
+    def test_png_without_flyer(self) -> None:
+        writer = RasterTicketWriter(None, OutputMode.PNG_FILES)
+        for data in PAYLOADS:
+            with self.subTest(data=data):
+                self._assert_ticket(writer, data, "PNG")
+
+    def test_png_with_flyer(self) -> None:
+        writer = RasterTicketWriter(self.flyer_file_name, OutputMode.PNG_FILES)
+        for data in PAYLOADS:
+            with self.subTest(data=data):
+                self._assert_ticket(writer, data, "PNG")
+
+    def test_webp(self) -> None:
+        for flyer_file_name in (None, self.flyer_file_name):
+            writer = RasterTicketWriter(flyer_file_name, OutputMode.WEBP_FILES)
+            for data in PAYLOADS:
+                with self.subTest(data=data, flyer=flyer_file_name):
+                    self._assert_ticket(writer, data, "WEBP")
+
+    def test_png_stream_is_valid(self) -> None:
+        # the zlib stream of the static rows and the rows of the ticket has to pass the Adler-32 check
+        background = np.full((40, 30, 3), 200, dtype=np.uint8)
+        rows = np.arange(20 * 30 * 3, dtype=np.uint32).astype(np.uint8).reshape(20, 30, 3)
+        png = PngTemplate(background, 20).encode(rows)
+        raw = zlib.decompress(_get_idat(png))
+        # every row starts with its filter type byte
+        self.assertEqual(len(raw), 40 * (30 * 3 + 1))
+        with Image.open(BytesIO(png)) as image:
+            pixels = np.asarray(image)
+        np.testing.assert_array_equal(pixels[:20], background[:20])
+        np.testing.assert_array_equal(pixels[20:], rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import socket
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import ExitStack
+from datetime import date
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "scanner"))
+
+# pylint: disable=wrong-import-position
+from scanner_lib.event_characteristics import EventCharacteristics
+from scanner_lib.id_storage import IdStorage
+from scanner_lib.persistence import Persistence, PersistedValues
+from scanner_lib.replication import IdReplicator, get_default_station
+
+EVENT_CHARACTERISTICS = EventCharacteristics("Konzert", date(2026, 11, 7))
+# the stations pull every second, so a missed ID arrives within a few seconds
+_TIMEOUT_S = 5.0
+
+
+def _get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return int(probe.getsockname()[1])
+
+
+def _wait_for(condition: Callable[[], bool]) -> bool:
+    deadline = time.time() + _TIMEOUT_S
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return condition()
+
+
+class ReplicationTest(unittest.TestCase):
+    """Scanner stations on localhost which share their scanned IDs"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.stack = ExitStack()
+        self.ports = [_get_free_port() for _ in range(3)]
+        self.storages: List[IdStorage] = []
+        self.replicators: List[IdReplicator] = []
+
+    def tearDown(self) -> None:
+        self.stack.close()
+        self.temp_dir.cleanup()
+
+    def _start_station(self, index: int) -> None:
+        # every station knows all others, the stations share the host, so only the ports differ
+        log_dir = Path(self.temp_dir.name) / f"Logs{index}"
+        persistence = Persistence(Path(self.temp_dir.name) / f"config{index}.json",
+                                  PersistedValues(log_dir, log_dir / "public.pem", 0))
+        storage = self.stack.enter_context(IdStorage(log_dir, 5, persistence))
+        peers = [("127.0.0.1", port) for i, port in enumerate(self.ports) if i != index]
+        replicator = self.stack.enter_context(IdReplicator(get_default_station(self.ports[index]),
+                                                           self.ports[index], peers, storage))
+        storage.set_event_characteristics(EVENT_CHARACTERISTICS)
+        replicator.set_event_characteristics(EVENT_CHARACTERISTICS)
+        self.storages.append(storage)
+        self.replicators.append(replicator)
+
+    def _has_id(self, index: int, ticket_id: int) -> bool:
+        return any(stored_id == ticket_id for stored_id, _, _ in self.storages[index].get_ids())
+
+    def test_default_stations_on_one_host_differ(self) -> None:
+        self.assertNotEqual(get_default_station(self.ports[0]), get_default_station(self.ports[1]))
+
+    def test_scanned_id_is_pushed_to_all_stations(self) -> None:
+        for index in range(3):
+            self._start_station(index)
+        self.assertTrue(self.storages[0].try_add_id(7))
+        self.assertTrue(_wait_for(lambda: self._has_id(1, 7) and self._has_id(2, 7)))
+        # the ticket is a duplicate at the other entrances, also after the grace period of the scanning station
+        self.assertFalse(self.storages[1].try_add_id(7))
+        self.assertFalse(self.storages[2].try_add_id(7))
+        station = get_default_station(self.ports[0])
+        self.assertIn((7, station), [(stored_id, source) for stored_id, _, source in self.storages[1].get_ids()])
+
+    def test_missed_ids_are_pulled(self) -> None:
+        self._start_station(0)
+        self._start_station(1)
+        # the datagrams to the third station are lost while it is not running
+        self.assertTrue(self.storages[0].try_add_id(3))
+        self.assertTrue(self.storages[1].try_add_id(4))
+        self.assertTrue(_wait_for(lambda: self._has_id(0, 4) and self._has_id(1, 3)))
+        self._start_station(2)
+        self.assertTrue(_wait_for(lambda: self._has_id(2, 3) and self._has_id(2, 4)))
+
+
+class MergeIdTest(unittest.TestCase):
+    """IDs scanned at two stations before they were replicated"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        log_dir = Path(self.temp_dir.name)
+        persistence = Persistence(log_dir / "config.json", PersistedValues(log_dir, log_dir / "public.pem", 0))
+        self.storage = IdStorage(log_dir, 5, persistence)
+        self.storage.__enter__()  # pylint: disable=unnecessary-dunder-call
+        self.storage.set_event_characteristics(EVENT_CHARACTERISTICS)
+
+    def tearDown(self) -> None:
+        self.storage.__exit__(None, None, None)
+        self.temp_dir.cleanup()
+
+    def _get_id(self, ticket_id: int) -> tuple[int, float, str | None]:
+        return next(entry for entry in self.storage.get_ids() if entry[0] == ticket_id)
+
+    def test_earlier_remote_scan_wins(self) -> None:
+        self.assertTrue(self.storage.try_add_id(1))
+        scan_time = self._get_id(1)[1]
+        self.assertTrue(self.storage.merge_id(1, scan_time - 10, "Nord"))
+        self.assertEqual(self._get_id(1), (1, scan_time - 10, "Nord"))
+        # the ticket was scanned at the other station first, so it is no longer accepted here
+        self.assertFalse(self.storage.try_add_id(1))
+
+    def test_later_remote_scan_is_ignored(self) -> None:
+        self.assertTrue(self.storage.try_add_id(2))
+        scan_time = self._get_id(2)[1]
+        self.assertFalse(self.storage.merge_id(2, scan_time + 10, "Nord"))
+        self.assertEqual(self._get_id(2), (2, scan_time, None))
+
+    def test_earliest_of_several_remote_scans_wins(self) -> None:
+        self.assertTrue(self.storage.merge_id(3, 200.0, "Nord"))
+        self.assertTrue(self.storage.merge_id(3, 100.0, "Sued"))
+        self.assertFalse(self.storage.merge_id(3, 150.0, "West"))
+        self.assertEqual(self._get_id(3), (3, 100.0, "Sued"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+import sys
+import tempfile
+import time
+import unittest
+from datetime import date
+from pathlib import Path
+from typing import Any, List, Optional
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "generator"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "scanner"))
+
+# pylint: disable=wrong-import-position
+from generator_lib.config import KeyType, PayloadFormat
+from generator_lib.payload import PayloadCodec
+from generator_lib.signing import read_key, sign_message
+from scanner_lib.decoders import DetectedCode
+from scanner_lib.display_utils import CheckResult, ErrorArgs, SuccessArgs
+from scanner_lib.event_characteristics import EventCharacteristics
+from scanner_lib.id_storage import IdStorage
+from scanner_lib.issued_tickets import IssuedTicketIndex
+from scanner_lib.lanes import Lane, LanePool
+from scanner_lib.persistence import Persistence, PersistedValues
+from scanner_lib.qr import CapturedFrame
+from scanner_lib.scanner import Scanner
+from scanner_lib.signature_validator import SignatureValidator
+from scanner_lib.verification_cache import VerificationCache
+
+EVENT_NAME = "Konzert"
+EVENT_DATE = date(2026, 11, 7)
+_POINTS = np.zeros((4, 2), dtype=np.float32)
+
+
+class FakeCamera:
+    """Camera which returns a new black frame on every call"""
+
+    def __init__(self) -> None:
+        self.num_frames = 0
+
+    def get_frame(self) -> Optional[CapturedFrame]:
+        self.num_frames += 1
+        return CapturedFrame(np.zeros((8, 8, 3), dtype=np.uint8), self.num_frames, time.time())
+
+
+class FakeDecoder:
+    """Decoder which returns the payloads set by the test in every frame"""
+
+    def __init__(self) -> None:
+        self.payloads: List[str] = []
+
+    def decode(self, image: Any) -> List[DetectedCode]:
+        return [DetectedCode(payload, _POINTS) for payload in self.payloads]
+
+
+class RecordingDrawer:
+    """Drawer which keeps the results of the last checked frame"""
+
+    def __init__(self) -> None:
+        self.results: List[CheckResult] = []
+
+    def show_frame_checked(self, frame: Any, results: List[CheckResult]) -> None:
+        self.results = results
+
+    def show_frame_stored(self, frame: Any) -> None:
+        self.results = []
+
+
+class ScannerTest(unittest.TestCase):
+    """Checks of the codes detected in the frames of the lanes"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        key_dir = Path(self.temp_dir.name) / "Keys"
+        self.private_key = read_key(key_dir / "private.pem", KeyType.ED25519)
+        persistence = Persistence(Path(self.temp_dir.name) / "config.json",
+                                  PersistedValues(Path(self.temp_dir.name), key_dir / "public.pem", 0))
+        self.id_storage = IdStorage(Path(self.temp_dir.name) / "Logs", 5, persistence)
+        self.id_storage.__enter__()  # pylint: disable=unnecessary-dunder-call
+        validator = SignatureValidator(key_dir / "public.pem", persistence)
+        issued_tickets = IssuedTicketIndex()
+        verification_cache = VerificationCache()
+        self.decoder = FakeDecoder()
+        self.drawer = RecordingDrawer()
+        self.scanner = Scanner(FakeCamera(), validator, self.drawer, self.id_storage, self.decoder,  # type: ignore
+                               issued_tickets, verification_cache)
+        # a second lane with the same validator, ID storage, issued tickets and cache
+        self.other_decoder = FakeDecoder()
+        self.other_drawer = RecordingDrawer()
+        self.other_scanner = Scanner(FakeCamera(), validator, self.other_drawer, self.id_storage,  # type: ignore
+                                     self.other_decoder, issued_tickets, verification_cache)  # type: ignore
+        self.lane_pool = LanePool([Lane(None, self.scanner), Lane(None, self.other_scanner)],  # type: ignore
+                                  validator, issued_tickets, verification_cache)
+        self._set_event(EVENT_NAME)
+
+    def tearDown(self) -> None:
+        self.id_storage.__exit__(None, None, None)
+        self.temp_dir.cleanup()
+
+    def _get_payload(self, ticket_id: int, event_name: str = EVENT_NAME, private_key: Any = None) -> str:
+        codec = PayloadCodec(PayloadFormat.COMPACT)
+        message = codec.get_signed_message(event_name, EVENT_DATE, ticket_id)
+        return codec.encode(message, sign_message(message, private_key or self.private_key))
+
+    def _set_event(self, event_name: str) -> None:
+        event_characteristics = EventCharacteristics(event_name, EVENT_DATE)
+        self.id_storage.set_event_characteristics(event_characteristics)
+        self.lane_pool.set_event_characteristics(event_characteristics)
+
+    def _scan(self, payloads: List[str], lane: int = 0) -> List[str]:
+        scanner, decoder, drawer = (self.scanner, self.decoder, self.drawer) if lane == 0 else \
+            (self.other_scanner, self.other_decoder, self.other_drawer)
+        decoder.payloads = payloads
+        scanner.process_frame(time.time())
+        return [result.reason if isinstance(result, ErrorArgs) else f"ID {result.ticket_id}"
+                for result in drawer.results if isinstance(result, (ErrorArgs, SuccessArgs))]
+
+    def test_group_is_accepted(self) -> None:
+        self.assertEqual(self._scan([self._get_payload(1), self._get_payload(2)]), ["ID 1", "ID 2"])
+
+    def test_copies_in_one_frame_are_duplicates(self) -> None:
+        # the grace period must not accept a second copy of the ticket in the same frame
+        self.assertEqual(self._scan([self._get_payload(2), self._get_payload(2)]), ["ID 2", "Duplicate ID"])
+
+    def test_ticket_held_in_view_is_accepted_again(self) -> None:
+        self.assertEqual(self._scan([self._get_payload(3)]), ["ID 3"])
+        # the next frames show the same ticket within the grace period
+        self.assertEqual(self._scan([self._get_payload(3)]), ["ID 3"])
+
+    def test_forged_code_is_rejected(self) -> None:
+        payload = self._get_payload(4)
+        self.assertEqual(self._scan([payload[:-3] + "000"]), ["Invalid signature"])
+
+    def test_code_in_view_is_verified_once(self) -> None:
+        payload = self._get_payload(5)
+        with mock.patch.object(self.scanner.validator, "verify_message",
+                               side_effect=self.scanner.validator.verify_message) as verify_message:
+            self.assertEqual(self._scan([payload]), ["ID 5"])
+            self.assertEqual(self._scan([payload]), ["ID 5"])
+        self.assertEqual(verify_message.call_count, 1)
+
+    def test_cached_verdict_is_dropped_for_new_key(self) -> None:
+        key_dir = Path(self.temp_dir.name) / "OtherKeys"
+        payload = self._get_payload(6, private_key=read_key(key_dir / "private.pem", KeyType.ED25519))
+        self.assertEqual(self._scan([payload]), ["Invalid signature"])
+        self.assertEqual(self._scan([payload]), ["Invalid signature"])
+        self.scanner.validator.set_key(key_dir / "public.pem")
+        self.assertEqual(self._scan([payload]), ["ID 6"])
+
+    def test_cached_verdict_is_dropped_for_new_event(self) -> None:
+        payload = self._get_payload(7, "Theater")
+        self.assertEqual(self._scan([payload]), ["Wrong event"])
+        self._set_event("Theater")
+        self.assertEqual(self._scan([payload]), ["ID 7"])
+        self.assertEqual(self._scan([self._get_payload(8)]), ["Wrong event"])
+
+    def test_lanes_share_the_verification(self) -> None:
+        payload = self._get_payload(9)
+        with mock.patch.object(self.scanner.validator, "verify_message",
+                               side_effect=self.scanner.validator.verify_message) as verify_message:
+            self.assertEqual(self._scan([payload], 0), ["ID 9"])
+            # the ticket is seen by the camera of the next lane as well
+            self.assertEqual(self._scan([payload], 1), ["ID 9"])
+        self.assertEqual(verify_message.call_count, 1)
+        self.assertEqual(self._scan([self._get_payload(10)], 1), ["ID 10"])
+        self.assertEqual(self._scan([self._get_payload(10)], 0), ["ID 10"])
+
+    def test_issued_tickets_are_loaded_once(self) -> None:
+        with mock.patch.object(IssuedTicketIndex, "load", autospec=True) as load:
+            self._set_event("Theater")
+            self.lane_pool.load_issued_tickets()
+        self.assertEqual(load.call_count, 2)
+        self.assertIs(self.scanner.issued_tickets, self.other_scanner.issued_tickets)
+
+
+if __name__ == "__main__":
+    unittest.main()
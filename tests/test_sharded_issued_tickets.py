@@ -0,0 +1,85 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "generator"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "scanner"))
+
+# pylint: disable=wrong-import-position
+from generator_lib.config import Config, KeyType, PayloadFormat
+from generator_lib.generator import Generator, get_issued_tickets_file_path
+from generator_lib.payload import PayloadCodec
+from generator_lib.progress import StdoutProgressIndicator
+from generator_lib.signing import read_key, sign_message
+from scanner_lib.event_characteristics import EventCharacteristics
+from scanner_lib.issued_tickets import IssuedTicketIndex, get_issued_tickets_file_names
+from scanner_lib.persistence import Persistence, PersistedValues
+from scanner_lib.signature_validator import SignatureValidator
+
+EVENT_NAME = "Konzert"
+EVENT_DATE = date(2026, 11, 7)
+NUM_SHARDS = 2
+NUM_CODES = 3
+
+
+class ShardedIssuedTicketsTest(unittest.TestCase):
+    """Lists of the issued tickets of an event generated in shards on several machines"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.key_dir = Path(self.temp_dir.name) / "Keys"
+        self.private_key_path = self.key_dir / "private.pem"
+        # every machine has its own output directory and ID ledger
+        self.configs = [Config(EVENT_NAME, EVENT_DATE, NUM_CODES, Path(self.temp_dir.name) / f"Codes{shard_index}",
+                               self.private_key_path, None, key_type=KeyType.ED25519,
+                               payload_format=PayloadFormat.COMPACT, allocate_ids=True,
+                               shard_index=shard_index, num_shards=NUM_SHARDS)
+                        for shard_index in range(NUM_SHARDS)]
+        for gen_config in self.configs:
+            Generator(StdoutProgressIndicator(None)).generate_blocking(gen_config)
+            # the lists of all shards are copied to the scanner next to the public key
+            shutil.copy(get_issued_tickets_file_path(gen_config), self.key_dir)
+        key_path = self.key_dir / "public.pem"
+        self.validator = SignatureValidator(key_path, Persistence(
+            self.key_dir / "config.json", PersistedValues(self.key_dir, key_path, 0)))
+        self.event_characteristics = EventCharacteristics(EVENT_NAME, EVENT_DATE)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _get_payload(self, ticket_id: int) -> str:
+        # Ed25519 signatures are deterministic, so the payload of a ticket can be created again
+        codec = PayloadCodec(PayloadFormat.COMPACT)
+        message = codec.get_signed_message(EVENT_NAME, EVENT_DATE, ticket_id)
+        return codec.encode(message, sign_message(message, read_key(self.private_key_path)))
+
+    def _load_index(self) -> IssuedTicketIndex:
+        index = IssuedTicketIndex()
+        index.load(get_issued_tickets_file_names(self.validator.key_path, self.event_characteristics),
+                   self.event_characteristics, self.validator)
+        return index
+
+    def test_every_shard_has_its_own_list(self) -> None:
+        file_names = {get_issued_tickets_file_path(gen_config).name for gen_config in self.configs}
+        self.assertEqual(file_names, {"2026-11-07_Konzert_issued_shard1of2.txt",
+                                      "2026-11-07_Konzert_issued_shard2of2.txt"})
+
+    def test_tickets_of_all_shards_are_issued(self) -> None:
+        index = self._load_index()
+        self.assertTrue(index.is_loaded)
+        # the shards lease every second ID, starting at their index
+        for ticket_id in range(NUM_SHARDS * NUM_CODES):
+            self.assertEqual(index.get_ticket_id(self._get_payload(ticket_id)), ticket_id)
+
+    def test_missing_shard_falls_back_to_signatures(self) -> None:
+        os.remove(self.key_dir / get_issued_tickets_file_path(self.configs[1]).name)
+        # otherwise the tickets of the second shard would be rejected as not issued
+        self.assertFalse(self._load_index().is_loaded)
+
+
+if __name__ == "__main__":
+    unittest.main()
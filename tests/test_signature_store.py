@@ -0,0 +1,80 @@
+import csv
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "generator"))
+
+# pylint: disable=wrong-import-position
+from generator_lib.config import Config, KeyType
+from generator_lib.generator import Generator, TicketWorker, get_signature_store_file_path, get_ticket_file_path
+from generator_lib.metrics import GenerationMetrics
+from generator_lib.signature_store import SignatureStore
+
+NUM_CODES = 6
+
+
+class GenerationInterrupted(Exception):
+    """Raised instead of a hard kill of the generator"""
+
+
+class InterruptingProgress:
+    """Progress listener which interrupts the run after the given number of tickets"""
+
+    def __init__(self, num_tickets: int) -> None:
+        self.num_tickets = num_tickets
+
+    def set_metrics(self, metrics: GenerationMetrics) -> None:
+        pass
+
+    def set_maximum(self, progress_max: int) -> None:
+        pass
+
+    def set_progress(self, progress: int) -> None:
+        if progress + 1 == self.num_tickets:
+            raise GenerationInterrupted()
+
+
+class SignatureStoreTest(unittest.TestCase):
+    """Signatures kept for the tickets of an event across runs"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.gen_config = Config("Konzert", date(2026, 11, 7), NUM_CODES, Path(self.temp_dir.name) / "Codes",
+                                 Path(self.temp_dir.name) / "Keys" / "private.pem", None, key_type=KeyType.ED25519)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _read_rows(self) -> list[list[str]]:
+        with open(get_signature_store_file_path(self.gen_config), "r", encoding="utf-8", newline="") as file:
+            return list(csv.reader(file))
+
+    def test_signature_is_written_right_away(self) -> None:
+        with SignatureStore(get_signature_store_file_path(self.gen_config), "fingerprint") as store:
+            store.add(b"message", b"signature")
+            # still open, as in a run killed after signing
+            self.assertEqual(len(self._read_rows()), 1)
+        with SignatureStore(get_signature_store_file_path(self.gen_config), "fingerprint") as store:
+            self.assertEqual(store.get(b"message"), b"signature")
+        with SignatureStore(get_signature_store_file_path(self.gen_config), "other key") as store:
+            self.assertIsNone(store.get(b"message"))
+
+    def test_resumed_run_reuses_the_signatures(self) -> None:
+        with self.assertRaises(GenerationInterrupted):
+            Generator(InterruptingProgress(2)).generate_blocking(self.gen_config)
+        self.assertEqual(len(self._read_rows()), NUM_CODES)
+        # every ticket was signed before the first one was rendered, so nothing is signed again
+        with mock.patch.object(TicketWorker, "sign_message", side_effect=AssertionError("signed again")):
+            Generator(InterruptingProgress(NUM_CODES + 1)).generate_blocking(self.gen_config)
+        self.assertEqual(len(self._read_rows()), NUM_CODES)
+        for ticket_id in self.gen_config.get_ticket_ids():
+            self.assertTrue(os.path.exists(f"{get_ticket_file_path(self.gen_config, ticket_id)}.pdf"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import re
+import sys
+import tempfile
+import unittest
+from io import BytesIO
+from pathlib import Path
+from typing import List
+from unittest import mock
+
+import numpy as np
+import reportlab.pdfgen.canvas
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "generator"))
+
+# pylint: disable=wrong-import-position
+from generator_lib.pdf_image import can_draw_image_xobject, is_image_xobject_supported
+from generator_lib.qr import TicketDocumentWriter, TicketWriter
+
+NUM_TICKETS = 3
+_IMAGE_MATCHER = re.compile(rb"<<[^>]*/Subtype /Image[^>]*>>")
+
+
+class TicketTemplateTest(unittest.TestCase):
+    """The flyer is embedded once per PDF document, with or without the internals of reportlab"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        flyer = np.zeros((300, 400, 3), dtype=np.uint8)
+        flyer[:, :, 0] = np.arange(400)[None, :] * 255 // 400
+        flyer[:, :, 1] = np.arange(300)[:, None] * 255 // 300
+        self.jpeg_file_name = Path(self.temp_dir.name) / "flyer.jpg"
+        self.png_file_name = Path(self.temp_dir.name) / "flyer.png"
+        Image.fromarray(flyer).save(self.jpeg_file_name)
+        Image.fromarray(flyer).save(self.png_file_name)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _write_document(self, flyer_file_name: Path) -> bytes:
+        file_name = str(Path(self.temp_dir.name) / "tickets")
+        with TicketDocumentWriter(TicketWriter(flyer_file_name), file_name, 1, NUM_TICKETS) as writer:
+            for ticket_id in range(NUM_TICKETS):
+                writer.add_ticket(f"Konzert_2026-11-07_{ticket_id}__c2ln", f"Ticket {ticket_id}")
+        with open(f"{file_name}.pdf", "rb") as file:
+            return file.read()
+
+    def _get_images(self, pdf: bytes) -> List[bytes]:
+        self.assertTrue(pdf.startswith(b"%PDF"))
+        return _IMAGE_MATCHER.findall(pdf)
+
+    def test_installed_reportlab_supports_the_internals(self) -> None:
+        # fails after an update of reportlab which changed them, the flyer is then encoded for every document
+        self.assertTrue(is_image_xobject_supported())
+        self.assertTrue(can_draw_image_xobject(reportlab.pdfgen.canvas.Canvas(BytesIO())))
+
+    def test_jpeg_flyer_is_embedded_as_it_is(self) -> None:
+        pdf = self._write_document(self.jpeg_file_name)
+        images = self._get_images(pdf)
+        self.assertEqual(len(images), 1)
+        self.assertIn(b"/Filter [ /DCTDecode ]", images[0])
+        with open(self.jpeg_file_name, "rb") as file:
+            self.assertIn(file.read(), pdf)
+
+    def test_png_flyer_is_compressed_losslessly(self) -> None:
+        images = self._get_images(self._write_document(self.png_file_name))
+        self.assertEqual(len(images), 1)
+        self.assertIn(b"/Filter [ /FlateDecode ]", images[0])
+        self.assertIn(b"/Width 400", images[0])
+
+    def test_public_api_without_internals(self) -> None:
+        for flyer_file_name in [self.jpeg_file_name, self.png_file_name]:
+            for patched in ["can_draw_image_xobject", "is_image_xobject_supported"]:
+                with self.subTest(flyer=flyer_file_name.name, patched=patched), \
+                        mock.patch(f"generator_lib.template.{patched}", return_value=False):
+                    images = self._get_images(self._write_document(flyer_file_name))
+                    # drawImage reuses the image within a document as well
+                    self.assertEqual(len(images), 1)
+                    self.assertIn(b"/Width 400", images[0])
+                    self.assertIn(b"/Height 300", images[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "scanner"))
+
+# pylint: disable=wrong-import-position
+from scanner_lib.verification_cache import VerificationCache, VerifiedPayload
+
+MAX_SIZE = 3
+
+
+class VerificationCacheTest(unittest.TestCase):
+    """Bounded LRU cache of the verified payloads"""
+
+    def setUp(self) -> None:
+        self.cache = VerificationCache(MAX_SIZE)
+
+    def _put(self, payload: str) -> None:
+        self.cache.put(payload, VerifiedPayload(None, payload))
+
+    def _get_reason(self, payload: str, key_generation: int = 0) -> str | None:
+        verified = self.cache.get(payload, key_generation)
+        return verified.reason if verified is not None else None
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        for payload in ["a", "b", "c"]:
+            self._put(payload)
+        # "a" is used again, so "b" is the least recently used one
+        self.assertEqual(self._get_reason("a"), "a")
+        self._put("d")
+        self.assertEqual(len(self.cache.entries), MAX_SIZE)
+        self.assertIsNone(self._get_reason("b"))
+        for payload in ["a", "c", "d"]:
+            self.assertEqual(self._get_reason(payload), payload)
+
+    def test_put_again_does_not_grow(self) -> None:
+        for payload in ["a", "b", "c", "a", "a"]:
+            self._put(payload)
+        self.assertEqual(list(self.cache.entries), ["b", "c", "a"])
+
+    def test_new_key_generation_clears(self) -> None:
+        self._put("a")
+        self.assertIsNone(self._get_reason("a", 1))
+        self._put("b")
+        self.assertEqual(self._get_reason("b", 1), "b")
+        self.assertIsNone(self._get_reason("a", 1))
+
+    def test_clear(self) -> None:
+        self._put("a")
+        self.cache.clear()
+        self.assertIsNone(self._get_reason("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()